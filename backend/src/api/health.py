@@ -1,25 +1,81 @@
 from datetime import datetime, timezone
 
-from fastapi import APIRouter
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
 
 from src.config.settings import get_settings
 from src.observability.metrics import metrics
+from src.services.admission import get_admission_controller
+from src.services.artifact_writer import get_artifact_writer
+from src.services.batcher import get_batcher
+from src.services.engine import get_engine
+from src.services.janitor import get_janitor
+from src.services.jobs import get_job_manager
+from src.services.office_converter import get_office_converter
+from src.services.page_cache import get_page_cache
+from src.services.result_cache import get_result_cache
+from src.services.router import get_router
+from src.services.single_flight import get_single_flight
+from src.services.vlm_endpoints import get_vlm_pool
+from src.services.worker_pool import get_worker_pool
 
 router = APIRouter()
 
 
+def _mineru_ready() -> bool:
+    # In process mode the models live in the worker processes, not in the API process.
+    pool_ready = get_worker_pool().ready
+    if pool_ready is not None:
+        return pool_ready
+    engine = get_engine()
+    # Without preload the engine loads on the first parse, so only a failed load makes it unready.
+    return engine.ready or (not engine.settings.mineru_preload and engine.error is None)
+
+
 @router.get("/health")
 async def health() -> dict:
     settings = get_settings()
-    mineru_ready = True
+    engine = get_engine()
     return {
         "status": "ok",
-        "mineru_ready": mineru_ready,
+        "mineru_ready": _mineru_ready(),
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "limits": {
             "max_file_bytes": settings.max_file_bytes,
             "max_pages": settings.max_pages,
+            "oversize_pdf_policy": settings.oversize_pdf_policy,
             "max_files": settings.max_files,
         },
+        "engine": engine.snapshot(),
         "metrics": metrics.snapshot(),
+        "admission": get_admission_controller().snapshot(),
+        "workers": get_worker_pool().snapshot(),
+        "jobs": get_job_manager().snapshot(),
+        "cache": get_result_cache().snapshot(),
+        "inflight": get_single_flight().snapshot(),
+        "batching": get_batcher().snapshot(),
+        "office": get_office_converter().snapshot(),
+        "artifacts": get_artifact_writer().snapshot(),
+        "storage": get_janitor().snapshot(),
+        # Counted where parsing runs: in process mode the workers keep their own counters.
+        "page_cache": get_page_cache().snapshot(),
+        "router": get_router().snapshot(),
+        # Like page_cache, this is the API process's pool; process-mode workers keep their own.
+        "vlm_endpoints": get_vlm_pool().snapshot(),
     }
+
+
+@router.get("/health/live")
+async def liveness() -> dict:
+    return {"status": "ok", "timestamp": datetime.now(timezone.utc).isoformat()}
+
+
+@router.get("/health/ready")
+async def readiness() -> JSONResponse:
+    engine = get_engine()
+    if _mineru_ready():
+        return JSONResponse({"status": "ready", "mineru_ready": True})
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "not_ready", "mineru_ready": False, "detail": engine.error or "Miner-U warming up"},
+    )
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import mimetypes
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+
+from src.api.deps.auth import require_api_key
+from src.api.parse import _resolve_parse_service, parse_params
+from src.services.jobs import JobManager, get_job_manager
+from src.services.parse_service import ParseParams, ParseService
+from src.services.bundle import iter_zip, job_entries
+from src.services.storage import decode_chunks
+
+router = APIRouter()
+
+# How long an artifact request waits for a background write that is still in flight.
+ARTIFACT_WAIT_SECONDS = 30.0
+
+
+def _resolve_job_manager() -> JobManager:
+    # Look up the current provider at request time so tests can monkeypatch it.
+    return get_job_manager()
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    response: Response,
+    files: List[UploadFile] = File(..., description="Upload one or more PDF/image/DOC/DOCX files"),
+    params: ParseParams = Depends(parse_params),
+    _auth: None = Depends(require_api_key),
+    service: ParseService = Depends(_resolve_parse_service),
+    manager: JobManager = Depends(_resolve_job_manager),
+):
+    if not files:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one file is required")
+
+    job = await manager.submit(service, files, params)
+    response.headers["Location"] = f"/api/v1/jobs/{job.job_id}"
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    _auth: None = Depends(require_api_key),
+    manager: JobManager = Depends(_resolve_job_manager),
+):
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}/artifacts/{name:path}")
+async def get_artifact(
+    job_id: str,
+    name: str,
+    request: Request,
+    _auth: None = Depends(require_api_key),
+    service: ParseService = Depends(_resolve_parse_service),
+):
+    """Stream a stored artifact (the ``*_url`` fields of a parse response) straight from disk."""
+    path = service.storage.artifact_path(job_id, name)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
+    pending = service.artifact_writer.pending(path)
+    await _wait_for_writes([pending] if pending is not None else [])
+    found = await asyncio.to_thread(service.storage.find_artifact, path)
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
+    stored, encoding = found
+    service.janitor.touch(job_id)
+    store = service.storage.store
+    local_path = store.local_path(stored.key)
+    send_encoded = encoding is None or encoding in _accepted_encodings(request)
+    if encoding is not None and "range" in request.headers:
+        # Ranges address the decoded artifact: a slice of a compressed stream cannot be decoded on its own.
+        send_encoded = False
+    if local_path is None and send_encoded:
+        # Remote store: let the client download straight from it when it can.
+        url = store.download_url(stored.key)
+        if url is not None:
+            return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    expires = service.storage.expiry_at(stored.modified)
+    max_age = max(int((expires - datetime.now(timezone.utc)).total_seconds()), 0)
+    media_type, _ = mimetypes.guess_type(path.name)
+    media_type = media_type or "application/octet-stream"
+    headers = {"Cache-Control": f"private, max-age={max_age}", "Expires": format_datetime(expires, usegmt=True)}
+    if encoding is not None:
+        headers["Vary"] = "Accept-Encoding"
+    if send_encoded and encoding is not None:
+        # Pre-compressed in storage: send the stored bytes as-is instead of recompressing.
+        headers["Content-Encoding"] = encoding
+    if local_path is not None:
+        response = FileResponse(local_path, stat_result=local_path.stat(), media_type=media_type, headers=headers)
+        etag = response.headers["etag"]
+        last_modified = response.headers["last-modified"]
+    else:
+        response = None
+        etag = f'"{stored.etag}"'
+        last_modified = format_datetime(stored.modified, usegmt=True)
+    etag = etag if send_encoded else f"W/{etag}"
+    if _not_modified(request, etag, stored.modified):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={key: headers[key] for key in ("Cache-Control", "Expires")}
+            | {"ETag": etag, "Last-Modified": last_modified},
+        )
+    if send_encoded and response is not None:
+        return response
+    # Proxied from a remote store, or decompressed for a client that cannot decode the stored form.
+    chunks = store.iter_bytes(stored.key)
+    if not send_encoded:
+        chunks = decode_chunks(chunks, encoding)
+    headers.update({"ETag": etag, "Last-Modified": last_modified, "Accept-Ranges": "bytes"})
+    requested = _requested_range(request, etag, last_modified)
+    if requested is not None:
+        # The decoded length is not stored; count it in a first pass rather than buffering the artifact.
+        size = stored.size if send_encoded else await asyncio.to_thread(_decoded_size, store, stored.key, encoding)
+        bounds = _satisfiable(requested, size)
+        if bounds is None:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{size}"},
+            )
+        start, end = bounds
+        headers.update({"Content-Range": f"bytes {start}-{end}/{size}", "Content-Length": str(end - start + 1)})
+        return StreamingResponse(
+            iterate_in_threadpool(_byte_slice(chunks, start, end)),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers=headers,
+        )
+    return StreamingResponse(iterate_in_threadpool(chunks), media_type=media_type, headers=headers)
+
+
+@router.get("/jobs/{job_id}/images/{name}")
+async def get_image(
+    job_id: str,
+    name: str,
+    request: Request,
+    _auth: None = Depends(require_api_key),
+    service: ParseService = Depends(_resolve_parse_service),
+):
+    """Serve one figure extracted by Miner-U; markdown links ``images/<name>`` resolve to these files."""
+    if Path(name).name != name:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+    # Layout is <document>/<parse method>/images/<name>; Miner-U names images by content hash.
+    objects = await asyncio.to_thread(service.storage.job_objects, job_id)
+    match = next(
+        (parts for parts in (item.key.split("/") for item in objects) if parts[3:] == ["images", name]),
+        None,
+    )
+    if match is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+    return await get_artifact(job_id, "/".join(match[1:]), request, _auth, service)
+
+
+@router.get("/jobs/{job_id}/bundle.zip")
+async def get_bundle(
+    job_id: str,
+    _auth: None = Depends(require_api_key),
+    service: ParseService = Depends(_resolve_parse_service),
+):
+    """Stream every artifact and image of a job as a ZIP built on the fly, never staged on disk."""
+    job_root = service.storage.artifact_path(job_id, "")
+    if job_root is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    await _wait_for_writes(service.artifact_writer.pending_in(job_root))
+    entries = job_entries(await asyncio.to_thread(service.storage.job_objects, job_id))
+    if not entries:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job has no artifacts")
+    service.janitor.touch(job_id)
+    return StreamingResponse(
+        iterate_in_threadpool(iter_zip(entries, service.storage.store)),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{job_id}.zip"'},
+    )
+
+
+async def _wait_for_writes(pending: list) -> None:
+    # A response may go out before its background artifact write finished; wait rather than 404.
+    if not pending:
+        return
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(asyncio.wrap_future(future) for future in pending)),
+            timeout=ARTIFACT_WAIT_SECONDS,
+        )
+    except Exception:  # noqa: BLE001 - a failed or slow write surfaces as a missing artifact
+        pass
+
+
+def _accepted_encodings(request: Request) -> set[str]:
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _requested_range(request: Request, etag: str, last_modified: str) -> tuple[int | None, int | None] | None:
+    """The single ``bytes=`` range asked for, or None to send the whole body."""
+    header = request.headers.get("range", "")
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    if_range = request.headers.get("if-range")
+    if if_range is not None:
+        validator = if_range.strip()
+        # If-Range needs a strong match: a decoded body's weak ETag never qualifies, its date does.
+        if validator != last_modified and (etag.startswith("W/") or validator != etag):
+            return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        return (int(first) if first else None, int(last) if last else None)
+    except ValueError:
+        return None
+
+
+def _satisfiable(requested: tuple[int | None, int | None], size: int) -> tuple[int, int] | None:
+    first, last = requested
+    if first is None:
+        # Suffix range: the last ``last`` bytes.
+        if not last:
+            return None
+        return max(size - last, 0), size - 1
+    if first >= size or (last is not None and last < first):
+        return None
+    return first, min(last if last is not None else size - 1, size - 1)
+
+
+def _decoded_size(store, key: str, encoding: str | None) -> int:
+    return sum(len(chunk) for chunk in decode_chunks(store.iter_bytes(key), encoding))
+
+
+def _byte_slice(chunks: Iterable[bytes], start: int, end: int) -> Iterator[bytes]:
+    position = 0
+    for chunk in chunks:
+        chunk_end = position + len(chunk)
+        if chunk_end > start:
+            yield chunk[max(start - position, 0) : end + 1 - position]
+        position = chunk_end
+        if position > end:
+            return
+
+
+def _not_modified(request: Request, etag: str, modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return modified.replace(microsecond=0) <= since
@@ -3,21 +3,43 @@ from __future__ import annotations
 import time
 import uuid
 
-from fastapi import HTTPException, Request
+from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from loguru import logger
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from src.config.settings import get_settings
 from src.observability.logging import get_request_id, set_request_id
 from src.observability.metrics import metrics
 
+# Allowance for multipart boundaries and form fields on top of the file bytes.
+MULTIPART_OVERHEAD_BYTES = 1024 * 1024
+
+
+def _max_body_bytes() -> int:
+    settings = get_settings()
+    return settings.max_files * settings.max_file_bytes + MULTIPART_OVERHEAD_BYTES
+
+
+def _declared_body_too_large(request: Request) -> bool:
+    content_length = request.headers.get("content-length", "")
+    return content_length.isdigit() and int(content_length) > _max_body_bytes()
+
 
 class RequestContextMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
         set_request_id(request_id)
         request.state.start_time = time.perf_counter()
-        response = await call_next(request)
+        if _declared_body_too_large(request):
+            # Refuse before the multipart body is read and spooled.
+            response = JSONResponse(
+                status_code=413,
+                content={"detail": "Request body too large", "request_id": request_id},
+            )
+        else:
+            response = await call_next(request)
         duration_ms = (time.perf_counter() - request.state.start_time) * 1000
         logger.info(f"{request.method} {request.url.path} completed in {duration_ms:.1f}ms")
         metrics.record(status_code=response.status_code, duration_ms=duration_ms)
@@ -25,12 +47,49 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class BodySizeLimitMiddleware:
+    """Counts request body bytes as the app receives them and stops the body at the size limit.
+
+    A declared Content-Length is refused up front by ``RequestContextMiddleware``; this catches
+    chunked bodies and bodies that lie about their length, before the multipart parser has spooled
+    them. The 413 is raised from ``receive`` so the HTTPException handler answers it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        max_body = _max_body_bytes()
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="Request body too large",
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
 async def http_exception_handler(request: Request, exc: HTTPException):
     request_id = get_request_id()
     duration_ms = (time.perf_counter() - getattr(request.state, "start_time", time.perf_counter())) * 1000
     logger.warning(f"HTTP {exc.status_code}: {exc.detail}")
     metrics.record(status_code=exc.status_code, duration_ms=duration_ms)
-    response = JSONResponse(status_code=exc.status_code, content={"detail": exc.detail, "request_id": request_id})
+    response = JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail, "request_id": request_id},
+        headers=getattr(exc, "headers", None),
+    )
     response.headers["X-Request-ID"] = request_id
     return response
 
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import inspect
-from typing import List, Optional, Literal
+import json
+import uuid
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Literal
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
 
 from src.api.deps.auth import require_api_key
+from src.api.validators import validate_outputs
 from src.config.settings import get_settings
 from src.observability.logging import get_request_id
 from src.services.parse_service import ParseParams, ParseService
@@ -17,12 +22,15 @@ BACKEND_OPTIONS = [
     "vlm-vllm-engine",
     "vlm-lmdeploy-engine",
     "vlm-http-client",
+    "auto",
 ]
 
 router = APIRouter()
 
 
+@lru_cache(maxsize=1)
 def get_parse_service() -> ParseService:
+    # One long-lived service per process so storage and engine state are shared across requests.
     return ParseService(settings=get_settings())
 
 
@@ -44,11 +52,12 @@ async def _call_parse(service: ParseService, files: List[UploadFile], params: Pa
     raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Invalid parse response")
 
 
-@router.post("/parse")
-async def parse_documents(
-    files: List[UploadFile] = File(..., description="Upload one or more PDF/image/DOC/DOCX files"),
+def parse_params(
     lang: str = Form("ch"),
-    parse_method: str = Form("auto"),
+    parse_method: str = Form(
+        "auto",
+        description="auto, txt, ocr, or fast (text layer only, no models; for born-digital PDFs)",
+    ),
     backend: Literal[
         "pipeline",
         "vlm-transformers",
@@ -56,18 +65,27 @@ async def parse_documents(
         "vlm-vllm-engine",
         "vlm-lmdeploy-engine",
         "vlm-http-client",
+        "auto",
     ] = Form("pipeline", description="Backend engine (options: " + ", ".join(BACKEND_OPTIONS) + ")"),
     start_page: Optional[int] = Form(None),
     end_page: Optional[int] = Form(None),
     formula_enable: bool = Form(True),
     table_enable: bool = Form(True),
-    _auth: None = Depends(require_api_key),
-    service: ParseService = Depends(_resolve_parse_service),
-):
-    if not files:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one file is required")
-
-    params = ParseParams(
+    outputs: Optional[str] = Form(
+        None,
+        description="Comma-separated artifacts to return (options: markdown, content_list, middle_json, "
+        "model_output; default: all)",
+    ),
+    response_mode: Literal["inline", "reference"] = Form(
+        "inline",
+        description="inline: embed artifacts in the response; reference: return only the *_url download links",
+    ),
+    pack_images: bool = Form(
+        False,
+        description="Parse all uploaded images as the pages of one document (named after the first image)",
+    ),
+) -> ParseParams:
+    return ParseParams(
         lang=lang,
         parse_method=parse_method,
         backend=backend,
@@ -75,6 +93,53 @@ async def parse_documents(
         end_page=end_page,
         formula_enable=formula_enable,
         table_enable=table_enable,
+        outputs=validate_outputs(outputs),
+        response_mode=response_mode,
+        pack_images=pack_images,
     )
+
+
+@router.post("/parse")
+async def parse_documents(
+    files: List[UploadFile] = File(..., description="Upload one or more PDF/image/DOC/DOCX files"),
+    params: ParseParams = Depends(parse_params),
+    _auth: None = Depends(require_api_key),
+    service: ParseService = Depends(_resolve_parse_service),
+):
+    if not files:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one file is required")
+
     outputs, errors = await _call_parse(service, files, params)
     return {"outputs": outputs, "errors": errors, "request_id": get_request_id()}
+
+
+async def _ndjson(events: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for event in events:
+        yield json.dumps(event, ensure_ascii=False) + "\n"
+
+
+async def _sse(events: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for event in events:
+        yield f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+@router.post("/parse/stream")
+async def parse_documents_stream(
+    request: Request,
+    files: List[UploadFile] = File(..., description="Upload one or more PDF/image/DOC/DOCX files"),
+    params: ParseParams = Depends(parse_params),
+    _auth: None = Depends(require_api_key),
+    service: ParseService = Depends(_resolve_parse_service),
+):
+    """Like ``/parse`` but emits one event per file as it completes (NDJSON, or SSE for ``text/event-stream``)."""
+    if not files:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one file is required")
+
+    job_id = uuid.uuid4().hex
+    # Validation, conversion and admission happen up front so their errors keep their HTTP status.
+    normalized = await service.prepare(files, params, job_id=job_id)
+    events = await service.stream(normalized, params, job_id=job_id)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(_sse(events), media_type="text/event-stream", headers=headers)
+    return StreamingResponse(_ndjson(events), media_type="application/x-ndjson", headers=headers)
@@ -5,6 +5,7 @@ from typing import Iterable
 from fastapi import HTTPException, UploadFile, status
 
 from src.config.settings import Settings
+from src.services.mineru_adapter import ARTIFACT_NAMES
 
 ALLOWED_MIME_TYPES = {
     "application/pdf",
@@ -51,4 +52,18 @@ def validate_pages(start_page: int | None, end_page: int | None, settings: Setti
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end_page must be >= start_page")
     if start_page is not None and end_page is not None:
         if (end_page - start_page + 1) > settings.max_pages:
-            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Too many pages requested")
\ No newline at end of file
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Too many pages requested")
+
+
+def validate_outputs(outputs: str | None) -> tuple[str, ...]:
+    """Parse the comma-separated ``outputs`` form field; empty means every artifact."""
+    if outputs is None or not outputs.strip():
+        return ARTIFACT_NAMES
+    requested = {item.strip() for item in outputs.split(",") if item.strip()}
+    unknown = sorted(requested - set(ARTIFACT_NAMES))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown outputs: {', '.join(unknown)} (options: {', '.join(ARTIFACT_NAMES)})",
+        )
+    return tuple(name for name in ARTIFACT_NAMES if name in requested)
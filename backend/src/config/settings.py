@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -11,13 +11,92 @@ class Settings(BaseSettings):
 
     max_file_bytes: int = 50 * 1024 * 1024
     max_pages: int = 50
+    oversize_pdf_policy: Literal["reject", "clamp"] = "reject"
+    preflight_text_min_chars: int = 50
+    preflight_txt_coverage: float = 0.9
     max_files: int = 5
+    upload_chunk_bytes: int = 1024 * 1024
+    normalize_workers: int = 4
+    conversion_timeout_seconds: float = 120.0
+    image_render_dpi: int = 200
+    image_max_side_px: int = 3500
+    image_max_pixels: int = 100_000_000
+
+    office_pool_size: int = 2
+    office_base_port: int = 2003
+    office_startup_timeout_seconds: float = 30.0
+    office_profile_path: str = "/tmp/mineru-office-profiles"
+    office_cache_path: str = "/tmp/mineru-office-cache"
+    office_cache_entries: int = 256
 
     app_port: int = 19833
     output_base_path: str = "/tmp/mineru-outputs"
     output_ttl_hours: int = 24
+    storage_quota_bytes: int = 0
+    storage_quota_low_watermark: float = 0.9
+    janitor_interval_seconds: float = 60.0
+    job_index_path: str | None = None
+    storage_backend: Literal["local", "s3"] = "local"
+    s3_bucket: str | None = None
+    s3_prefix: str = ""
+    s3_endpoint_url: str | None = None
+    s3_region: str | None = None
+    s3_access_key_id: str | None = None
+    s3_secret_access_key: str | None = None
+    s3_multipart_chunk_bytes: int = 8 * 1024 * 1024
+    s3_presign_downloads: bool = True
+    s3_presign_ttl_seconds: int = 900
+    artifact_write_mode: Literal["sync", "async"] = "async"
+    artifact_write_workers: int = 2
+    artifact_compression: Literal["none", "gzip", "zstd"] = "gzip"
+    artifact_compression_level: int = 6
+    artifact_compression_min_bytes: int = 1024
+    response_gzip_min_bytes: int = 1024
+    response_gzip_level: int = 5
+
+    parse_workers: int = 2
+    job_queue_size: int = 32
+    job_max_records: int = 1000
+    parse_execution_mode: Literal["thread", "process"] = "thread"
+    worker_max_jobs: int = 100
+    worker_max_rss_mb: int = 0
+    worker_start_method: str = "spawn"
+
+    max_concurrent_parses: int = 2
+    max_queued_parses: int = 8
+    backend_concurrency_limits: Dict[str, int] = Field(default_factory=dict)
+    auto_backends: List[str] = Field(default_factory=lambda: ["pipeline"])
+    backend_cost_weights: Dict[str, float] = Field(default_factory=dict)
+    backend_page_seconds: Dict[str, float] = Field(default_factory=dict)
+    router_default_page_seconds: float = 2.0
+    router_mismatch_penalty: float = 2.0
+    vlm_server_urls: List[str] = Field(default_factory=list)
+    vlm_endpoint_max_concurrent: int = 4
+    vlm_endpoint_wait_seconds: float = 60.0
+    vlm_max_attempts: int = 2
+    vlm_circuit_failures: int = 3
+    vlm_circuit_open_seconds: float = 30.0
+    vlm_health_path: str = "/health"
+    vlm_health_timeout_seconds: float = 2.0
+
+    result_cache_enabled: bool = True
+    result_cache_max_entries: int = 512
+    result_cache_ttl_seconds: int = 6 * 60 * 60
+
+    batch_window_ms: int = 50
+    batch_max_pages: int = 64
+    shard_pages: int = 8
+    shard_min_pages: int = 16
+    page_cache_path: str = "/tmp/mineru-page-cache"
+    page_cache_entries: int = 0
+    page_cache_render_scale: float = 0.5
 
     mineru_model_source: str = "local"
+    mineru_preload: bool = True
+    mineru_warmup: bool = True
+    mineru_warmup_backend: str = "pipeline"
+    mineru_warmup_retry_seconds: float = 5.0
+    mineru_warmup_retry_max_seconds: float = 300.0
     swagger_server_url: str = "http://localhost:19833"
 
     api_key_required: bool = False
@@ -1,27 +1,74 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.openapi.utils import get_openapi
 
 from src.config.settings import get_settings
 from src.observability.logging import setup_logging
-from src.api import health, parse
+from src.api import health, jobs, parse
 from src.api.middleware import (
+    BodySizeLimitMiddleware,
     RequestContextMiddleware,
     http_exception_handler,
     unhandled_exception_handler,
 )
+from src.services.artifact_writer import get_artifact_writer
+from src.services.engine import get_engine
+from src.services.janitor import get_janitor
+from src.services.office_converter import get_office_converter
+from src.services.vlm_endpoints import get_vlm_pool
+from src.services.worker_pool import get_worker_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    warmup = None
+    pool = get_worker_pool()
+    if settings.mineru_preload and pool.mode == "thread":
+        # Warm up in the background so liveness answers immediately while readiness stays false.
+        warmup = asyncio.create_task(get_engine().warm_up_until_ready())
+    app.state.engine_warmup = warmup
+    office = get_office_converter()
+    office_start = asyncio.create_task(asyncio.to_thread(office.start))
+    janitor = get_janitor()
+    janitor.start()
+    yield
+    await janitor.stop()
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    if not office_start.done():
+        office_start.cancel()
+    pool.shutdown(wait=False)
+    office.shutdown()
+    # Let background artifact writes finish so no job is left half-persisted.
+    get_artifact_writer().flush(timeout=30)
+    janitor.index.close()
+    get_vlm_pool().close()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
     setup_logging()
-    app = FastAPI(title="Octopus Document Parser API", version="1.0.0")
+    app = FastAPI(title="Octopus Document Parser API", version="1.0.0", lifespan=lifespan)
 
+    # Inside RequestContextMiddleware, so its 413 carries the request id and is counted.
+    app.add_middleware(BodySizeLimitMiddleware)
     app.add_middleware(RequestContextMiddleware)
     app.add_exception_handler(Exception, unhandled_exception_handler)
     app.add_exception_handler(HTTPException, http_exception_handler)
 
+    # Skips responses that already carry a Content-Encoding, such as pre-compressed artifacts.
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.response_gzip_min_bytes,
+        compresslevel=settings.response_gzip_level,
+    )
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_allow_origins_normalized,
@@ -32,6 +79,7 @@ def create_app() -> FastAPI:
 
     app.include_router(health.router)
     app.include_router(parse.router, prefix="/api/v1")
+    app.include_router(jobs.router, prefix="/api/v1")
 
     def custom_openapi():  # pragma: no cover - thin schema customization
         if app.openapi_schema:
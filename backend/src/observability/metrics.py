@@ -1,8 +1,16 @@
 from __future__ import annotations
 
 import statistics
+import time
 from collections import Counter, deque
-from typing import Deque, Dict
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator
+
+
+def _p95(samples: Deque[float]) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=20)[-1]
 
 
 class MetricsRecorder:
@@ -10,12 +18,31 @@ class MetricsRecorder:
         self.window = window
         self.requests: Deque[float] = deque(maxlen=window)
         self.status_codes: Counter[int] = Counter()
+        self.stages: Dict[str, Deque[float]] = {}
+        self.stage_counts: Counter[str] = Counter()
+        self.counters: Dict[str, Counter[str]] = {}
 
     def record(self, status_code: int, duration_ms: float) -> None:
         self.requests.append(duration_ms)
         self.status_codes[status_code] += 1
 
-    def snapshot(self) -> Dict[str, float]:
+    def record_stage(self, stage: str, duration_ms: float) -> None:
+        self.stages.setdefault(stage, deque(maxlen=self.window)).append(duration_ms)
+        self.stage_counts[stage] += 1
+
+    def count(self, name: str, label: str) -> None:
+        """Count an event under ``name`` (e.g. which backend the router picked)."""
+        self.counters.setdefault(name, Counter())[label] += 1
+
+    @contextmanager
+    def time_stage(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, (time.perf_counter() - start) * 1000)
+
+    def snapshot(self) -> Dict[str, Any]:
         if self.requests:
             p95 = statistics.quantiles(self.requests, n=20)[-1]
             avg = statistics.fmean(self.requests)
@@ -29,6 +56,15 @@ class MetricsRecorder:
             "failures_total": failures,
             "latency_avg_ms": round(avg, 2),
             "latency_p95_ms": round(p95, 2),
+            "stages": {
+                stage: {
+                    "count": self.stage_counts[stage],
+                    "avg_ms": round(statistics.fmean(samples), 2),
+                    "p95_ms": round(_p95(samples), 2),
+                }
+                for stage, samples in sorted(self.stages.items())
+            },
+            "counters": {name: dict(sorted(counts.items())) for name, counts in sorted(self.counters.items())},
         }
 
 
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import statistics
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Deque
+
+from fastapi import HTTPException, status
+
+from src.config.settings import Settings, get_settings
+
+# Assumed service time before any parse has been observed.
+DEFAULT_SERVICE_SECONDS = 30.0
+
+
+class AdmissionTicket:
+    """A granted parse slot; ``release`` must be called exactly once when the work finishes."""
+
+    def __init__(self, limiter: "BackendLimiter", wait_seconds: float) -> None:
+        self.limiter = limiter
+        self.wait_seconds = wait_seconds
+        self.granted_at = time.perf_counter()
+        self._released = False
+
+    def release(self, observed: bool = True) -> None:
+        """Free the slot; ``observed=False`` when no work ran, so it does not count as a service time."""
+        if self._released:
+            return
+        self._released = True
+        self.limiter.release(time.perf_counter() - self.granted_at if observed else None)
+
+
+class BackendLimiter:
+    """Concurrency limit plus a bounded FIFO wait queue for one backend."""
+
+    def __init__(self, backend: str, max_concurrent: int, max_queued: int, window: int = 100) -> None:
+        self.backend = backend
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queued = max(0, max_queued)
+        self.active = 0
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.service_times: Deque[float] = deque(maxlen=window)
+        self.wait_times: Deque[float] = deque(maxlen=window)
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self, bounded: bool = True) -> AdmissionTicket:
+        start = time.perf_counter()
+        if self.active < self.max_concurrent and not self.queued:
+            self.active += 1
+            return self._grant(start)
+        if bounded and self.queued >= self.max_queued:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Too many concurrent parses for backend {self.backend}",
+                headers={"Retry-After": str(self.retry_after())},
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on.
+                self.release(None)
+            else:
+                self._discard(waiter)
+            raise
+        return self._grant(start)
+
+    def release(self, service_seconds: float | None) -> None:
+        if service_seconds is not None:
+            self.service_times.append(service_seconds)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter so `active` stays accurate.
+                waiter.set_result(None)
+                return
+        self.active = max(self.active - 1, 0)
+
+    def retry_after(self) -> int:
+        service = statistics.fmean(self.service_times) if self.service_times else DEFAULT_SERVICE_SECONDS
+        backlog = self.queued + 1
+        return max(1, math.ceil(service * backlog / self.max_concurrent))
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "limit": self.max_concurrent,
+            "active": self.active,
+            "queued": self.queued,
+            "queue_limit": self.max_queued,
+            "rejected_total": self.rejected,
+            "wait_avg_ms": round(statistics.fmean(self.wait_times) * 1000, 2) if self.wait_times else 0.0,
+            "service_avg_ms": round(statistics.fmean(self.service_times) * 1000, 2) if self.service_times else 0.0,
+        }
+
+    def _grant(self, start: float) -> AdmissionTicket:
+        wait_seconds = time.perf_counter() - start
+        self.wait_times.append(wait_seconds)
+        return AdmissionTicket(self, wait_seconds)
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+class AdmissionController:
+    """Per-backend admission control: callers beyond the limit wait, and beyond the queue get 429."""
+
+    def __init__(self, settings: Settings | None = None) -> None:
+        self.settings = settings or get_settings()
+        self._limiters: dict[str, BackendLimiter] = {}
+
+    def limiter(self, backend: str) -> BackendLimiter:
+        limiter = self._limiters.get(backend)
+        if limiter is None:
+            default = self.settings.max_concurrent_parses
+            if backend == "vlm-http-client" and self.settings.vlm_server_urls:
+                # Enough parses to fill every configured inference endpoint.
+                default = len(self.settings.vlm_server_urls) * self.settings.vlm_endpoint_max_concurrent
+            limit = self.settings.backend_concurrency_limits.get(backend, default)
+            limiter = BackendLimiter(backend, max_concurrent=limit, max_queued=self.settings.max_queued_parses)
+            self._limiters[backend] = limiter
+        return limiter
+
+    async def acquire(self, backend: str, bounded: bool = True) -> AdmissionTicket:
+        return await self.limiter(backend).acquire(bounded=bounded)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        return {backend: limiter.snapshot() for backend, limiter in sorted(self._limiters.items())}
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    return AdmissionController()
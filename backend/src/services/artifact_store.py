@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import mimetypes
+import os
+import shutil
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from src.config.settings import Settings, get_settings
+
+_CHUNK_SIZE = 64 * 1024
+# Content-Encoding of a stored artifact -> suffix appended to its logical file name.
+ARTIFACT_ENCODINGS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    """Metadata of one stored object; ``key`` is the posix path under the storage root."""
+
+    key: str
+    size: int
+    modified: datetime
+    etag: str
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    # Write beside the target and rename so readers never see a half-written artifact.
+    partial = path.with_name(f".{path.name}.partial")
+    partial.write_bytes(data)
+    os.replace(partial, path)
+
+
+class ArtifactStore(ABC):
+    """Where job artifacts live, addressed by keys relative to the storage root (``<job_id>/<name>``).
+
+    Parsing always happens in a local scratch directory (``root``); the store decides where the
+    results are kept and served from.
+    """
+
+    name = "base"
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def put(self, key: str, data: bytes) -> None:
+        self.upload(key, (data,))
+
+    @abstractmethod
+    def upload(self, key: str, chunks: Iterable[bytes]) -> None:
+        """Store ``chunks`` under ``key``, replacing any object already there."""
+
+    @abstractmethod
+    def stat(self, key: str) -> StoredObject | None:
+        """Metadata of ``key``, or None when it is not stored."""
+
+    @abstractmethod
+    def iter_bytes(self, key: str, chunk_size: int = _CHUNK_SIZE) -> Iterator[bytes]:
+        """The stored bytes of ``key``, in chunks."""
+
+    @abstractmethod
+    def list(self, prefix: str) -> list[StoredObject]:
+        """Every object whose key starts with ``prefix``."""
+
+    def jobs(self) -> Iterator[tuple[str, float]]:
+        """Top-level job ids with their latest modification time (epoch seconds)."""
+        latest: dict[str, float] = {}
+        for item in self.list(""):
+            job_id = item.key.split("/", 1)[0]
+            latest[job_id] = max(latest.get(job_id, 0.0), item.modified.timestamp())
+        return iter(latest.items())
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every object whose key starts with ``prefix``."""
+
+    def local_path(self, key: str) -> Path | None:
+        """A file on this host holding ``key``, for sendfile-backed responses."""
+        return None
+
+    def download_url(self, key: str) -> str | None:
+        """A URL clients can fetch ``key`` from directly, bypassing the API."""
+        return None
+
+
+class LocalArtifactStore(ArtifactStore):
+    """Artifacts kept in the local scratch directory itself (single instance deployments)."""
+
+    name = "local"
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def upload(self, key: str, chunks: Iterable[bytes]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f".{path.name}.partial")
+        with partial.open("wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        os.replace(partial, path)
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, data)
+
+    def stat(self, key: str) -> StoredObject | None:
+        path = self._path(key)
+        try:
+            result = path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not path.is_file():
+            return None
+        return self._object(key, result)
+
+    def iter_bytes(self, key: str, chunk_size: int = _CHUNK_SIZE) -> Iterator[bytes]:
+        with self._path(key).open("rb") as handle:
+            while chunk := handle.read(chunk_size):
+                yield chunk
+
+    def list(self, prefix: str) -> list[StoredObject]:
+        base = self._path(prefix)
+        if not base.is_dir():
+            return []
+        found = []
+        for directory, _, files in os.walk(base):
+            for name in files:
+                path = Path(directory) / name
+                try:
+                    found.append(self._object(path.relative_to(self.root).as_posix(), path.stat()))
+                except FileNotFoundError:
+                    continue
+        return sorted(found, key=lambda item: item.key)
+
+    def jobs(self) -> Iterator[tuple[str, float]]:
+        # One scandir of the root instead of walking every job.
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False) and not entry.name.startswith("."):
+                    yield entry.name, entry.stat(follow_symlinks=False).st_mtime
+
+    def delete_prefix(self, prefix: str) -> None:
+        shutil.rmtree(self._path(prefix), ignore_errors=True)
+
+    def local_path(self, key: str) -> Path | None:
+        return self._path(key)
+
+    @staticmethod
+    def _object(key: str, result: os.stat_result) -> StoredObject:
+        return StoredObject(
+            key=key,
+            size=result.st_size,
+            modified=datetime.fromtimestamp(result.st_mtime, tz=timezone.utc),
+            etag=f"{result.st_mtime_ns:x}-{result.st_size:x}",
+        )
+
+
+def _is_missing(exc: Exception) -> bool:
+    error = getattr(exc, "response", None) or {}
+    return str(error.get("Error", {}).get("Code")) in {"404", "NoSuchKey", "NotFound"}
+
+
+class S3ArtifactStore(ArtifactStore):
+    """Artifacts kept in an S3-compatible bucket so any replica can serve any job.
+
+    ``client`` is a boto3 S3 client (or anything with the same methods). Uploads larger than one
+    part go through a multipart upload fed chunk by chunk, so nothing is buffered beyond one part.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        root: str | Path,
+        client: Any,
+        bucket: str,
+        prefix: str = "",
+        part_size: int = 8 * 1024 * 1024,
+        presign_seconds: int = 0,
+    ) -> None:
+        super().__init__(root)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        # S3 rejects multipart parts below 5 MiB (except the last one).
+        self.part_size = max(part_size, 5 * 1024 * 1024)
+        self.presign_seconds = presign_seconds
+
+    def __getstate__(self) -> dict:
+        # boto3 clients cannot be pickled; a worker process uses its own.
+        state = self.__dict__.copy()
+        state.pop("client", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.client = get_s3_client()
+
+    def _object_key(self, key: str) -> str:
+        return self.prefix + key
+
+    def upload(self, key: str, chunks: Iterable[bytes]) -> None:
+        object_key = self._object_key(key)
+        buffer = bytearray()
+        upload_id: str | None = None
+        parts: list[dict] = []
+        try:
+            for chunk in chunks:
+                buffer += chunk
+                while len(buffer) >= self.part_size:
+                    if upload_id is None:
+                        upload_id = self.client.create_multipart_upload(
+                            Bucket=self.bucket,
+                            Key=object_key,
+                            **self._headers(key),
+                        )["UploadId"]
+                    part, buffer = bytes(buffer[: self.part_size]), buffer[self.part_size :]
+                    parts.append(self._upload_part(object_key, upload_id, len(parts) + 1, part))
+            if upload_id is None:
+                self.client.put_object(Bucket=self.bucket, Key=object_key, Body=bytes(buffer), **self._headers(key))
+                return
+            if buffer:
+                parts.append(self._upload_part(object_key, upload_id, len(parts) + 1, bytes(buffer)))
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            if upload_id is not None:
+                self.client.abort_multipart_upload(Bucket=self.bucket, Key=object_key, UploadId=upload_id)
+            raise
+
+    @staticmethod
+    def _headers(key: str) -> dict[str, str]:
+        # Stored so presigned downloads come back with the same headers the API would send.
+        headers = {}
+        for encoding, suffix in ARTIFACT_ENCODINGS.items():
+            if key.endswith(suffix):
+                key, headers["ContentEncoding"] = key[: -len(suffix)], encoding
+                break
+        media_type, _ = mimetypes.guess_type(key)
+        headers["ContentType"] = media_type or "application/octet-stream"
+        return headers
+
+    def _upload_part(self, object_key: str, upload_id: str, number: int, data: bytes) -> dict:
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=object_key,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=data,
+        )
+        return {"ETag": response["ETag"], "PartNumber": number}
+
+    def stat(self, key: str) -> StoredObject | None:
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except Exception as exc:  # noqa: BLE001 - botocore's ClientError, without importing botocore
+            if _is_missing(exc):
+                return None
+            raise
+        return StoredObject(
+            key=key,
+            size=response["ContentLength"],
+            modified=response["LastModified"],
+            etag=response["ETag"].strip('"'),
+        )
+
+    def iter_bytes(self, key: str, chunk_size: int = _CHUNK_SIZE) -> Iterator[bytes]:
+        body = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))["Body"]
+        try:
+            while chunk := body.read(chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    def list(self, prefix: str) -> list[StoredObject]:
+        found = []
+        request = {"Bucket": self.bucket, "Prefix": self._object_key(prefix)}
+        while True:
+            response = self.client.list_objects_v2(**request)
+            for item in response.get("Contents", []):
+                found.append(
+                    StoredObject(
+                        key=item["Key"][len(self.prefix) :],
+                        size=item["Size"],
+                        modified=item["LastModified"],
+                        etag=item["ETag"].strip('"'),
+                    ),
+                )
+            if not response.get("IsTruncated"):
+                return found
+            request["ContinuationToken"] = response["NextContinuationToken"]
+
+    def delete_prefix(self, prefix: str) -> None:
+        keys = [self._object_key(item.key) for item in self.list(prefix)]
+        # DeleteObjects takes at most 1000 keys per call.
+        for start in range(0, len(keys), 1000):
+            batch = [{"Key": key} for key in keys[start : start + 1000]]
+            self.client.delete_objects(Bucket=self.bucket, Delete={"Objects": batch, "Quiet": True})
+
+    def download_url(self, key: str) -> str | None:
+        if self.presign_seconds <= 0:
+            return None
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._object_key(key)},
+            ExpiresIn=self.presign_seconds,
+        )
+
+
+class StoreDataWriter:
+    """Miner-U ``DataWriter`` that sends what Miner-U writes (page images) straight to a store.
+
+    Miner-U only calls ``write``/``write_string`` on its writers, with paths relative to the
+    directory the writer was created for.
+    """
+
+    def __init__(self, store: ArtifactStore, prefix: str) -> None:
+        self.store = store
+        self.prefix = prefix.strip("/")
+
+    def write(self, path: str, data: bytes) -> None:
+        self.store.put(f"{self.prefix}/{path.lstrip('/')}", data)
+
+    def write_string(self, path: str, data: str) -> None:
+        self.write(path, data.encode("utf-8"))
+
+
+def _s3_client(settings: Settings) -> Any:
+    try:
+        import boto3
+    except ImportError as exc:
+        raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install 'mineru-interface[s3]')") from exc
+    return boto3.client(
+        "s3",
+        endpoint_url=settings.s3_endpoint_url,
+        region_name=settings.s3_region,
+        aws_access_key_id=settings.s3_access_key_id,
+        aws_secret_access_key=settings.s3_secret_access_key,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_s3_client() -> Any:
+    # boto3 clients are thread-safe and expensive to build; share one per process.
+    return _s3_client(get_settings())
+
+
+def create_artifact_store(settings: Settings, root: str | Path | None = None, client: Any = None) -> ArtifactStore:
+    root = Path(root or settings.output_base_path)
+    if settings.storage_backend != "s3":
+        return LocalArtifactStore(root)
+    if not settings.s3_bucket:
+        raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+    return S3ArtifactStore(
+        root,
+        client=client or get_s3_client(),
+        bucket=settings.s3_bucket,
+        prefix=settings.s3_prefix,
+        part_size=settings.s3_multipart_chunk_bytes,
+        presign_seconds=settings.s3_presign_ttl_seconds if settings.s3_presign_downloads else 0,
+    )
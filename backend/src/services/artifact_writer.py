@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from loguru import logger
+
+from src.config.settings import get_settings
+from src.services.mineru_adapter import MineruOutputPaths
+from src.services.artifact_store import write_atomic
+from src.services.serialization import dumps_json
+from src.services.storage import ARTIFACT_ENCODINGS, encode_artifact, zstd_available
+
+if TYPE_CHECKING:
+    from src.services.storage import StorageManager
+
+
+def _write_local(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, data)
+
+
+def _encode_text(text: str) -> bytes:
+    return text.encode("utf-8")
+
+
+def _artifacts(output: MineruOutputPaths) -> list[tuple[Path, Any, Callable[[Any], bytes]]]:
+    candidates = (
+        (output.markdown, output.markdown_text, _encode_text),
+        (output.content_list, output.content_list_data, dumps_json),
+        (output.middle_json, output.middle_json_data, dumps_json),
+        (output.model_output, output.model_output_data, dumps_json),
+    )
+    return [(Path(path), payload, render) for path, payload, render in candidates if path and payload is not None]
+
+
+def write_artifacts(
+    output: MineruOutputPaths,
+    compression: str = "none",
+    level: int = 6,
+    min_bytes: int = 0,
+    storage: "StorageManager | None" = None,
+) -> None:
+    """Persist the in-memory results of one document to its artifact paths.
+
+    Artifacts of at least ``min_bytes`` are stored compressed, with the encoding's suffix appended
+    to the file name (``find_artifact`` finds either form). With ``storage`` they go to its
+    artifact store; otherwise straight to the local paths.
+    """
+    put = storage.put_artifact if storage is not None else _write_local
+    for path, payload, render in _artifacts(output):
+        data = render(payload)
+        if compression in ARTIFACT_ENCODINGS and len(data) >= min_bytes:
+            put(path.with_name(path.name + ARTIFACT_ENCODINGS[compression]), encode_artifact(data, compression, level))
+        else:
+            put(path, data)
+
+
+class ArtifactWriter:
+    """Writes parse results to storage on background threads, off the response path."""
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        compression: str = "none",
+        level: int = 6,
+        min_bytes: int = 0,
+    ) -> None:
+        if compression == "zstd" and not zstd_available():
+            logger.warning("zstandard is not installed; storing artifacts with gzip instead")
+            compression = "gzip"
+        self.compression = compression
+        self.level = level
+        self.min_bytes = min_bytes
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="artifact-writer")
+        self._lock = threading.Lock()
+        self._pending: set[Future] = set()
+        self._pending_paths: dict[Path, Future] = {}
+        self.written = 0
+        self.failed = 0
+
+    def submit(self, outputs: Iterable[MineruOutputPaths], storage: "StorageManager | None" = None) -> Future:
+        outputs = [output for output in outputs if output.in_memory]
+        paths = [path.resolve() for output in outputs for path, _, _ in _artifacts(output)]
+        with self._lock:
+            future = self._executor.submit(self._write_all, outputs, storage)
+            self._pending.add(future)
+            for path in paths:
+                self._pending_paths[path] = future
+        future.add_done_callback(lambda done: self._finished(done, paths))
+        return future
+
+    def pending(self, path: str | Path) -> Future | None:
+        """The write that will produce ``path``, if it has not landed yet."""
+        with self._lock:
+            return self._pending_paths.get(Path(path).resolve())
+
+    def pending_in(self, directory: str | Path) -> list[Future]:
+        """Writes still in flight for artifacts under ``directory``."""
+        directory = Path(directory).resolve()
+        with self._lock:
+            return list({future for path, future in self._pending_paths.items() if path.is_relative_to(directory)})
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Block until every write submitted so far has finished."""
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            try:
+                future.result(timeout=timeout)
+            except Exception:  # noqa: BLE001 - already counted and logged
+                pass
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            pending = len(self._pending)
+        return {"pending": pending, "written": self.written, "failed": self.failed}
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _write_all(self, outputs: list[MineruOutputPaths], storage: "StorageManager | None") -> None:
+        for output in outputs:
+            write_artifacts(output, self.compression, self.level, self.min_bytes, storage=storage)
+
+    def _finished(self, future: Future, paths: list[Path]) -> None:
+        with self._lock:
+            self._pending.discard(future)
+            for path in paths:
+                if self._pending_paths.get(path) is future:
+                    del self._pending_paths[path]
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.written += 1
+        if not future.cancelled() and future.exception() is not None:
+            logger.opt(exception=future.exception()).error("failed to persist parse artifacts")
+
+
+@lru_cache(maxsize=1)
+def get_artifact_writer() -> ArtifactWriter:
+    settings = get_settings()
+    return ArtifactWriter(
+        max_workers=settings.artifact_write_workers,
+        compression=settings.artifact_compression,
+        level=settings.artifact_compression_level,
+        min_bytes=settings.artifact_compression_min_bytes,
+    )
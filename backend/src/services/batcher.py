@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Sequence
+
+from loguru import logger
+
+from src.config.settings import get_settings
+from src.services.mineru_adapter import MineruAdapter, MineruOutputPaths
+from src.services.storage import StorageManager
+from src.services.worker_pool import ParseWorkerPool, get_normalize_pool, get_worker_pool
+
+if TYPE_CHECKING:
+    from src.services.parse_service import ParseParams
+
+
+def count_pdf_pages(source: bytes | Path) -> int:
+    try:
+        import pypdfium2 as pdfium
+
+        pdf = pdfium.PdfDocument(source)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    except Exception:  # noqa: BLE001 - an unreadable PDF still counts as one unit of work
+        return 1
+
+
+def _requested_pages(total: int, params: "ParseParams") -> int:
+    start = params.start_page or 0
+    end = total - 1 if params.end_page is None else min(params.end_page, total - 1)
+    return max(end - start + 1, 1)
+
+
+@dataclass
+class _BatchItem:
+    name: str
+    source: bytes | Path
+    lang: str
+    output_dir: Path
+    pages: int
+    future: asyncio.Future
+    storage: StorageManager | None = None
+
+
+@dataclass
+class _Batch:
+    params: "ParseParams"
+    items: list[_BatchItem] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+    @property
+    def pages(self) -> int:
+        return sum(item.pages for item in self.items)
+
+
+class PipelineBatcher:
+    """Collects pipeline-backend documents across requests into one ``pipeline_doc_analyze`` call.
+
+    A batch is flushed when its window elapses or its page budget is reached. Documents are only
+    combined when every option shared by the Miner-U call (method, page range, formula/table flags,
+    requested outputs) matches; ``lang`` is passed per document.
+    """
+
+    def __init__(
+        self,
+        window_ms: int,
+        max_pages: int,
+        worker_pool: ParseWorkerPool | None = None,
+        normalize_pool: ParseWorkerPool | None = None,
+    ) -> None:
+        self.window_s = max(window_ms, 0) / 1000
+        self.max_pages = max(max_pages, 1)
+        self.worker_pool = worker_pool or get_worker_pool()
+        self.normalize_pool = normalize_pool or get_normalize_pool()
+        self._batches: dict[tuple, _Batch] = {}
+        self._running: set[asyncio.Task] = set()
+        self.batches_run = 0
+        self.documents_batched = 0
+
+    async def submit(
+        self,
+        files: list[tuple[str, bytes | Path]],
+        params: "ParseParams",
+        output_dir: Path,
+        pages: Sequence[int | None] | None = None,
+        storage: StorageManager | None = None,
+    ) -> List[MineruOutputPaths]:
+        """Queue ``files`` for the next matching batch; ``pages`` are their page counts where known.
+
+        ``storage`` is where the caller keeps its artifacts; only documents sharing it are batched together.
+
+        Counts that are not known from pre-flight are taken on the normalize pool, off the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        key = self._batch_key(params, storage)
+        counts = list(pages) if pages is not None else [None] * len(files)
+        missing = [idx for idx, count in enumerate(counts) if count is None]
+        found = await asyncio.gather(*(self.normalize_pool.run(count_pdf_pages, files[idx][1]) for idx in missing))
+        for idx, count in zip(missing, found):
+            counts[idx] = count
+        futures: list[asyncio.Future] = []
+        for (name, source), count in zip(files, counts):
+            item = _BatchItem(
+                name=name,
+                source=source,
+                lang=params.lang,
+                output_dir=Path(output_dir),
+                pages=_requested_pages(count, params),
+                future=loop.create_future(),
+                storage=storage,
+            )
+            futures.append(item.future)
+            batch = self._batches.setdefault(key, _Batch(params=params))
+            batch.items.append(item)
+            if batch.pages >= self.max_pages:
+                self._flush(key)
+            elif batch.timer is None:
+                batch.timer = loop.call_later(self.window_s, self._flush, key)
+        return list(await asyncio.gather(*futures))
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "pending": sum(len(batch.items) for batch in self._batches.values()),
+            "running": len(self._running),
+            "batches_run": self.batches_run,
+            "documents_batched": self.documents_batched,
+        }
+
+    def _batch_key(self, params: "ParseParams", storage: StorageManager | None) -> tuple:
+        return (
+            storage,
+            params.parse_method,
+            params.start_page,
+            params.end_page,
+            params.formula_enable,
+            params.table_enable,
+            params.outputs,
+        )
+
+    def _flush(self, key: tuple) -> None:
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        # The loop only keeps weak references to tasks; hold on to it until the batch is done.
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: _Batch) -> None:
+        self.batches_run += 1
+        self.documents_batched += len(batch.items)
+        logger.info(f"pipeline batch files={len(batch.items)} pages={batch.pages}")
+        try:
+            outputs = await self._analyze(batch.items, batch.params)
+        except Exception as exc:  # noqa: BLE001
+            if len(batch.items) == 1:
+                self._fail(batch.items[0], exc)
+                return
+            # Retry one by one so a single bad document cannot fail unrelated requests.
+            logger.warning(f"pipeline batch failed, retrying {len(batch.items)} documents individually: {exc}")
+            await asyncio.gather(*(self._run_single(item, batch.params) for item in batch.items))
+            return
+        for item, output in zip(batch.items, outputs):
+            if not item.future.done():
+                item.future.set_result(output)
+
+    async def _run_single(self, item: _BatchItem, params: "ParseParams") -> None:
+        try:
+            (output,) = await self._analyze([item], params)
+        except Exception as exc:  # noqa: BLE001
+            self._fail(item, exc)
+        else:
+            if not item.future.done():
+                item.future.set_result(output)
+
+    def _fail(self, item: _BatchItem, exc: Exception) -> None:
+        if not item.future.done():
+            item.future.set_exception(exc)
+
+    async def _analyze(self, items: list[_BatchItem], params: "ParseParams") -> List[MineruOutputPaths]:
+        adapter = MineruAdapter(output_dir=items[0].output_dir, storage=items[0].storage)
+        return await self.worker_pool.run(
+            adapter.parse_from_bytes,
+            [(item.name, item.source) for item in items],
+            lang=[item.lang for item in items],
+            backend="pipeline",
+            parse_method=params.parse_method,
+            start_page=params.start_page or 0,
+            end_page=params.end_page,
+            formula_enable=params.formula_enable,
+            table_enable=params.table_enable,
+            output_dirs=[item.output_dir for item in items],
+            outputs=params.outputs,
+        )
+
+
+@lru_cache(maxsize=1)
+def get_batcher() -> PipelineBatcher:
+    settings = get_settings()
+    return PipelineBatcher(window_ms=settings.batch_window_ms, max_pages=settings.batch_max_pages)
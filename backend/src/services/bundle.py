@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import io
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from src.services.artifact_store import ArtifactStore, StoredObject
+from src.services.storage import ARTIFACT_ENCODINGS, decode_chunks
+
+# Already-compressed formats gain nothing from deflate.
+_STORED_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".jp2", ".pdf", ".zip"}
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable write target that hands the archive bytes out as they are produced."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        yield from chunks
+
+
+def job_entries(objects: Iterable[StoredObject]) -> list[tuple[str, StoredObject, str | None]]:
+    """Stored files of a job as (archive name, stored object, Content-Encoding)."""
+    entries = []
+    for item in sorted(objects, key=lambda stored: stored.key):
+        arcname, encoding = item.key.split("/", 1)[1], None
+        for candidate, suffix in ARTIFACT_ENCODINGS.items():
+            if arcname.endswith(suffix):
+                arcname, encoding = arcname[: -len(suffix)], candidate
+                break
+        entries.append((arcname, item, encoding))
+    return entries
+
+
+def iter_zip(
+    entries: Iterable[tuple[str, StoredObject, str | None]],
+    store: ArtifactStore,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """Build a ZIP archive on the fly, yielding it chunk by chunk in constant memory.
+
+    Compressed artifacts are unpacked into the archive under their original names.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for arcname, stored, encoding in entries:
+            modified = stored.modified.astimezone()
+            info = zipfile.ZipInfo(arcname, date_time=modified.timetuple()[:6])
+            compressed = Path(arcname).suffix.lower() in _STORED_SUFFIXES
+            info.compress_type = zipfile.ZIP_STORED if compressed else zipfile.ZIP_DEFLATED
+            with archive.open(info, "w", force_zip64=True) as member:
+                for chunk in decode_chunks(store.iter_bytes(stored.key, chunk_size), encoding):
+                    member.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+    yield from sink.drain()
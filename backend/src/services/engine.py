@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from types import SimpleNamespace
+
+from loguru import logger
+
+from src.config.settings import Settings, get_settings
+
+
+class MineruUnavailableError(RuntimeError):
+    """Raised when Miner-U optional dependencies are not present."""
+
+
+def _import_backends() -> SimpleNamespace:
+    try:
+        from mineru.cli.common import convert_pdf_bytes_to_bytes_by_pypdfium2, prepare_env, read_fn
+        from mineru.backend.pipeline.model_json_to_middle_json import result_to_middle_json as pipeline_result_to_middle_json
+        from mineru.backend.pipeline.pipeline_analyze import doc_analyze as pipeline_doc_analyze
+        from mineru.backend.pipeline.pipeline_middle_json_mkcontent import union_make as pipeline_union_make
+        from mineru.backend.vlm.vlm_analyze import doc_analyze as vlm_doc_analyze
+        from mineru.backend.vlm.vlm_middle_json_mkcontent import union_make as vlm_union_make
+        from mineru.data.data_reader_writer import FileBasedDataWriter
+        from mineru.utils.enum_class import MakeMode
+    except ImportError as exc:  # torch or other heavy deps missing
+        raise MineruUnavailableError(f"Miner-U dependencies are not installed: {exc}") from exc
+
+    return SimpleNamespace(
+        convert_pdf_bytes_to_bytes_by_pypdfium2=convert_pdf_bytes_to_bytes_by_pypdfium2,
+        prepare_env=prepare_env,
+        read_fn=read_fn,
+        pipeline_result_to_middle_json=pipeline_result_to_middle_json,
+        pipeline_doc_analyze=pipeline_doc_analyze,
+        pipeline_union_make=pipeline_union_make,
+        vlm_doc_analyze=vlm_doc_analyze,
+        vlm_union_make=vlm_union_make,
+        FileBasedDataWriter=FileBasedDataWriter,
+        MakeMode=MakeMode,
+    )
+
+
+def _warmup_pdf() -> bytes:
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (400, 200), "white")
+    ImageDraw.Draw(image).text((20, 80), "Miner-U warm-up", fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PDF")
+    return buffer.getvalue()
+
+
+class MineruEngine:
+    """Process-wide Miner-U backends, imported once and warmed up before serving traffic."""
+
+    def __init__(self, settings: Settings | None = None) -> None:
+        self.settings = settings or get_settings()
+        self._modules: SimpleNamespace | None = None
+        self._lock = threading.Lock()
+        self.ready = False
+        self.error: str | None = None
+        self.warmup_ms: float | None = None
+        self.warmup_attempts = 0
+        self._warming = False
+
+    def modules(self) -> SimpleNamespace:
+        if self._modules is None:
+            with self._lock:
+                if self._modules is None:
+                    try:
+                        self._modules = _import_backends()
+                    except MineruUnavailableError as exc:
+                        self.error = str(exc)
+                        raise
+                    # Without a warm-up (MINERU_PRELOAD off) the first successful import is what readiness waits for.
+                    if not self._warming:
+                        self.ready = True
+                        self.error = None
+        return self._modules
+
+    def warm_up(self) -> bool:
+        """Import the backends and run a tiny parse so model weights are resident."""
+        from src.services.mineru_adapter import MineruAdapter
+
+        start = time.perf_counter()
+        self.warmup_attempts += 1
+        self._warming = True
+        try:
+            self.modules()
+            if self.settings.mineru_warmup:
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    MineruAdapter(output_dir=tmpdir, engine=self).parse_from_bytes(
+                        [("warmup", _warmup_pdf())],
+                        lang="en",
+                        backend=self.settings.mineru_warmup_backend,
+                    )
+        except Exception as exc:  # noqa: BLE001
+            self.ready = False
+            self.error = str(exc)
+            logger.warning(f"Miner-U warm-up failed: {exc}")
+            return False
+        finally:
+            self._warming = False
+
+        self.warmup_ms = (time.perf_counter() - start) * 1000
+        self.ready = True
+        self.error = None
+        logger.info(f"Miner-U engine ready in {self.warmup_ms:.0f}ms")
+        return True
+
+    async def warm_up_until_ready(self) -> None:
+        """Retry ``warm_up`` with exponential backoff so a transient failure does not leave the pod unready."""
+        delay = self.settings.mineru_warmup_retry_seconds
+        while not await asyncio.to_thread(self.warm_up):
+            logger.info(f"retrying Miner-U warm-up in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.settings.mineru_warmup_retry_max_seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warmup_attempts": self.warmup_attempts,
+            "loaded": self._modules is not None,
+            "warmup_ms": round(self.warmup_ms, 2) if self.warmup_ms is not None else None,
+            "error": self.error,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> MineruEngine:
+    return MineruEngine()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from typing import Iterable
+
+IMAGE_SUFFIXES = frozenset({"png", "jpg", "jpeg", "bmp", "gif", "webp", "jp2"})
+# Miner-U renders PDF pages at this DPI before handing them to its models.
+MINERU_RENDER_DPI = 200
+
+
+class ImageIngestError(ValueError):
+    """The upload could not be decoded as an image."""
+
+
+class ImageTooLargeError(ImageIngestError):
+    """The image has more pixels than ``IMAGE_MAX_PIXELS`` allows; it was refused before decoding."""
+
+
+@dataclass(frozen=True)
+class ImagePage:
+    """One image ready to be placed on a page: either the original JPEG bytes or a decoded bitmap."""
+
+    width: int
+    height: int
+    jpeg: bytes | None = None
+    bitmap: object | None = None  # PIL image in mode "L" or "RGB"
+
+
+def prepare_image(data: bytes, max_side: int, max_pixels: int | None = None) -> ImagePage:
+    """Decode an upload only as far as needed.
+
+    RGB/grayscale JPEGs that are already upright and within ``max_side`` are kept as-is
+    and embedded without re-encoding. Anything else is decoded once, rotated per EXIF, flattened
+    to grayscale or RGB and downscaled so its longest side is at most ``max_side`` pixels.
+    Images above ``max_pixels`` are refused from their header, before any decoding.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        img = Image.open(io.BytesIO(data))
+        width, height = img.size
+        if max_pixels is not None and width * height > max_pixels:
+            raise ImageTooLargeError(f"{width}x{height} image exceeds the {max_pixels} pixel limit")
+        if (
+            img.format == "JPEG"
+            and img.mode in {"L", "RGB"}
+            and img.getexif().get(0x0112, 1) == 1  # Orientation tag
+            and max(width, height) <= max_side
+        ):
+            return ImagePage(width=width, height=height, jpeg=data)
+
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in {"L", "RGB"}:
+            img = _flatten(img)
+        if max(img.size) > max_side:
+            img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        return ImagePage(width=img.width, height=img.height, bitmap=img)
+    except ImageIngestError:
+        raise
+    except Exception as exc:  # noqa: BLE001 - PIL raises a variety of errors for bad input
+        raise ImageIngestError(str(exc)) from exc
+
+
+def _flatten(img):
+    from PIL import Image
+
+    if img.mode in {"1", "I", "I;16", "F"}:
+        return img.convert("L")
+    if img.mode in {"RGBA", "LA", "PA"} or (img.mode == "P" and "transparency" in img.info):
+        # Transparent areas become white, as they look on a page, instead of black.
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, "white")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return img.convert("RGB")
+
+
+def images_to_pdf(pages: Iterable[ImagePage], dpi: int = MINERU_RENDER_DPI) -> bytes:
+    """Build a PDF in memory with one page per image.
+
+    Pages are sized so that rendering at ``dpi`` reproduces each image pixel for pixel, so Miner-U
+    neither upsamples small scans nor downsamples large ones again.
+    """
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument.new()
+    try:
+        for page_image in pages:
+            # PDF page sizes are single-precision and renderers round pixel sizes up, so stay a hair
+            # under the exact size rather than gaining a pixel row and column.
+            width = (page_image.width - 0.001) * 72 / dpi
+            height = (page_image.height - 0.001) * 72 / dpi
+            page = pdf.new_page(width, height)
+            image = pdfium.PdfImage.new(pdf)
+            if page_image.jpeg is not None:
+                image.load_jpeg(io.BytesIO(page_image.jpeg), inline=True)
+            else:
+                bitmap = pdfium.PdfBitmap.from_pil(page_image.bitmap)
+                image.set_bitmap(bitmap)
+                bitmap.close()
+            image.set_matrix(pdfium.PdfMatrix().scale(width, height))
+            page.insert_obj(image)
+            page.gen_content()
+            page.close()
+        buffer = io.BytesIO()
+        pdf.save(buffer)
+        return buffer.getvalue()
+    finally:
+        pdf.close()
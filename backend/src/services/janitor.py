@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Protocol
+
+from loguru import logger
+
+from src.config.settings import Settings, get_settings
+from src.services.office_converter import get_office_converter
+from src.services.page_cache import get_page_cache
+from src.services.storage import StorageManager
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at);
+CREATE INDEX IF NOT EXISTS jobs_last_access ON jobs (last_access);
+"""
+
+
+class JobIndex:
+    """SQLite record of every job directory: size, creation, last access and expiry (epoch seconds)."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def upsert(self, job_id: str, size_bytes: int, created_at: float, expires_at: float) -> None:
+        with self._lock:
+            self._connection().execute(
+                "INSERT INTO jobs (job_id, size_bytes, created_at, last_access, expires_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET size_bytes = excluded.size_bytes",
+                (job_id, size_bytes, created_at, created_at, expires_at),
+            )
+
+    def touch(self, accesses: dict[str, float]) -> None:
+        with self._lock:
+            self._connection().executemany(
+                "UPDATE jobs SET last_access = MAX(last_access, ?) WHERE job_id = ?",
+                [(accessed, job_id) for job_id, accessed in accesses.items()],
+            )
+
+    def remove(self, job_id: str) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def expired(self, now: float) -> list[str]:
+        with self._lock:
+            rows = self._connection().execute("SELECT job_id FROM jobs WHERE expires_at <= ?", (now,)).fetchall()
+        return [row[0] for row in rows]
+
+    def least_recently_used(self) -> list[tuple[str, int]]:
+        with self._lock:
+            return self._connection().execute("SELECT job_id, size_bytes FROM jobs ORDER BY last_access").fetchall()
+
+    def job_ids(self) -> set[str]:
+        with self._lock:
+            return {row[0] for row in self._connection().execute("SELECT job_id FROM jobs")}
+
+    def totals(self) -> tuple[int, int]:
+        with self._lock:
+            count, size = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM jobs").fetchone()
+        return count, size
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class ExpiringCache(Protocol):
+    def expire(self, older_than: float) -> int: ...
+
+
+class StorageJanitor:
+    """Single background task that expires jobs by TTL and evicts least recently used jobs over quota.
+
+    Requests only report job ids (``track`` after artifacts are written, ``touch`` on reads); sizes
+    are measured and directories removed by the sweep, off the request path.
+    """
+
+    def __init__(
+        self,
+        storage: StorageManager,
+        index: JobIndex,
+        settings: Settings | None = None,
+        caches: Iterable[ExpiringCache] = (),
+    ) -> None:
+        self.settings = settings or get_settings()
+        self.storage = storage
+        self.index = index
+        # Caches of user content that must not outlive the jobs they came from.
+        self.caches = list(caches)
+        self.ttl_seconds = storage.ttl_hours * 3600
+        self.quota_bytes = self.settings.storage_quota_bytes
+        self.low_watermark = self.settings.storage_quota_low_watermark
+        self._tracked: dict[str, float] = {}
+        self._touched: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._reconciled = False
+        self._task: asyncio.Task | None = None
+        self.expired_total = 0
+        self.evicted_total = 0
+        self.jobs = 0
+        self.bytes = 0
+        self.last_sweep: datetime | None = None
+
+    def track(self, job_id: str) -> None:
+        with self._lock:
+            self._tracked.setdefault(job_id, time.time())
+
+    def touch(self, job_id: str) -> None:
+        with self._lock:
+            self._touched[job_id] = time.time()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop(), name="storage-janitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception:  # noqa: BLE001 - keep sweeping on the next tick
+                logger.exception("storage janitor sweep failed")
+            await asyncio.sleep(self.settings.janitor_interval_seconds)
+
+    def sweep(self, now: float | None = None) -> dict[str, int]:
+        now = now if now is not None else time.time()
+        if not self._reconciled:
+            self._reconcile()
+        self._record_reports()
+
+        expired = [job_id for job_id in self.index.expired(now) if self._remove(job_id)]
+        self.expired_total += len(expired)
+
+        evicted: list[str] = []
+        if self.quota_bytes > 0:
+            _, total = self.index.totals()
+            if total > self.quota_bytes:
+                target = self.quota_bytes * self.low_watermark
+                for job_id, size in self.index.least_recently_used():
+                    if total <= target:
+                        break
+                    if self._remove(job_id):
+                        evicted.append(job_id)
+                        total -= size
+        self.evicted_total += len(evicted)
+        for cache in self.caches:
+            cache.expire(now - self.ttl_seconds)
+        self.jobs, self.bytes = self.index.totals()
+        self.last_sweep = datetime.now(timezone.utc)
+        if expired or evicted:
+            logger.info(f"storage janitor expired={len(expired)} evicted={len(evicted)}")
+        return {"expired": len(expired), "evicted": len(evicted)}
+
+    def snapshot(self) -> dict:
+        # As of the last sweep, so health checks never touch the index.
+        return {
+            "jobs": self.jobs,
+            "bytes": self.bytes,
+            "quota_bytes": self.quota_bytes,
+            "expired_total": self.expired_total,
+            "evicted_total": self.evicted_total,
+            "last_sweep": self.last_sweep.isoformat() if self.last_sweep else None,
+        }
+
+    def _record_reports(self) -> None:
+        with self._lock:
+            tracked, self._tracked = self._tracked, {}
+            touched, self._touched = self._touched, {}
+        for job_id, created_at in tracked.items():
+            size = self.storage.job_size(job_id)
+            if size is not None:
+                self.index.upsert(job_id, size, created_at, created_at + self.ttl_seconds)
+        if touched:
+            self.index.touch(touched)
+
+    def _reconcile(self) -> None:
+        # Adopt job directories left by an earlier process (or written before the index existed).
+        known = self.index.job_ids()
+        adopted = 0
+        for job_id, modified in self.storage.iter_jobs():
+            if job_id in known:
+                continue
+            self.index.upsert(job_id, self.storage.job_size(job_id) or 0, modified, modified + self.ttl_seconds)
+            adopted += 1
+        self._reconciled = True
+        if adopted:
+            logger.info(f"storage janitor indexed {adopted} existing job directories")
+
+    def _remove(self, job_id: str) -> bool:
+        with self._lock:
+            if job_id in self._tracked:
+                # Re-parsed into the same directory since the last sweep; keep it.
+                return False
+        self.storage.remove_job(job_id)
+        self.index.remove(job_id)
+        return True
+
+
+def create_janitor(settings: Settings) -> StorageJanitor:
+    storage = StorageManager(base_path=settings.output_base_path, ttl_hours=settings.output_ttl_hours)
+    index_path = settings.job_index_path or Path(settings.output_base_path) / ".job-index.sqlite3"
+    return StorageJanitor(
+        storage,
+        JobIndex(index_path),
+        settings=settings,
+        caches=[get_page_cache(), get_office_converter().cache],
+    )
+
+
+@lru_cache(maxsize=1)
+def get_janitor() -> StorageJanitor:
+    return create_janitor(get_settings())
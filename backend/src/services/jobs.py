@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import statistics
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Deque, List
+
+from fastapi import HTTPException, UploadFile, status
+from loguru import logger
+
+from src.config.settings import Settings, get_settings
+from src.observability.logging import get_request_id, set_request_id
+from src.services.admission import DEFAULT_SERVICE_SECONDS
+
+if TYPE_CHECKING:
+    from src.services.parse_service import ParseParams, ParseService
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class JobRecord:
+    job_id: str
+    request_id: str
+    status: str = JOB_QUEUED
+    created_at: datetime = field(default_factory=_utcnow)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    outputs: list[dict] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+    detail: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in {JOB_SUCCEEDED, JOB_FAILED}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "outputs": self.outputs,
+            "errors": self.errors,
+            "detail": self.detail,
+            "request_id": self.request_id,
+        }
+
+
+class JobManager:
+    """In-process job registry feeding a fixed number of parse workers from a bounded queue.
+
+    Finished jobs keep only their artifact URLs (``response_mode=reference``) and are dropped after
+    ``OUTPUT_TTL_HOURS``, or oldest first once more than ``JOB_MAX_RECORDS`` are kept.
+    """
+
+    def __init__(self, settings: Settings | None = None, window: int = 100) -> None:
+        self.settings = settings or get_settings()
+        self.jobs: dict[str, JobRecord] = {}
+        self.service_times: Deque[float] = deque(maxlen=window)
+        self._queue: asyncio.Queue | None = None
+        self._workers: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def submit(self, service: "ParseService", files: List[UploadFile], params: "ParseParams") -> JobRecord:
+        job = JobRecord(job_id=uuid.uuid4().hex, request_id=get_request_id())
+        queue = self._ensure_workers()
+        # Refuse before spooling and converting uploads that could not be queued anyway.
+        if queue.full():
+            raise self._queue_full(queue)
+        # Uploads are only readable during the request, so validate and spool them before queueing.
+        inputs = await service.prepare(files, params, job_id=job.job_id)
+        try:
+            queue.put_nowait((job, service, inputs, params))
+        except asyncio.QueueFull as exc:
+            # Other submissions may have filled the queue while this one was being prepared.
+            service.discard_inputs(job.job_id)
+            raise self._queue_full(queue) from exc
+        self.jobs[job.job_id] = job
+        self._prune()
+        logger.info(f"job queued job_id={job.job_id} depth={queue.qsize()}")
+        return job
+
+    def _queue_full(self, queue: asyncio.Queue) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Job queue is full",
+            headers={"Retry-After": str(self.retry_after(queue.qsize()))},
+        )
+
+    def retry_after(self, queued: int) -> int:
+        """Seconds for the workers to get through the queued jobs, from observed job durations."""
+        service = statistics.fmean(self.service_times) if self.service_times else DEFAULT_SERVICE_SECONDS
+        return max(1, math.ceil(service * (queued + 1) / max(1, self.settings.parse_workers)))
+
+    def get(self, job_id: str) -> JobRecord | None:
+        self._prune()
+        return self.jobs.get(job_id)
+
+    def snapshot(self) -> dict[str, int]:
+        self._prune()
+        counts = {JOB_QUEUED: 0, JOB_RUNNING: 0, JOB_SUCCEEDED: 0, JOB_FAILED: 0}
+        for job in self.jobs.values():
+            counts[job.status] += 1
+        return {"workers": len(self._workers), **counts}
+
+    def _ensure_workers(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            # Bind the queue and workers to the running loop; a new loop (e.g. app restart) starts fresh.
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=max(1, self.settings.job_queue_size))
+            self._workers = [
+                loop.create_task(self._worker(self._queue), name=f"parse-job-worker-{idx}")
+                for idx in range(max(1, self.settings.parse_workers))
+            ]
+        return self._queue
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            job, service, inputs, params = await queue.get()
+            try:
+                await self._execute(job, service, inputs, params)
+            finally:
+                queue.task_done()
+
+    async def _execute(self, job: JobRecord, service: "ParseService", inputs, params: "ParseParams") -> None:
+        set_request_id(job.request_id)
+        job.status = JOB_RUNNING
+        job.started_at = _utcnow()
+        start = time.perf_counter()
+        # Records outlive the request, so they keep the artifact URLs rather than the parsed content.
+        params = replace(params, response_mode="reference")
+        try:
+            # Accepted jobs already hold a queue slot, so they wait for admission rather than fail with 429.
+            job.outputs, job.errors = await service.run(inputs, params, job_id=job.job_id, reject_when_busy=False)
+        except HTTPException as exc:
+            job.status = JOB_FAILED
+            job.detail = str(exc.detail)
+        except Exception:  # noqa: BLE001
+            logger.exception(f"job failed job_id={job.job_id}")
+            job.status = JOB_FAILED
+            job.detail = "Parse failed"
+        else:
+            job.status = JOB_SUCCEEDED
+        finally:
+            job.finished_at = _utcnow()
+            self.service_times.append(time.perf_counter() - start)
+        logger.info(f"job finished job_id={job.job_id} status={job.status}")
+        self._prune()
+
+    def _prune(self, now: datetime | None = None) -> None:
+        cutoff = (now or _utcnow()) - timedelta(hours=self.settings.output_ttl_hours)
+        expired = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job.finished and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+        excess = len(self.jobs) - max(1, self.settings.job_max_records)
+        if excess > 0:
+            # Oldest first; queued and running jobs are bounded by the queue and never dropped.
+            finished = [job_id for job_id, job in self.jobs.items() if job.finished][:excess]
+            for job_id in finished:
+                del self.jobs[job_id]
+
+
+@lru_cache(maxsize=1)
+def get_job_manager() -> JobManager:
+    return JobManager()
@@ -1,39 +1,86 @@
 from __future__ import annotations
 
 import copy
-import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import partial
 from pathlib import Path
-from typing import Iterable, List, Optional, TYPE_CHECKING
+from typing import Any, Callable, Iterable, List, Optional, TYPE_CHECKING
 
 from loguru import logger
 
 from src.config.settings import get_settings
+from src.services.artifact_store import StoreDataWriter
+from src.services.engine import MineruEngine, MineruUnavailableError, get_engine
+from src.services.page_cache import PagePlan, RecordingWriter, get_page_cache
+from src.services.storage import StorageManager
+from src.services.text_layer import (
+    FAST_PARSE_METHOD,
+    extract_text_layer,
+    text_layer_content_list,
+    text_layer_markdown,
+)
+from src.services.vlm_endpoints import VlmEndpointsUnavailableError, get_vlm_pool
 
 if TYPE_CHECKING:
     from mineru.data.data_reader_writer import FileBasedDataWriter
 
 
+# Artifacts a parse can produce; callers pick a subset and the rest are never generated.
+ARTIFACT_NAMES = ("markdown", "content_list", "middle_json", "model_output")
+
+
 @dataclass
 class MineruOutputPaths:
+    """Artifact locations for one parsed document, plus the in-memory results until they are written.
+
+    The ``*_data`` / ``markdown_text`` fields are filled by the adapter so responses can be built
+    without reading the artifacts back; ``ArtifactWriter`` persists them to the paths.
+    """
+
     filename: str
     markdown: Optional[Path]
     content_list: Optional[Path]
     middle_json: Optional[Path]
     model_output: Optional[Path]
     image_dir: Optional[Path]
-
-
-class MineruUnavailableError(RuntimeError):
-    """Raised when Miner-U optional dependencies are not present."""
+    markdown_text: Optional[str] = None
+    content_list_data: Any = None
+    middle_json_data: Any = None
+    model_output_data: Any = None
+
+    @property
+    def in_memory(self) -> bool:
+        payloads = (self.markdown_text, self.content_list_data, self.middle_json_data, self.model_output_data)
+        return any(payload is not None for payload in payloads)
+
+    def locations(self) -> tuple[Optional[Path], ...]:
+        return (self.image_dir, self.markdown, self.content_list, self.middle_json, self.model_output)
+
+    def stored(self) -> "MineruOutputPaths":
+        """Paths only, for holding on to a result after its artifacts were written."""
+        return replace(
+            self,
+            markdown_text=None,
+            content_list_data=None,
+            middle_json_data=None,
+            model_output_data=None,
+        )
 
 
 class MineruAdapter:
     """Thin wrapper around Miner-U demo script to parse bytes and return output file paths."""
 
-    def __init__(self, output_dir: str | Path | None = None) -> None:
+    def __init__(
+        self,
+        output_dir: str | Path | None = None,
+        engine: MineruEngine | None = None,
+        storage: StorageManager | None = None,
+    ) -> None:
         self.settings = get_settings()
+        self.engine = engine or get_engine()
+        # Where the job's artifacts are kept; without one, page images stay in the scratch directory.
+        self.storage = storage
         # Ensure Miner-U respects configured model source
         if "MINERU_MODEL_SOURCE" not in os.environ and self.settings.mineru_model_source:
             os.environ["MINERU_MODEL_SOURCE"] = self.settings.mineru_model_source
@@ -41,6 +88,16 @@ class MineruAdapter:
         self.output_dir = Path(output_dir or self.settings.output_base_path)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+    def __getstate__(self) -> dict:
+        # The engine holds imported modules and locks; worker processes use their own.
+        state = self.__dict__.copy()
+        state.pop("engine", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.engine = get_engine()
+
     def parse_from_paths(
         self,
         paths: Iterable[Path],
@@ -53,8 +110,7 @@ class MineruAdapter:
         formula_enable: bool = True,
         table_enable: bool = True,
     ) -> List[MineruOutputPaths]:
-        from mineru.cli.common import read_fn
-        from mineru.utils.guess_suffix_or_lang import guess_suffix_by_path
+        read_fn = self.engine.modules().read_fn
 
         file_bytes: list[bytes] = []
         file_names: list[str] = []
@@ -77,7 +133,7 @@ class MineruAdapter:
 
     def parse_from_bytes(
         self,
-        files: list[tuple[str, bytes]],
+        files: list[tuple[str, bytes | Path]],
         lang: str | list[str] = "ch",
         backend: str = "pipeline",
         parse_method: str = "auto",
@@ -86,169 +142,356 @@ class MineruAdapter:
         end_page: Optional[int] = None,
         formula_enable: bool = True,
         table_enable: bool = True,
+        output_dirs: Optional[list[Path]] = None,
+        outputs: Iterable[str] = ARTIFACT_NAMES,
     ) -> List[MineruOutputPaths]:
-        try:
-            from mineru.cli.common import convert_pdf_bytes_to_bytes_by_pypdfium2, prepare_env
-            from mineru.backend.pipeline.model_json_to_middle_json import result_to_middle_json as pipeline_result_to_middle_json
-            from mineru.backend.pipeline.pipeline_analyze import doc_analyze as pipeline_doc_analyze
-            from mineru.backend.pipeline.pipeline_middle_json_mkcontent import union_make as pipeline_union_make
-            from mineru.backend.vlm.vlm_analyze import doc_analyze as vlm_doc_analyze
-            from mineru.backend.vlm.vlm_middle_json_mkcontent import union_make as vlm_union_make
-            from mineru.data.data_reader_writer import FileBasedDataWriter
-            from mineru.utils.enum_class import MakeMode
-        except ImportError as exc:  # torch or other heavy deps missing
-            raise MineruUnavailableError(f"Miner-U dependencies are not installed: {exc}") from exc
+        """Parse (name, PDF bytes or spooled PDF path) pairs.
 
-        file_names = [name for name, _ in files]
-        pdf_bytes_list = [data for _, data in files]
+        ``output_dirs`` routes each file's artifacts to its own job directory; ``outputs`` selects
+        which of ``ARTIFACT_NAMES`` are produced.
+        """
         lang_list = [lang] * len(files) if isinstance(lang, str) else lang
+        target_dirs = output_dirs or [self.output_dir] * len(files)
+        wanted = frozenset(outputs)
+        if parse_method == FAST_PARSE_METHOD:
+            return [
+                self._parse_text_layer(name, source, target_dir, start_page, end_page, wanted)
+                for (name, source), target_dir in zip(files, target_dirs)
+            ]
+        analyzed = self._analyze(
+            files,
+            lang_list,
+            target_dirs,
+            backend=backend,
+            parse_method=parse_method,
+            server_url=server_url,
+            start_page=start_page,
+            end_page=end_page,
+            formula_enable=formula_enable,
+            table_enable=table_enable,
+            keep_model_output="model_output" in wanted,
+        )
+        return [
+            self._process_output(
+                pdf_info=middle_json["pdf_info"],
+                filename=name,
+                local_md_dir=local_md_dir,
+                image_dir=local_image_dir,
+                is_pipeline=backend == "pipeline",
+                middle_json=middle_json,
+                model_output=model_output,
+                wanted=wanted,
+            )
+            for (name, _), (middle_json, model_output, local_image_dir, local_md_dir) in zip(files, analyzed)
+        ]
 
-        outputs: list[MineruOutputPaths] = []
+    def analyze_pages(
+        self,
+        name: str,
+        source: bytes | Path,
+        start_page: int,
+        end_page: int,
+        lang: str = "ch",
+        backend: str = "pipeline",
+        parse_method: str = "auto",
+        server_url: Optional[str] = None,
+        formula_enable: bool = True,
+        table_enable: bool = True,
+        keep_model_output: bool = True,
+    ) -> dict:
+        """Run Miner-U on one page range (a shard) of a document, stopping before ``union_make``.
+
+        Images are written to the document's image directory as usual; ``merge_pages`` assembles
+        the shards into the document's outputs.
+        """
+        ((middle_json, model_output, _, _),) = self._analyze(
+            [(name, source)],
+            [lang],
+            [self.output_dir],
+            backend=backend,
+            parse_method=parse_method,
+            server_url=server_url,
+            start_page=start_page,
+            end_page=end_page,
+            formula_enable=formula_enable,
+            table_enable=table_enable,
+            keep_model_output=keep_model_output,
+        )
+        return {"start_page": start_page, "middle_json": middle_json, "model_output": model_output}
 
-        if backend == "pipeline":
-            for idx, pdf_bytes in enumerate(pdf_bytes_list):
-                pdf_bytes_list[idx] = convert_pdf_bytes_to_bytes_by_pypdfium2(pdf_bytes, start_page, end_page)
-
-            infer_results, all_image_lists, all_pdf_docs, detected_langs, ocr_enabled_list = pipeline_doc_analyze(
-                pdf_bytes_list,
-                lang_list,
-                parse_method=parse_method,
-                formula_enable=formula_enable,
-                table_enable=table_enable,
-            )
+    def merge_pages(
+        self,
+        name: str,
+        shards: list[dict],
+        backend: str = "pipeline",
+        parse_method: str = "auto",
+        outputs: Iterable[str] = ARTIFACT_NAMES,
+    ) -> MineruOutputPaths:
+        """Stitch ``analyze_pages`` results back into one document, renumbering pages from the first shard."""
+        shards = sorted(shards, key=lambda shard: shard["start_page"])
+        first_page = shards[0]["start_page"]
+        pdf_info: list[dict] = []
+        model_output: list | None = [] if all(shard["model_output"] is not None for shard in shards) else None
+        for shard in shards:
+            offset = shard["start_page"] - first_page
+            for page in shard["middle_json"]["pdf_info"]:
+                pdf_info.append({**page, "page_idx": page.get("page_idx", 0) + offset})
+            if model_output is not None:
+                model_output.extend(_offset_model_pages(shard["model_output"], offset))
+        middle_json = {**shards[0]["middle_json"], "pdf_info": pdf_info}
+
+        parse_method = "vlm" if backend != "pipeline" else parse_method
+        local_image_dir, local_md_dir = self.engine.modules().prepare_env(self.output_dir, name, parse_method)
+        return self._process_output(
+            pdf_info=pdf_info,
+            filename=name,
+            local_md_dir=local_md_dir,
+            image_dir=local_image_dir,
+            is_pipeline=backend == "pipeline",
+            middle_json=middle_json,
+            model_output=model_output,
+            wanted=frozenset(outputs),
+        )
 
-            for idx, model_list in enumerate(infer_results):
-                model_json = copy.deepcopy(model_list)
-                filename = file_names[idx]
-                local_image_dir, local_md_dir = prepare_env(self.output_dir, filename, parse_method)
-                image_writer, md_writer = FileBasedDataWriter(local_image_dir), FileBasedDataWriter(local_md_dir)
-
-                images_list = all_image_lists[idx]
-                pdf_doc = all_pdf_docs[idx]
-                _lang = detected_langs[idx]
-                _ocr_enable = ocr_enabled_list[idx]
-                middle_json = pipeline_result_to_middle_json(
-                    model_list,
-                    images_list,
-                    pdf_doc,
-                    image_writer,
-                    _lang,
-                    _ocr_enable,
-                    formula_enable,
-                )
+    def _parse_text_layer(
+        self,
+        name: str,
+        source: bytes | Path,
+        output_dir: Path,
+        start_page: int,
+        end_page: Optional[int],
+        wanted: frozenset[str],
+    ) -> MineruOutputPaths:
+        """``parse_method=fast``: outputs built from the PDF text layer, without loading Miner-U or its models."""
+        # Same layout as Miner-U's prepare_env; no figures are cropped, so the image directory stays empty.
+        local_md_dir = Path(output_dir) / name / FAST_PARSE_METHOD
+        image_dir = local_md_dir / "images"
+        image_dir.mkdir(parents=True, exist_ok=True)
+        middle_json = extract_text_layer(source, start_page, end_page)
+        pdf_info = middle_json["pdf_info"]
+        return self._output_paths(
+            filename=name,
+            local_md_dir=local_md_dir,
+            image_dir=image_dir,
+            markdown=text_layer_markdown(pdf_info) if "markdown" in wanted else None,
+            content_list=text_layer_content_list(pdf_info) if "content_list" in wanted else None,
+            middle_json=middle_json if "middle_json" in wanted else None,
+            model_output=None,
+        )
+
+    def _analyze(
+        self,
+        files: list[tuple[str, bytes | Path]],
+        lang_list: list[str],
+        target_dirs: list[Path],
+        backend: str,
+        parse_method: str,
+        server_url: Optional[str],
+        start_page: int,
+        end_page: Optional[int],
+        formula_enable: bool,
+        table_enable: bool,
+        keep_model_output: bool,
+    ) -> list[tuple[dict, Any, str, str]]:
+        """Miner-U analysis up to middle_json: (middle_json, model output, image dir, markdown dir) per file."""
+        mineru = self.engine.modules()
+        prepare_env = mineru.prepare_env
+        FileBasedDataWriter = mineru.FileBasedDataWriter
+
+        file_names = [name for name, _ in files]
+        pdf_sources = [source for _, source in files]
+        results: list[tuple[dict, Any, str, str]] = []
 
-                pdf_info = middle_json["pdf_info"]
-                output_paths = self._process_output(
-                    pdf_info=pdf_info,
-                    pdf_bytes=pdf_bytes_list[idx],
-                    filename=filename,
-                    local_md_dir=local_md_dir,
-                    image_dir=local_image_dir,
-                    writer=md_writer,
-                    is_pipeline=True,
-                    middle_json=middle_json,
-                    model_output=model_json,
+        if backend == "pipeline":
+            pdf_bytes_list = [self._load_pdf(source, start_page, end_page) for source in pdf_sources]
+            plans = [
+                self._page_plan(pdf_bytes, (backend, parse_method, lang, formula_enable, table_enable), keep_model_output)
+                for pdf_bytes, lang in zip(pdf_bytes_list, lang_list)
+            ]
+            # Only pages missing from the page cache go through the models.
+            analyzed = [idx for idx, plan in enumerate(plans) if plan is None or plan.misses]
+            infer_results = all_image_lists = all_pdf_docs = detected_langs = ocr_enabled_list = []
+            if analyzed:
+                infer_results, all_image_lists, all_pdf_docs, detected_langs, ocr_enabled_list = mineru.pipeline_doc_analyze(
+                    [plans[idx].miss_pdf(pdf_bytes_list[idx]) if plans[idx] else pdf_bytes_list[idx] for idx in analyzed],
+                    [lang_list[idx] for idx in analyzed],
+                    parse_method=parse_method,
+                    formula_enable=formula_enable,
+                    table_enable=table_enable,
                 )
-                outputs.append(output_paths)
-        else:
-            backend_name = backend[4:] if backend.startswith("vlm-") else backend
-            parse_method = "vlm"
-            # Fail fast when local model source is selected but config is missing
-            if os.getenv("MINERU_MODEL_SOURCE", "") == "local":
-                try:
-                    from mineru.utils.config_reader import get_local_models_dir
-
-                    models_dir = get_local_models_dir()
-                    if not models_dir or not isinstance(models_dir, dict) or "vlm" not in models_dir:
-                        raise MineruUnavailableError(
-                            "MINERU_MODEL_SOURCE=local requires ~/mineru.json with models-dir.vlm path configured",
-                        )
-                except MineruUnavailableError:
-                    raise
-                except Exception as exc:  # noqa: BLE001
+            position = {idx: pos for pos, idx in enumerate(analyzed)}
+
+            for idx, plan in enumerate(plans):
+                local_image_dir, local_md_dir = prepare_env(target_dirs[idx], file_names[idx], parse_method)
+                image_writer = self._image_writer(FileBasedDataWriter, local_image_dir)
+                writer = RecordingWriter(image_writer) if plan is not None else image_writer
+                middle_json, model_json = None, None
+                if idx in position:
+                    pos = position[idx]
+                    model_list = infer_results[pos]
+                    # middle_json generation consumes model_list, so keep a copy only if it is returned.
+                    model_json = copy.deepcopy(model_list) if keep_model_output else None
+                    middle_json = mineru.pipeline_result_to_middle_json(
+                        model_list,
+                        all_image_lists[pos],
+                        all_pdf_docs[pos],
+                        writer,
+                        detected_langs[pos],
+                        ocr_enabled_list[pos],
+                        formula_enable,
+                    )
+                if plan is not None:
+                    middle_json, model_json = plan.stitch(
+                        middle_json, model_json, writer.written, image_writer, keep_model_output
+                    )
+                results.append((middle_json, model_json, local_image_dir, local_md_dir))
+            return results
+
+        backend_name = backend[4:] if backend.startswith("vlm-") else backend
+        parse_method = "vlm"
+        # Fail fast when local model source is selected but config is missing (http-client runs no local model)
+        if os.getenv("MINERU_MODEL_SOURCE", "") == "local" and backend != "vlm-http-client":
+            try:
+                from mineru.utils.config_reader import get_local_models_dir
+
+                models_dir = get_local_models_dir()
+                if not models_dir or not isinstance(models_dir, dict) or "vlm" not in models_dir:
                     raise MineruUnavailableError(
-                        "Failed to read Miner-U local model config for VLM backend",
-                    ) from exc
-
-            for idx, pdf_bytes in enumerate(pdf_bytes_list):
-                filename = file_names[idx]
-                pdf_bytes = convert_pdf_bytes_to_bytes_by_pypdfium2(pdf_bytes, start_page, end_page)
-                local_image_dir, local_md_dir = prepare_env(self.output_dir, filename, parse_method)
-                image_writer, md_writer = FileBasedDataWriter(local_image_dir), FileBasedDataWriter(local_md_dir)
-                middle_json, infer_result = vlm_doc_analyze(
-                    pdf_bytes,
-                    image_writer=image_writer,
-                    backend=backend_name,
-                    server_url=server_url,
+                        "MINERU_MODEL_SOURCE=local requires ~/mineru.json with models-dir.vlm path configured",
+                    )
+            except MineruUnavailableError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                raise MineruUnavailableError(
+                    "Failed to read Miner-U local model config for VLM backend",
+                ) from exc
+
+        for idx, source in enumerate(pdf_sources):
+            pdf_bytes = self._load_pdf(source, start_page, end_page)
+            plan = self._page_plan(pdf_bytes, (backend, parse_method, lang_list[idx]), keep_model_output)
+            local_image_dir, local_md_dir = prepare_env(target_dirs[idx], file_names[idx], parse_method)
+            image_writer = self._image_writer(FileBasedDataWriter, local_image_dir)
+            writer = RecordingWriter(image_writer) if plan is not None else image_writer
+            middle_json, infer_result = None, None
+            if plan is None or plan.misses:
+                middle_json, infer_result = self._vlm_analyze(
+                    partial(
+                        mineru.vlm_doc_analyze,
+                        plan.miss_pdf(pdf_bytes) if plan is not None else pdf_bytes,
+                        image_writer=writer,
+                        backend=backend_name,
+                    ),
+                    backend,
+                    server_url,
                 )
-
-                pdf_info = middle_json["pdf_info"]
-                output_paths = self._process_output(
-                    pdf_info=pdf_info,
-                    pdf_bytes=pdf_bytes,
-                    filename=filename,
-                    local_md_dir=local_md_dir,
-                    image_dir=local_image_dir,
-                    writer=md_writer,
-                    is_pipeline=False,
-                    middle_json=middle_json,
-                    model_output=infer_result,
+            infer_result = infer_result if keep_model_output else None
+            if plan is not None:
+                middle_json, infer_result = plan.stitch(
+                    middle_json, infer_result, writer.written, image_writer, keep_model_output
                 )
-                outputs.append(output_paths)
-
-        return outputs
+            results.append((middle_json, infer_result, local_image_dir, local_md_dir))
+        return results
+
+    def _vlm_analyze(self, analyze: Callable[..., Any], backend: str, server_url: Optional[str]) -> Any:
+        """Call ``analyze(server_url=...)``; vlm-http-client without an explicit URL uses the endpoint pool."""
+        pool = get_vlm_pool()
+        if backend != "vlm-http-client" or server_url or not pool.endpoints:
+            return analyze(server_url=server_url)
+        try:
+            return pool.call(lambda url: analyze(server_url=url))
+        except VlmEndpointsUnavailableError as exc:
+            raise MineruUnavailableError(str(exc)) from exc
+
+    def _page_plan(self, pdf_bytes: bytes, options: tuple, keep_model_output: bool) -> PagePlan | None:
+        return get_page_cache().plan(pdf_bytes, options, need_model=keep_model_output)
+
+    def _image_writer(self, file_writer_cls, local_image_dir: str | Path):
+        # With a remote artifact store, page images go straight to it instead of the scratch directory.
+        storage = self.storage
+        prefix = storage.artifact_key(local_image_dir) if storage is not None else None
+        if prefix is None or storage.store.name == "local":
+            return file_writer_cls(local_image_dir)
+        return StoreDataWriter(storage.store, prefix)
+
+    def _load_pdf(self, source: bytes | Path, start_page: int, end_page: Optional[int]) -> bytes:
+        """Cut the requested page range out of an in-memory or spooled PDF."""
+        convert = self.engine.modules().convert_pdf_bytes_to_bytes_by_pypdfium2
+        if isinstance(source, Path):
+            # pdfium opens the spooled file itself and reads pages on demand, so only the
+            # selected pages are materialized instead of a full copy of the upload.
+            data = convert(source, start_page, end_page)
+            return data if isinstance(data, bytes) else source.read_bytes()
+        return convert(source, start_page, end_page)
 
     def _process_output(
         self,
         pdf_info,
-        pdf_bytes,
         filename: str,
         local_md_dir: str | Path,
         image_dir: str | Path,
-        writer,
         is_pipeline: bool,
         middle_json,
         model_output=None,
+        wanted: frozenset[str] = frozenset(ARTIFACT_NAMES),
     ) -> MineruOutputPaths:
-        from mineru.backend.pipeline.pipeline_middle_json_mkcontent import union_make as pipeline_union_make
-        from mineru.backend.vlm.vlm_middle_json_mkcontent import union_make as vlm_union_make
-        from mineru.utils.enum_class import MakeMode
+        """Assemble the wanted results in memory; writing them under ``local_md_dir`` is left to the caller."""
+        mineru = self.engine.modules()
+        MakeMode = mineru.MakeMode
 
         local_md_dir = Path(local_md_dir)
         image_dir = Path(image_dir)
 
-        markdown_path = None
-        content_list_path = None
-        middle_json_path = None
-        model_output_path = None
-
-        make_func = pipeline_union_make if is_pipeline else vlm_union_make
-        md_content_str = make_func(pdf_info, MakeMode.MM_MD, image_dir.name)
-        markdown_path = local_md_dir / f"{filename}.md"
-        writer.write_string(markdown_path.name, md_content_str)
-
-        content_list = make_func(pdf_info, MakeMode.CONTENT_LIST, image_dir.name)
-        content_list_path = local_md_dir / f"{filename}_content_list.json"
-        writer.write_string(content_list_path.name, json.dumps(content_list, ensure_ascii=False, indent=2))
-
-        middle_json_path = local_md_dir / f"{filename}_middle.json"
-        writer.write_string(middle_json_path.name, json.dumps(middle_json, ensure_ascii=False, indent=2))
-
-        if model_output is not None:
-            model_output_path = local_md_dir / f"{filename}_model.json"
-            writer.write_string(model_output_path.name, json.dumps(model_output, ensure_ascii=False, indent=2))
-
+        make_func = mineru.pipeline_union_make if is_pipeline else mineru.vlm_union_make
+        md_content_str = None
+        content_list = None
+        if "markdown" in wanted:
+            md_content_str = make_func(pdf_info, MakeMode.MM_MD, image_dir.name)
+        if "content_list" in wanted:
+            content_list = make_func(pdf_info, MakeMode.CONTENT_LIST, image_dir.name)
+        if "middle_json" not in wanted:
+            middle_json = None
+        if "model_output" not in wanted:
+            model_output = None
+        return self._output_paths(filename, local_md_dir, image_dir, md_content_str, content_list, middle_json, model_output)
+
+    @staticmethod
+    def _output_paths(
+        filename: str,
+        local_md_dir: Path,
+        image_dir: Path,
+        markdown: Optional[str],
+        content_list: Any,
+        middle_json: Any,
+        model_output: Any,
+    ) -> MineruOutputPaths:
         logger.info(f"local output dir is {local_md_dir}")
         return MineruOutputPaths(
             filename=filename,
-            markdown=markdown_path,
-            content_list=content_list_path,
-            middle_json=middle_json_path,
-            model_output=model_output_path,
+            markdown=local_md_dir / f"{filename}.md" if markdown is not None else None,
+            content_list=local_md_dir / f"{filename}_content_list.json" if content_list is not None else None,
+            middle_json=local_md_dir / f"{filename}_middle.json" if middle_json is not None else None,
+            model_output=local_md_dir / f"{filename}_model.json" if model_output is not None else None,
             image_dir=image_dir,
+            markdown_text=markdown,
+            content_list_data=content_list,
+            middle_json_data=middle_json,
+            model_output_data=model_output,
         )
 
 
+def _offset_model_pages(model_output: list, offset: int) -> list:
+    # Pipeline model output records each page's index under page_info.page_no; VLM output is positional.
+    if not offset:
+        return model_output
+    shifted = []
+    for page in model_output:
+        page_info = page.get("page_info") if isinstance(page, dict) else None
+        if isinstance(page_info, dict) and "page_no" in page_info:
+            page = {**page, "page_info": {**page_info, "page_no": page_info["page_no"] + offset}}
+        shifted.append(page)
+    return shifted
+
+
 def guess_input_files(input_dir: Path) -> list[Path]:
     pdf_suffixes = ["pdf"]
     image_suffixes = ["png", "jpeg", "jp2", "webp", "gif", "bmp", "jpg"]
@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import http.client
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import xmlrpc.client
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+from src.config.settings import Settings, get_settings
+
+
+class OfficeConversionError(RuntimeError):
+    """Raised when no converter could turn an office document into a PDF."""
+
+
+class OfficeConversionTimeout(OfficeConversionError):
+    """Raised when a converter instance did not answer in time and was restarted."""
+
+
+class _TimeoutTransport(xmlrpc.client.Transport):
+    def __init__(self, timeout: float) -> None:
+        super().__init__()
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        connection = super().make_connection(host)
+        connection.timeout = self.timeout
+        return connection
+
+
+class ConversionCache:
+    """Converted PDFs on disk keyed by the SHA-256 of the source document, evicted least recently used.
+
+    Evictions work from an in-memory index rather than a directory scan; ``expire`` (run by the
+    storage janitor) removes conversions not used within the output TTL.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max(0, max_entries)
+        self._lock = threading.Lock()
+        # sha256 -> last use (epoch seconds), least recently used first; adopts an earlier process's files.
+        self._index: OrderedDict[str, float] = OrderedDict(
+            sorted(((path.stem, mtime) for path, mtime in self._entry_files()), key=lambda item: item[1]),
+        )
+        self.hits = 0
+        self.misses = 0
+        self.expired_total = 0
+
+    def get(self, sha256: str, target: Path) -> bool:
+        cached = self.path / f"{sha256}.pdf"
+        with self._lock:
+            if not cached.exists():
+                self.misses += 1
+                return False
+            cached.touch()
+            self._index[sha256] = time.time()
+            self._index.move_to_end(sha256)
+            self.hits += 1
+        shutil.copyfile(cached, target)
+        return True
+
+    def put(self, sha256: str, pdf_path: Path) -> None:
+        if not self.max_entries:
+            return
+        partial = self.path / f".{sha256}.{threading.get_ident()}.tmp"
+        shutil.copyfile(pdf_path, partial)
+        os.replace(partial, self.path / f"{sha256}.pdf")
+        with self._lock:
+            self._index[sha256] = time.time()
+            self._index.move_to_end(sha256)
+            stale = [self._index.popitem(last=False)[0] for _ in range(len(self._index) - self.max_entries)]
+        for key in stale:
+            (self.path / f"{key}.pdf").unlink(missing_ok=True)
+
+    def expire(self, older_than: float) -> int:
+        """Remove conversions last used before ``older_than`` (epoch seconds); returns how many."""
+        removed = 0
+        for path, used in self._entry_files():
+            if used < older_than:
+                path.unlink(missing_ok=True)
+                with self._lock:
+                    self._index.pop(path.stem, None)
+                removed += 1
+        self.expired_total += removed
+        return removed
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "entries": len(self._index),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired_total": self.expired_total,
+        }
+
+    def _entry_files(self) -> list[tuple[Path, float]]:
+        entries = []
+        for path in self.path.glob("*.pdf"):
+            try:
+                entries.append((path, path.stat().st_mtime))
+            except FileNotFoundError:
+                continue
+        return entries
+
+
+class SofficeInstance:
+    """Headless LibreOffice converter slot with its own user profile.
+
+    With ``unoserver`` installed the slot keeps a long-running LibreOffice listener and converts over
+    its XML-RPC API; otherwise each conversion launches ``soffice`` against the slot's warm profile.
+    """
+
+    def __init__(self, index: int, settings: Settings, soffice_bin: str, unoserver_bin: str | None) -> None:
+        self.index = index
+        self.soffice_bin = soffice_bin
+        self.unoserver_bin = unoserver_bin
+        self.profile_dir = Path(settings.office_profile_path) / f"profile-{index}"
+        self.port = settings.office_base_port + index * 2
+        self.uno_port = self.port + 1
+        self.startup_timeout = settings.office_startup_timeout_seconds
+        self.process: subprocess.Popen | None = None
+        self.conversions = 0
+        self.restarts = 0
+
+    @property
+    def persistent(self) -> bool:
+        return self.unoserver_bin is not None
+
+    def start(self) -> None:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        if not self.persistent or self.healthy():
+            return
+        self.process = subprocess.Popen(
+            [
+                self.unoserver_bin,
+                "--interface",
+                "127.0.0.1",
+                "--port",
+                str(self.port),
+                "--uno-port",
+                str(self.uno_port),
+                "--executable",
+                self.soffice_bin,
+                "--user-installation",
+                self.profile_dir.as_uri(),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.healthy():
+                logger.info(f"office converter {self.index} listening on port {self.port}")
+                return
+            if self.process.poll() is not None:
+                break
+            time.sleep(0.2)
+        self.stop()
+        raise OfficeConversionError(f"Office converter {self.index} failed to start")
+
+    def healthy(self) -> bool:
+        if not self.persistent:
+            return True
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            with socket.create_connection(("127.0.0.1", self.port), timeout=1):
+                return True
+        except OSError:
+            return False
+
+    def restart(self) -> None:
+        self.restarts += 1
+        self.stop()
+        self.start()
+
+    def stop(self) -> None:
+        if self.process is None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait(timeout=5)
+        self.process = None
+
+    def convert(self, source: Path, target: Path, timeout: float) -> None:
+        if self.persistent:
+            self._convert_via_server(source, target, timeout)
+        else:
+            self._convert_via_cli(source, target, timeout)
+        self.conversions += 1
+
+    def _convert_via_server(self, source: Path, target: Path, timeout: float) -> None:
+        proxy = xmlrpc.client.ServerProxy(f"http://127.0.0.1:{self.port}", transport=_TimeoutTransport(timeout))
+        try:
+            proxy.convert(str(source), None, str(target), "pdf")
+        except (socket.timeout, TimeoutError) as exc:
+            raise OfficeConversionTimeout(f"Office converter {self.index} timed out") from exc
+        except (OSError, http.client.HTTPException, xmlrpc.client.Error) as exc:
+            raise OfficeConversionError(f"Office converter {self.index} failed: {exc}") from exc
+
+    def _convert_via_cli(self, source: Path, target: Path, timeout: float) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            try:
+                subprocess.run(
+                    [
+                        self.soffice_bin,
+                        f"-env:UserInstallation={self.profile_dir.as_uri()}",
+                        "--headless",
+                        "--norestore",
+                        "--convert-to",
+                        "pdf",
+                        "--outdir",
+                        tmpdir,
+                        str(source),
+                    ],
+                    check=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    timeout=timeout,
+                )
+            except subprocess.TimeoutExpired as exc:
+                raise OfficeConversionTimeout(f"Office converter {self.index} timed out") from exc
+            except (subprocess.CalledProcessError, OSError) as exc:
+                raise OfficeConversionError(f"LibreOffice conversion failed: {exc}") from exc
+            produced = Path(tmpdir) / f"{source.stem}.pdf"
+            if not produced.exists():
+                raise OfficeConversionError("LibreOffice produced no PDF")
+            shutil.move(str(produced), target)
+
+
+class OfficeConverter:
+    """Pool of isolated LibreOffice converter instances fed from a queue, with a conversion cache.
+
+    Instances only stay up between documents when ``unoserver`` is on PATH (``pip install '.[office]'``);
+    ``mode`` in ``/health`` reports which way conversions run.
+    """
+
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        instance_factory: Callable[[int], SofficeInstance] | None = None,
+    ) -> None:
+        self.settings = settings or get_settings()
+        self.soffice_bin = shutil.which("soffice") or shutil.which("libreoffice")
+        self.unoserver_bin = shutil.which("unoserver")
+        self.cache = ConversionCache(self.settings.office_cache_path, self.settings.office_cache_entries)
+        self.size = max(1, self.settings.office_pool_size)
+        self._instance_factory = instance_factory or self._default_instance
+        self._instances: list[SofficeInstance] = []
+        self._idle: queue.Queue[SofficeInstance] = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return self.soffice_bin is not None or self._instance_factory != self._default_instance
+
+    @property
+    def mode(self) -> str:
+        """``unoserver`` (persistent instances), ``soffice`` (one launch per conversion) or ``unavailable``."""
+        if not self.available:
+            return "unavailable"
+        persistent = self._instances[0].persistent if self._instances else self.unoserver_bin is not None
+        return "unoserver" if persistent else "soffice"
+
+    def start(self) -> None:
+        """Bring up every converter instance ahead of the first DOC/DOCX request."""
+        if not self.available:
+            return
+        if self.mode == "soffice":
+            logger.warning("unoserver is not installed; every DOC/DOCX conversion launches soffice")
+        try:
+            while self._grow():
+                pass
+        except OfficeConversionError:
+            logger.exception("office converter failed to start; it is restarted on first use")
+
+    def convert(self, source: Path, sha256: str, target: Path, timeout: float) -> None:
+        if self.cache.get(sha256, target):
+            return
+        if self._convert_with_word(source, target):
+            self.cache.put(sha256, target)
+            return
+        if not self.available:
+            raise OfficeConversionError("LibreOffice is not installed")
+
+        instance = self._checkout(timeout)
+        try:
+            if not instance.healthy():
+                instance.restart()
+            instance.convert(source, target, timeout)
+        except OfficeConversionTimeout:
+            logger.warning(f"office converter {instance.index} hung, restarting")
+            self._restart_quietly(instance)
+            raise
+        finally:
+            self._idle.put(instance)
+        self.cache.put(sha256, target)
+
+    def snapshot(self) -> dict:
+        return {
+            "instances": len(self._instances),
+            "idle": self._idle.qsize(),
+            "mode": self.mode,
+            "conversions": sum(instance.conversions for instance in self._instances),
+            "restarts": sum(instance.restarts for instance in self._instances),
+            "cache": self.cache.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        for instance in self._instances:
+            instance.stop()
+
+    def _default_instance(self, index: int) -> SofficeInstance:
+        return SofficeInstance(index, self.settings, self.soffice_bin, self.unoserver_bin)
+
+    def _grow(self) -> bool:
+        with self._lock:
+            if len(self._instances) >= self.size:
+                return False
+            instance = self._instance_factory(len(self._instances))
+            self._instances.append(instance)
+        try:
+            instance.start()
+        finally:
+            self._idle.put(instance)
+        return True
+
+    def _checkout(self, timeout: float) -> SofficeInstance:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        # A new instance may be taken by another caller before this one gets to it; wait like any other.
+        self._grow()
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty as exc:
+            raise OfficeConversionTimeout("No office converter became free in time") from exc
+
+    def _restart_quietly(self, instance: SofficeInstance) -> None:
+        try:
+            instance.restart()
+        except OfficeConversionError:
+            logger.exception(f"failed to restart office converter {instance.index}")
+
+    def _convert_with_word(self, source: Path, target: Path) -> bool:
+        # docx2pdf drives Microsoft Word and only works on macOS and Windows.
+        if sys.platform not in {"darwin", "win32"}:
+            return False
+        try:
+            from docx2pdf import convert
+
+            convert(str(source), str(target))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(f"DOCX to PDF via docx2pdf failed: {exc}")
+        return target.exists()
+
+
+@lru_cache(maxsize=1)
+def get_office_converter() -> OfficeConverter:
+    return OfficeConverter()
@@ -1,43 +1,66 @@
 from __future__ import annotations
 
-import json
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional
+from urllib.parse import quote
 
 from src.services.mineru_adapter import MineruOutputPaths
+from src.services.serialization import loads_json
 from src.services.storage import StorageManager
 
+ARTIFACT_URL = "/api/v1/jobs/{job_id}/artifacts/{name}"
+BUNDLE_URL = "/api/v1/jobs/{job_id}/bundle.zip"
+
 
 class OutputBuilder:
     def __init__(self, storage: StorageManager) -> None:
         self.storage = storage
 
-    def build(self, job_id: str, mineru_outputs: List[MineruOutputPaths]) -> list[dict]:
-        expiry = self.storage.expiry_at().isoformat()
-        results: list[dict] = []
-        for output in mineru_outputs:
-            results.append(
-                {
-                    "filename": output.filename,
-                    "markdown": self._read_text(output.markdown),
-                    "markdown_url": None,
-                    "content_list_json": self._read_json(output.content_list),
-                    "content_list_url": None,
-                    "middle_json": self._read_json(output.middle_json),
-                    "middle_json_url": None,
-                    "model_output_json": self._read_json(output.model_output),
-                    "model_output_url": None,
-                    "storage_expiry": expiry,
-                }
-            )
-        return results
+    def build_output(
+        self,
+        output: MineruOutputPaths,
+        created_at: datetime | None = None,
+        inline: bool = True,
+    ) -> dict:
+        """Response entry for one document; ``inline=False`` returns only the artifact URLs."""
+        return {
+            "filename": output.filename,
+            "markdown": self._text(output.markdown_text, output.markdown) if inline else None,
+            "markdown_url": self._url(output.markdown),
+            "content_list_json": self._json(output.content_list_data, output.content_list) if inline else None,
+            "content_list_url": self._url(output.content_list),
+            "middle_json": self._json(output.middle_json_data, output.middle_json) if inline else None,
+            "middle_json_url": self._url(output.middle_json),
+            "model_output_json": self._json(output.model_output_data, output.model_output) if inline else None,
+            "model_output_url": self._url(output.model_output),
+            "bundle_url": self._bundle_url(output),
+            "storage_expiry": self.storage.expiry_at(created_at).isoformat(),
+        }
 
-    def _read_text(self, path: Optional[Path]) -> str | None:
-        if not path:
+    def _bundle_url(self, output: MineruOutputPaths) -> str | None:
+        # Cache hits live under the job that first parsed them, so take the job from the paths.
+        job_id = self.storage.owning_job(output.locations())
+        return BUNDLE_URL.format(job_id=job_id) if job_id else None
+
+    def _url(self, path: Optional[Path]) -> str | None:
+        ref = self.storage.artifact_ref(path) if path else None
+        if ref is None:
             return None
-        return Path(path).read_text(encoding="utf-8")
+        job_id, name = ref
+        return ARTIFACT_URL.format(job_id=job_id, name=quote(name))
+
+    def _text(self, content: str | None, path: Optional[Path]) -> str | None:
+        # Fresh results carry their content; cached ones are read back from storage.
+        return content if content is not None else self._read_text(path)
+
+    def _json(self, payload, path: Optional[Path]):
+        return payload if payload is not None else self._read_json(path)
+
+    def _read_text(self, path: Optional[Path]) -> str | None:
+        data = self.storage.read_artifact(path) if path else None
+        return data.decode("utf-8") if data is not None else None
 
     def _read_json(self, path: Optional[Path]):
-        if not path:
-            return None
-        return json.loads(Path(path).read_text(encoding="utf-8"))
+        data = self.storage.read_artifact(path) if path else None
+        return loads_json(data) if data is not None else None
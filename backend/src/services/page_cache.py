@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator
+
+from loguru import logger
+
+from src.config.settings import Settings, get_settings
+from src.services.serialization import dumps_json, loads_json
+
+
+def page_digests(pdf_bytes: bytes, scale: float) -> list[str]:
+    """Fingerprint every page by its rendered pixels and text, so edits anywhere on a page change it."""
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    try:
+        digests = []
+        for index in range(len(pdf)):
+            page = pdf[index]
+            try:
+                digest = hashlib.sha256(f"{page.get_width():.2f}x{page.get_height():.2f}".encode("ascii"))
+                bitmap = page.render(scale=scale, grayscale=True)
+                digest.update(bytes(bitmap.buffer))
+                textpage = page.get_textpage()
+                digest.update(textpage.get_text_range().encode("utf-8"))
+                textpage.close()
+                bitmap.close()
+            finally:
+                page.close()
+            digests.append(digest.hexdigest())
+        return digests
+    finally:
+        pdf.close()
+
+
+def select_pages(pdf_bytes: bytes, indices: list[int]) -> bytes:
+    """A new PDF holding only the given pages, in order."""
+    import pypdfium2 as pdfium
+
+    source = pdfium.PdfDocument(pdf_bytes)
+    target = pdfium.PdfDocument.new()
+    try:
+        target.import_pages(source, indices)
+        buffer = io.BytesIO()
+        target.save(buffer)
+        return buffer.getvalue()
+    finally:
+        target.close()
+        source.close()
+
+
+def _image_refs(node: Any) -> Iterator[str]:
+    # Miner-U records the file name of every cropped figure/table/equation under "image_path".
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "image_path" and isinstance(value, str) and value:
+                yield value
+            else:
+                yield from _image_refs(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _image_refs(item)
+
+
+def _renumber_model_page(page: Any, page_idx: int) -> Any:
+    page_info = page.get("page_info") if isinstance(page, dict) else None
+    if isinstance(page_info, dict) and "page_no" in page_info:
+        return {**page, "page_info": {**page_info, "page_no": page_idx}}
+    return page
+
+
+class RecordingWriter:
+    """Wraps a Miner-U data writer and keeps what was written, to cache page images with their page."""
+
+    def __init__(self, inner: Any) -> None:
+        self.inner = inner
+        self.written: dict[str, bytes] = {}
+
+    def write(self, path: str, data: bytes) -> None:
+        self.written[path] = data
+        self.inner.write(path, data)
+
+    def write_string(self, path: str, data: str) -> None:
+        self.write(path, data.encode("utf-8"))
+
+
+class PageCache:
+    """Per-page Miner-U results on disk, keyed by page fingerprint and parse options.
+
+    One file per page holds its ``pdf_info`` entry, its model output entry and the images it
+    references. An in-memory LRU index of the entries drops the least recently used beyond
+    ``max_entries`` on write; ``expire`` (run by the storage janitor) removes entries not used
+    within the output TTL, so cached page content does not outlive the jobs it came from.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int, render_scale: float = 0.5) -> None:
+        self.path = Path(path)
+        self.max_entries = max(0, max_entries)
+        self.render_scale = render_scale
+        self._lock = threading.Lock()
+        # key -> last access (epoch seconds), least recently used first.
+        self._index: OrderedDict[str, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired_total = 0
+        if self.max_entries:
+            self.path.mkdir(parents=True, exist_ok=True)
+            # One scan at start-up adopts entries left by an earlier process.
+            for entry in sorted(self._entry_files(), key=lambda item: item[1]):
+                self._index[entry[0].stem] = entry[1]
+
+    @staticmethod
+    def key(page_digest: str, options: tuple) -> str:
+        return hashlib.sha256(f"{page_digest}:{options!r}".encode("utf-8")).hexdigest()
+
+    def plan(self, pdf_bytes: bytes, options: tuple, need_model: bool) -> "PagePlan | None":
+        if not self.max_entries:
+            return None
+        try:
+            digests = page_digests(pdf_bytes, self.render_scale)
+        except Exception as exc:  # noqa: BLE001 - fall back to parsing the whole document
+            logger.warning(f"page cache skipped, could not fingerprint pages: {exc}")
+            return None
+        keys = [self.key(digest, options) for digest in digests]
+        cached = {}
+        for idx, key in enumerate(keys):
+            entry = self.get(key)
+            if entry is not None and (entry["model"] is not None or not need_model):
+                cached[idx] = entry
+        with self._lock:
+            self.hits += len(cached)
+            self.misses += len(keys) - len(cached)
+        return PagePlan(cache=self, keys=keys, cached=cached)
+
+    def get(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            entry = loads_json(path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            return None
+        os.utime(path)
+        self._record(key)
+        return entry
+
+    def put_many(self, entries: dict[str, dict]) -> None:
+        if not self.max_entries or not entries:
+            return
+        for key, entry in entries.items():
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+            partial.write_bytes(dumps_json(entry))
+            os.replace(partial, path)
+            self._record(key)
+        self._prune()
+
+    def expire(self, older_than: float) -> int:
+        """Remove entries last used before ``older_than`` (epoch seconds); returns how many."""
+        if not self.max_entries:
+            return 0
+        removed = 0
+        # Scans the directory: entries written by worker processes are not in this process's index.
+        for path, accessed in self._entry_files():
+            if accessed < older_than:
+                path.unlink(missing_ok=True)
+                with self._lock:
+                    self._index.pop(path.stem, None)
+                removed += 1
+        self.expired_total += removed
+        return removed
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._index),
+            "max_entries": self.max_entries,
+            "expired_total": self.expired_total,
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def _entry_files(self) -> Iterator[tuple[Path, float]]:
+        for path in self.path.glob("*/*.json"):
+            try:
+                yield path, path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+
+    def _record(self, key: str) -> None:
+        with self._lock:
+            self._index[key] = time.time()
+            self._index.move_to_end(key)
+
+    def _prune(self) -> None:
+        with self._lock:
+            stale = [self._index.popitem(last=False)[0] for _ in range(len(self._index) - self.max_entries)]
+        for key in stale:
+            self._path(key).unlink(missing_ok=True)
+
+
+@dataclass
+class PagePlan:
+    """Which pages of one document are cached, and how to put the document back together."""
+
+    cache: PageCache
+    keys: list[str]
+    cached: dict[int, dict] = field(default_factory=dict)
+
+    @property
+    def misses(self) -> list[int]:
+        return [idx for idx in range(len(self.keys)) if idx not in self.cached]
+
+    def miss_pdf(self, pdf_bytes: bytes) -> bytes:
+        return pdf_bytes if not self.cached else select_pages(pdf_bytes, self.misses)
+
+    def stitch(
+        self,
+        middle_json: dict | None,
+        model_output: list | None,
+        images: dict[str, bytes],
+        image_writer: Any,
+        keep_model_output: bool,
+    ) -> tuple[dict, list | None]:
+        """Merge freshly analyzed miss pages with cached ones, caching the new pages on the way.
+
+        ``middle_json``/``model_output`` cover only the miss pages, in order; cached pages get their
+        images rewritten into this document's image directory.
+        """
+        pages: dict[int, dict] = {}
+        models: dict[int, Any] = {}
+        fresh: dict[str, dict] = {}
+        meta = {key: value for key, value in (middle_json or {}).items() if key != "pdf_info"}
+        for position, idx in enumerate(self.misses):
+            page = {**middle_json["pdf_info"][position], "page_idx": idx}
+            model = model_output[position] if model_output is not None else None
+            pages[idx], models[idx] = page, model
+            page_images = {name: images[name] for name in _image_refs(page) if name in images}
+            fresh[self.keys[idx]] = {
+                "meta": meta,
+                "page": page,
+                "model": model,
+                "images": {name: base64.b64encode(data).decode("ascii") for name, data in page_images.items()},
+            }
+        for idx, entry in self.cached.items():
+            pages[idx] = {**entry["page"], "page_idx": idx}
+            models[idx] = entry["model"]
+            meta = meta or entry["meta"]
+            for name, data in entry["images"].items():
+                image_writer.write(name, base64.b64decode(data))
+        self.cache.put_many(fresh)
+
+        ordered = range(len(self.keys))
+        merged_model = [_renumber_model_page(models[idx], idx) for idx in ordered] if keep_model_output else None
+        return {**meta, "pdf_info": [pages[idx] for idx in ordered]}, merged_model
+
+
+def create_page_cache(settings: Settings) -> PageCache:
+    return PageCache(
+        path=settings.page_cache_path,
+        max_entries=settings.page_cache_entries,
+        render_scale=settings.page_cache_render_scale,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_page_cache() -> PageCache:
+    return create_page_cache(get_settings())
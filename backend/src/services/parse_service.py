@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-import io
-import shutil
-import subprocess
-import tempfile
+import hashlib
+import time
 import uuid
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import dataclass, replace
+from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple
+from typing import AsyncIterator, List
 
 from fastapi import HTTPException, UploadFile, status
 from loguru import logger
@@ -16,9 +16,35 @@ from loguru import logger
 from src.api.validators import validate_files, validate_pages
 from src.config.settings import Settings, get_settings
 from src.observability.logging import get_request_id
-from src.services.mineru_adapter import MineruAdapter, MineruOutputPaths, MineruUnavailableError
+from src.observability.metrics import metrics
+from src.services.admission import AdmissionController, AdmissionTicket, get_admission_controller
+from src.services.artifact_writer import ArtifactWriter, get_artifact_writer
+from src.services.batcher import PipelineBatcher, get_batcher
+from src.services.image_ingest import (
+    IMAGE_SUFFIXES,
+    ImageIngestError,
+    ImageTooLargeError,
+    images_to_pdf,
+    prepare_image,
+)
+from src.services.janitor import StorageJanitor, get_janitor
+from src.services.mineru_adapter import ARTIFACT_NAMES, MineruAdapter, MineruOutputPaths, MineruUnavailableError
+from src.services.office_converter import (
+    OfficeConversionError,
+    OfficeConversionTimeout,
+    OfficeConverter,
+    get_office_converter,
+)
 from src.services.output_builder import OutputBuilder
-from src.services.storage import StorageManager
+from src.services.preflight import preflight
+from src.services.router import AUTO_BACKEND, BackendRouter, get_router
+from src.services.result_cache import CacheEntry, ParseResultCache, document_digest, get_result_cache
+from src.services.sharding import page_shards, plan_shards
+from src.services.single_flight import SingleFlight, get_single_flight
+from src.services.storage import SpooledFile, StorageManager
+from src.services.text_layer import FAST_PARSE_METHOD
+from src.services.vlm_endpoints import VlmEndpointPool, VlmEndpointsUnavailableError, get_vlm_pool
+from src.services.worker_pool import ParseWorkerPool, get_normalize_pool, get_worker_pool
 
 
 @dataclass
@@ -31,45 +57,466 @@ class ParseParams:
     formula_enable: bool = True
     table_enable: bool = True
     server_url: str | None = None
+    outputs: tuple[str, ...] = ARTIFACT_NAMES
+    # "reference" answers with artifact URLs only; it does not change what is parsed or cached.
+    response_mode: str = "inline"
+    # Parse all image uploads of the request as the pages of one document, in upload order.
+    pack_images: bool = False
+
+
+@dataclass
+class _Dispatch:
+    """Where each document of a request will come from: the cache, or a (possibly shared) parse."""
+
+    cached: list[CacheEntry | None]
+    futures: dict[int, asyncio.Future]
+    leaders: list[int]
+    work: asyncio.Future | None
 
 
 class ParseService:
-    def __init__(self, settings: Settings | None = None, storage: StorageManager | None = None) -> None:
+    def __init__(
+        self,
+        settings: Settings | None = None,
+        storage: StorageManager | None = None,
+        worker_pool: ParseWorkerPool | None = None,
+        normalize_pool: ParseWorkerPool | None = None,
+        cache: ParseResultCache | None = None,
+        single_flight: SingleFlight | None = None,
+        batcher: PipelineBatcher | None = None,
+        admission: AdmissionController | None = None,
+        office_converter: OfficeConverter | None = None,
+        artifact_writer: ArtifactWriter | None = None,
+        janitor: StorageJanitor | None = None,
+        router: BackendRouter | None = None,
+        vlm_pool: VlmEndpointPool | None = None,
+    ) -> None:
         self.settings = settings or get_settings()
         self.storage = storage or StorageManager(
             base_path=self.settings.output_base_path,
             ttl_hours=self.settings.output_ttl_hours,
         )
+        self.worker_pool = worker_pool or get_worker_pool()
+        self.normalize_pool = normalize_pool or get_normalize_pool()
+        if cache is None and self.settings.result_cache_enabled:
+            cache = get_result_cache()
+        self.cache = cache
+        self.single_flight = single_flight or get_single_flight()
+        if batcher is None and self.settings.batch_window_ms > 0:
+            batcher = get_batcher()
+        self.batcher = batcher
+        self.admission = admission or get_admission_controller()
+        self.office_converter = office_converter or get_office_converter()
+        self.artifact_writer = artifact_writer or get_artifact_writer()
+        self.janitor = janitor or get_janitor()
+        self.router = router or get_router()
+        self.vlm_pool = vlm_pool or get_vlm_pool()
 
     async def parse(self, files: List[UploadFile], params: ParseParams) -> tuple[list[dict], list[dict]]:
+        job_id = uuid.uuid4().hex
+        normalized_files = await self.prepare(files, params, job_id=job_id)
+        return await self.run(normalized_files, params, job_id=job_id)
+
+    async def prepare(self, files: List[UploadFile], params: ParseParams, job_id: str) -> list[SpooledFile]:
+        """Validate the uploads and spool them under the job directory as normalized PDFs."""
         validate_files(files, self.settings)
         validate_pages(params.start_page, params.end_page, self.settings)
 
-        file_bytes = await self._read_files(files)
-        normalized_files = self._normalize_inputs(file_bytes)
+        try:
+            with metrics.time_stage("spool"):
+                spooled = await self._spool_files(files, self.storage.upload_dir(job_id))
+            with metrics.time_stage("normalize"):
+                normalized = await self._normalize_inputs(spooled, pack_images=params.pack_images)
+            with metrics.time_stage("preflight"):
+                return await self._preflight(normalized, params)
+        except BaseException:
+            self.discard_inputs(job_id)
+            raise
+
+    async def _preflight(self, files: list[SpooledFile], params: ParseParams) -> list[SpooledFile]:
+        """Inspect every PDF with pypdfium2 so oversized or unreadable ones are refused before any inference."""
+        return list(
+            await asyncio.gather(*(self.normalize_pool.run(preflight, item, params, self.settings) for item in files)),
+        )
+
+    def discard_inputs(self, job_id: str) -> None:
+        self.storage.discard_uploads(job_id)
+        # Every job directory is handed to the janitor, which sizes and expires it in the background.
+        self.janitor.track(job_id)
+
+    async def run(
+        self,
+        normalized_files: list[SpooledFile],
+        params: ParseParams,
+        job_id: str | None = None,
+        reject_when_busy: bool = True,
+    ) -> tuple[list[dict], list[dict]]:
+        """Parse normalized files; ``reject_when_busy=False`` waits for a slot instead of answering 429."""
         logger.opt(colors=True).info(
             "<cyan>parse request</cyan> lang={lang} backend={backend} parse_method={method} files={files}",
             lang=params.lang,
             backend=params.backend,
             method=params.parse_method,
-            files=[name for name, _ in normalized_files],
+            files=[item.name for item in normalized_files],
         )
-        job_id = uuid.uuid4().hex
-        adapter = MineruAdapter(output_dir=self.storage.job_dir(job_id))
+        job_id = job_id or uuid.uuid4().hex
+        try:
+            outputs, errors, work = await self._run(normalized_files, params, job_id, reject_when_busy)
+        except BaseException:
+            self.discard_inputs(job_id)
+            raise
+        self._release_inputs(job_id, work)
+        return outputs, errors
 
+    async def stream(
+        self,
+        normalized_files: list[SpooledFile],
+        params: ParseParams,
+        job_id: str | None = None,
+        reject_when_busy: bool = True,
+    ) -> AsyncIterator[dict]:
+        """Start parsing and return an iterator of events, one ``file`` event per document as it finishes.
+
+        Admission is decided before this returns, so a 429 is still raised as an HTTP error rather
+        than in the middle of a stream.
+        """
+        job_id = job_id or uuid.uuid4().hex
         try:
-            mineru_outputs = await asyncio.to_thread(
-                adapter.parse_from_bytes,
-                normalized_files,
-                lang=params.lang,
-                backend=params.backend,
-                parse_method=params.parse_method,
-                server_url=params.server_url,
-                start_page=params.start_page or 0,
-                end_page=params.end_page,
-                formula_enable=params.formula_enable,
-                table_enable=params.table_enable,
+            dispatch = await self._dispatch(normalized_files, params, job_id, reject_when_busy)
+        except BaseException:
+            self.discard_inputs(job_id)
+            raise
+        self._release_inputs(job_id, dispatch.work)
+        return self._events(normalized_files, params, job_id, dispatch)
+
+    def _release_inputs(self, job_id: str, work: asyncio.Future | None) -> None:
+        if work is None:
+            self.discard_inputs(job_id)
+        else:
+            # The shared run may outlive this request (single-flight), so drop the spool only when it is done.
+            work.add_done_callback(lambda _: self.discard_inputs(job_id))
+
+    async def _events(
+        self,
+        normalized_files: list[SpooledFile],
+        params: ParseParams,
+        job_id: str,
+        dispatch: _Dispatch,
+    ) -> AsyncIterator[dict]:
+        builder = OutputBuilder(storage=self.storage)
+        total = len(normalized_files)
+        yield {"event": "started", "job_id": job_id, "files": [item.name for item in normalized_files]}
+
+        async def settled(idx: int) -> tuple[int, MineruOutputPaths | None, BaseException | None]:
+            try:
+                return idx, await asyncio.shield(dispatch.futures[idx]), None
+            except (Exception, asyncio.CancelledError) as exc:  # noqa: BLE001 - an error event for this file only
+                return idx, None, exc
+
+        waiting = [asyncio.ensure_future(settled(idx)) for idx in dispatch.futures]
+        errors: list[dict] = []
+        completed = 0
+        try:
+            for idx, entry in enumerate(dispatch.cached):
+                if entry is not None:
+                    completed += 1
+                    yield self._file_event(builder, normalized_files, params, idx, entry.output, entry.stored_at)
+                    yield {"event": "progress", "completed": completed, "total": total}
+            for next_done in asyncio.as_completed(waiting):
+                idx, output, exc = await next_done
+                completed += 1
+                if exc is None:
+                    yield self._file_event(builder, normalized_files, params, idx, output)
+                else:
+                    detail = exc.detail if isinstance(exc, HTTPException) else "Parse failed"
+                    error = {"index": idx, "filename": normalized_files[idx].name, "detail": detail}
+                    errors.append(error)
+                    yield {"event": "error", **error}
+                yield {"event": "progress", "completed": completed, "total": total}
+        finally:
+            # A closed stream stops waiting; the shielded parse keeps running for any coalesced callers.
+            for task in waiting:
+                task.cancel()
+        yield {"event": "done", "job_id": job_id, "errors": errors, "request_id": get_request_id()}
+
+    def _file_event(
+        self,
+        builder: OutputBuilder,
+        normalized_files: list[SpooledFile],
+        params: ParseParams,
+        idx: int,
+        output: MineruOutputPaths,
+        created_at: datetime | None = None,
+    ) -> dict:
+        with metrics.time_stage("build"):
+            built = builder.build_output(
+                replace(output, filename=normalized_files[idx].name),
+                created_at=created_at,
+                inline=params.response_mode != "reference",
+            )
+        return {"event": "file", "index": idx, "output": built}
+
+    async def _run(
+        self,
+        normalized_files: list[SpooledFile],
+        params: ParseParams,
+        job_id: str,
+        reject_when_busy: bool,
+    ) -> tuple[list[dict], list[dict], asyncio.Future | None]:
+        dispatch = await self._dispatch(normalized_files, params, job_id, reject_when_busy)
+
+        parsed: dict[int, MineruOutputPaths] = {}
+        for idx, future in dispatch.futures.items():
+            # Shielded so a cancelled request never cancels the run other requests are waiting on.
+            parsed[idx] = await asyncio.shield(future)
+
+        builder = OutputBuilder(storage=self.storage)
+        inline = params.response_mode != "reference"
+        outputs: list[dict] = []
+        with metrics.time_stage("build"):
+            for idx, item in enumerate(normalized_files):
+                name = item.name
+                entry = dispatch.cached[idx]
+                if entry is None:
+                    outputs.append(builder.build_output(replace(parsed[idx], filename=name), inline=inline))
+                else:
+                    # Serve the stored artifacts under this request's filename.
+                    outputs.append(
+                        builder.build_output(
+                            replace(entry.output, filename=name),
+                            created_at=entry.stored_at,
+                            inline=inline,
+                        ),
+                    )
+        logger.opt(colors=True).info(
+            "<green>parse success</green> job_id={job} outputs={outputs} "
+            "cache_hits={hits} coalesced={coalesced} errors={errors}",
+            job=job_id,
+            outputs=[out.get("filename") for out in outputs],
+            hits=len(normalized_files) - len(dispatch.futures),
+            coalesced=len(dispatch.futures) - len(dispatch.leaders),
+            errors=[],
+        )
+        return outputs, [], dispatch.work
+
+    async def _dispatch(
+        self,
+        normalized_files: list[SpooledFile],
+        params: ParseParams,
+        job_id: str,
+        reject_when_busy: bool,
+    ) -> _Dispatch:
+        """Serve what the cache has, join in-flight parses, and start one parse for the rest."""
+        keys = [document_digest(item.sha256, params) for item in normalized_files]
+        if self.cache is None:
+            cached = [None] * len(keys)
+        elif self.storage.store.name == "local":
+            cached = self._cached(keys)
+        else:
+            # Checking that cached artifacts still exist is a network round trip per artifact.
+            cached = await asyncio.to_thread(self._cached, keys)
+        misses = [idx for idx, entry in enumerate(cached) if entry is None]
+        for entry in cached:
+            if entry is not None:
+                self._touch(entry.output)
+
+        futures: dict[int, asyncio.Future] = {}
+        leaders: list[int] = []
+        for idx in misses:
+            futures[idx], is_leader = self.single_flight.claim(keys[idx])
+            if is_leader:
+                leaders.append(idx)
+        if not leaders:
+            return _Dispatch(cached=cached, futures=futures, leaders=leaders, work=None)
+
+        pending = [(keys[idx], futures[idx]) for idx in leaders]
+        leader_files = [normalized_files[idx] for idx in leaders]
+        routes = self._routes(leader_files, params)
+        tickets = []
+        try:
+            for route_params, _ in routes:
+                tickets.append(await self.admission.acquire(route_params.backend, bounded=reject_when_busy))
+        except BaseException as exc:
+            for ticket in tickets:
+                ticket.release(observed=False)
+            # Nobody will run these documents; release coalesced waiters with the same outcome.
+            for idx in leaders:
+                if isinstance(exc, asyncio.CancelledError):
+                    futures[idx].cancel()
+                else:
+                    futures[idx].set_exception(exc)
+            raise
+        works = [
+            self._start(
+                [leader_files[pos] for pos in members],
+                route_params,
+                job_id,
+                [pending[pos] for pos in members],
+                ticket,
             )
+            for (route_params, members), ticket in zip(routes, tickets)
+        ]
+        # Inputs may only be discarded once every route is done, failed or not.
+        work = works[0] if len(works) == 1 else asyncio.ensure_future(asyncio.gather(*works, return_exceptions=True))
+        return _Dispatch(cached=cached, futures=futures, leaders=leaders, work=work)
+
+    def _routes(self, files: list[SpooledFile], params: ParseParams) -> list[tuple[ParseParams, list[int]]]:
+        """Split the documents to parse by backend: the requested one, or one per document for backend=auto."""
+        if params.backend != AUTO_BACKEND:
+            return [(params, list(range(len(files))))]
+        planned: Counter[str] = Counter()
+        groups: dict[str, list[int]] = {}
+        for pos, item in enumerate(files):
+            backend = self.router.choose(item, planned).backend
+            planned[backend] += 1
+            groups.setdefault(backend, []).append(pos)
+        return [(replace(params, backend=backend), members) for backend, members in groups.items()]
+
+    def _start(
+        self,
+        files: list[SpooledFile],
+        params: ParseParams,
+        job_id: str,
+        pending: list[tuple[str, asyncio.Future]],
+        ticket: AdmissionTicket,
+    ) -> asyncio.Future:
+        if params.backend == "pipeline":
+            work = asyncio.ensure_future(self._parse_files(files, params, job_id))
+        else:
+            work = asyncio.ensure_future(self._parse_each(files, params, job_id, pending))
+        work.add_done_callback(lambda task: self._finished(files, params, ticket, task))
+        work.add_done_callback(lambda task: self._settle(pending, task))
+        return work
+
+    def _finished(self, files: list[SpooledFile], params: ParseParams, ticket: AdmissionTicket, task: asyncio.Future) -> None:
+        ticket.release()
+        if task.cancelled() or task.exception() is not None or params.parse_method == FAST_PARSE_METHOD:
+            return
+        # Teach the router how long this backend takes per page.
+        pages = sum(item.inspection.requested_pages if item.inspection is not None else 1 for item in files)
+        self.router.observe(params.backend, pages, time.perf_counter() - ticket.granted_at)
+
+    async def _parse_each(
+        self,
+        normalized_files: list[SpooledFile],
+        params: ParseParams,
+        job_id: str,
+        pending: list[tuple[str, asyncio.Future]],
+    ) -> None:
+        """Parse one document at a time and publish each result as soon as it is ready.
+
+        The VLM backends work file by file anyway, so this costs nothing and lets streaming callers
+        (and coalesced waiters) see the first document before the last one is done.
+        """
+        for item, entry in zip(normalized_files, pending):
+            try:
+                outputs = await self._parse_files([item], params, job_id)
+            except Exception as exc:  # noqa: BLE001 - one bad document must not fail the others
+                if not entry[1].done():
+                    entry[1].set_exception(exc)
+                continue
+            self._publish([entry], outputs)
+
+    def _settle(self, pending: list[tuple[str, asyncio.Future]], task: asyncio.Future) -> None:
+        if task.cancelled() or task.exception() is not None:
+            for _, future in pending:
+                if future.done():
+                    continue
+                if task.cancelled():
+                    future.cancel()
+                else:
+                    future.set_exception(task.exception())
+            return
+        if task.result() is not None:
+            self._publish(pending, task.result())
+
+    def _publish(self, pending: list[tuple[str, asyncio.Future]], outputs: List[MineruOutputPaths]) -> None:
+        if self.cache is not None:
+            for (key, _), output in zip(pending, outputs):
+                self.cache.put(key, output)
+        written = asyncio.wrap_future(self.artifact_writer.submit(outputs, storage=self.storage))
+        written.add_done_callback(lambda done: self._stored(pending, outputs, done))
+        if self.settings.artifact_write_mode == "sync":
+            written.add_done_callback(lambda done: self._resolve(pending, outputs, done.exception()))
+        else:
+            # Answer from the in-memory results; the artifacts land in storage shortly after.
+            self._resolve(pending, outputs, None)
+
+    def _resolve(
+        self,
+        pending: list[tuple[str, asyncio.Future]],
+        outputs: List[MineruOutputPaths],
+        error: BaseException | None,
+    ) -> None:
+        for (_, future), output in zip(pending, outputs):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(output)
+
+    def _stored(
+        self,
+        pending: list[tuple[str, asyncio.Future]],
+        outputs: List[MineruOutputPaths],
+        written: asyncio.Future,
+    ) -> None:
+        failed = written.cancelled() or written.exception() is not None
+        if not failed:
+            # Re-measure the job now that its artifacts are on disk.
+            for output in outputs:
+                job_id = self.storage.owning_job(output.locations())
+                if job_id:
+                    self.janitor.track(job_id)
+        # Once the artifacts are on disk the cache stops pinning the in-memory results.
+        if self.cache is None:
+            return
+        for (key, _), output in zip(pending, outputs):
+            if failed:
+                self.cache.discard(key)
+            else:
+                self.cache.replace_output(key, output.stored())
+
+    def _cached(self, keys: list[str]) -> list[CacheEntry | None]:
+        return [self.cache.get(key, exists=self.storage.artifact_exists) for key in keys]
+
+    def _touch(self, output: MineruOutputPaths) -> None:
+        job_id = self.storage.owning_job(output.locations())
+        if job_id:
+            self.janitor.touch(job_id)
+
+    async def _parse_files(
+        self,
+        normalized_files: list[SpooledFile],
+        params: ParseParams,
+        job_id: str,
+    ) -> List[MineruOutputPaths]:
+        output_dir = self.storage.job_dir(job_id)
+        try:
+            with metrics.time_stage("parse"):
+                # Pre-flight may settle the parse method or page range per document; parse alike ones together.
+                groups: list[tuple[ParseParams, list[int]]] = []
+                for idx, item in enumerate(normalized_files):
+                    document_params = _document_params(item, params)
+                    for group_params, members in groups:
+                        if group_params == document_params:
+                            members.append(idx)
+                            break
+                    else:
+                        groups.append((document_params, [idx]))
+                if len(groups) == 1:
+                    return await self._parse_group(normalized_files, groups[0][0], output_dir)
+                results = await asyncio.gather(
+                    *(
+                        self._parse_group([normalized_files[idx] for idx in members], group_params, output_dir)
+                        for group_params, members in groups
+                    ),
+                )
+                by_index = {
+                    idx: output for (_, members), outputs in zip(groups, results) for idx, output in zip(members, outputs)
+                }
+                return [by_index[idx] for idx in range(len(normalized_files))]
         except MineruUnavailableError as exc:
             logger.warning(f"Miner-U unavailable: {exc}")
             raise HTTPException(
@@ -82,93 +529,275 @@ class ParseService:
             logger.exception("Miner-U parse failed")
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Parse failed") from exc
 
-        builder = OutputBuilder(storage=self.storage)
-        outputs = builder.build(job_id=job_id, mineru_outputs=mineru_outputs)
-        logger.opt(colors=True).info(
-            "<green>parse success</green> job_id={job} outputs={outputs} errors={errors}",
-            job=job_id,
-            outputs=[out.get("filename") for out in outputs],
-            errors=[],
+    async def _parse_group(
+        self,
+        normalized_files: list[SpooledFile],
+        params: ParseParams,
+        output_dir: Path,
+    ) -> List[MineruOutputPaths]:
+        # The adapter reads the spooled files itself instead of receiving in-memory copies.
+        sources = [(item.name, item.path) for item in normalized_files]
+        # The text-layer fast path takes milliseconds per page; splitting it would only add overhead.
+        shard = self.settings.shard_pages if params.parse_method != FAST_PARSE_METHOD else 0
+        shards = [
+            page_shards(item.pages, params, shard, self.settings.shard_min_pages)
+            if item.pages is not None
+            else plan_shards(item.path, params, shard, self.settings.shard_min_pages)
+            for item in normalized_files
+        ]
+        whole = [idx for idx, ranges in enumerate(shards) if ranges is None]
+        pages = [item.pages for item in normalized_files]
+        if len(whole) == len(sources):
+            return await self._parse_whole(sources, params, output_dir, pages)
+        # Large documents are split into page ranges parsed side by side on the worker pool.
+        results = await asyncio.gather(
+            self._parse_whole([sources[idx] for idx in whole], params, output_dir, [pages[idx] for idx in whole]),
+            *(
+                self._parse_sharded(sources[idx], ranges, params, output_dir)
+                for idx, ranges in enumerate(shards)
+                if ranges is not None
+            ),
+        )
+        merged = iter(results[1:])
+        by_index = dict(zip(whole, results[0]))
+        return [by_index[idx] if idx in by_index else next(merged) for idx in range(len(sources))]
+
+    async def _parse_whole(
+        self,
+        sources: list[tuple[str, Path]],
+        params: ParseParams,
+        output_dir: Path,
+        pages: list[int | None] | None = None,
+    ) -> List[MineruOutputPaths]:
+        if not sources:
+            return []
+        if params.backend == "pipeline" and params.parse_method != FAST_PARSE_METHOD and self.batcher is not None:
+            return await self.batcher.submit(sources, params, output_dir=output_dir, pages=pages, storage=self.storage)
+        adapter = MineruAdapter(output_dir=output_dir, storage=self.storage)
+        return await self._run_parse(
+            adapter.parse_from_bytes,
+            sources,
+            lang=params.lang,
+            backend=params.backend,
+            parse_method=params.parse_method,
+            server_url=params.server_url,
+            start_page=params.start_page or 0,
+            end_page=params.end_page,
+            formula_enable=params.formula_enable,
+            table_enable=params.table_enable,
+            outputs=params.outputs,
         )
-        self.storage.cleanup_if_needed()
-        return outputs, []
-
-    async def _read_files(self, files: List[UploadFile]) -> list[Tuple[str, bytes]]:
-        results: list[Tuple[str, bytes]] = []
-        for upload in files:
-            data = await upload.read()
-            if len(data) > self.settings.max_file_bytes:
-                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
-            results.append((upload.filename, data))
+
+    async def _run_parse(self, fn, /, *args, backend: str, server_url: str | None, **kwargs):
+        """Run a Miner-U call on the worker pool.
+
+        Worker processes would each keep their own VLM endpoint pool, so in process mode
+        ``vlm-http-client`` calls without a ``server_url`` take their endpoint from this process's pool
+        before dispatch; the per-endpoint limits and circuits then hold across workers.
+        """
+        if (
+            backend == "vlm-http-client"
+            and not server_url
+            and self.worker_pool.mode == "process"
+            and self.vlm_pool.endpoints
+        ):
+            try:
+                return await self.vlm_pool.acall(
+                    lambda url: self.worker_pool.run(fn, *args, backend=backend, server_url=url, **kwargs)
+                )
+            except VlmEndpointsUnavailableError as exc:
+                raise MineruUnavailableError(str(exc)) from exc
+        return await self.worker_pool.run(fn, *args, backend=backend, server_url=server_url, **kwargs)
+
+    async def _parse_sharded(
+        self,
+        source: tuple[str, Path],
+        ranges: list[tuple[int, int]],
+        params: ParseParams,
+        output_dir: Path,
+    ) -> MineruOutputPaths:
+        """Analyze each page range of one document concurrently, then merge them into its outputs."""
+        name, path = source
+        adapter = MineruAdapter(output_dir=output_dir, storage=self.storage)
+        logger.info(f"sharded parse file={name} shards={len(ranges)} pages={ranges[0][0]}-{ranges[-1][1]}")
+        shards = await asyncio.gather(
+            *(
+                self._run_parse(
+                    adapter.analyze_pages,
+                    name,
+                    path,
+                    start,
+                    end,
+                    lang=params.lang,
+                    backend=params.backend,
+                    parse_method=params.parse_method,
+                    server_url=params.server_url,
+                    formula_enable=params.formula_enable,
+                    table_enable=params.table_enable,
+                    keep_model_output="model_output" in params.outputs,
+                )
+                for start, end in ranges
+            ),
+        )
+        with metrics.time_stage("merge"):
+            return await self.worker_pool.run(
+                adapter.merge_pages,
+                name,
+                list(shards),
+                backend=params.backend,
+                parse_method=params.parse_method,
+                outputs=params.outputs,
+            )
+
+    async def _spool_files(self, files: List[UploadFile], upload_dir: Path) -> list[SpooledFile]:
+        results: list[SpooledFile] = []
+        for idx, upload in enumerate(files):
+            suffix = Path(upload.filename or "").suffix.lower()
+            results.append(await self._spool_upload(upload, upload_dir / f"{idx}{suffix}"))
         return results
 
-    def _normalize_inputs(self, files: list[Tuple[str, bytes]]) -> list[Tuple[str, bytes]]:
-        """Convert doc/docx to PDF bytes so Miner-U can parse, keep other formats as-is."""
-        normalized: list[Tuple[str, bytes]] = []
-        for name, data in files:
-            suffix = (name or "").rsplit(".", 1)[-1].lower()
-            stem = Path(name).stem if name else "file"
-            if suffix in {"doc", "docx"}:
-                pdf_bytes = self._convert_doc_to_pdf(name, data)
-                normalized.append((f"{stem}.pdf", pdf_bytes))
-            elif suffix in {"png", "jpg", "jpeg", "bmp", "gif", "webp", "jp2"}:
-                pdf_bytes = self._convert_image_to_pdf(name, data)
-                normalized.append((f"{stem}.pdf", pdf_bytes))
-            else:
-                normalized.append((name, data))
-        return normalized
+    async def _spool_upload(self, upload: UploadFile, target: Path) -> SpooledFile:
+        """Copy an upload to disk in chunks, hashing as it goes and stopping at the size limit."""
+        digest = hashlib.sha256()
+        size = 0
+        with target.open("wb") as handle:
+            while chunk := await upload.read(self.settings.upload_chunk_bytes):
+                size += len(chunk)
+                if size > self.settings.max_file_bytes:
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
+                digest.update(chunk)
+                handle.write(chunk)
+        return SpooledFile(name=upload.filename, path=target, size=size, sha256=digest.hexdigest())
 
-    def _convert_doc_to_pdf(self, filename: str, data: bytes) -> bytes:
-        docx_error: Exception | None = None
+    async def _normalize_inputs(self, files: list[SpooledFile], pack_images: bool = False) -> list[SpooledFile]:
+        """Convert doc/docx and images to spooled PDFs in parallel off the event loop, keep PDFs as-is.
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            src_path = Path(tmpdir) / filename
-            pdf_path = Path(tmpdir) / (Path(filename).stem + ".pdf")
-            src_path.write_bytes(data)
+        With ``pack_images`` all images become one multi-page PDF, placed where the first image was.
+        """
+        images = [item for item in files if _suffix(item) in IMAGE_SUFFIXES] if pack_images else []
+        if len(images) < 2:
+            return list(await asyncio.gather(*(self._normalize_one(item) for item in files)))
+        work = []
+        for item in files:
+            if item is images[0]:
+                work.append(self._converted(item, "convert_image", self._pack_images, images))
+            elif not any(item is image for image in images):
+                work.append(self._normalize_one(item))
+        return list(await asyncio.gather(*work))
 
-            try:
-                from docx2pdf import convert
-
-                convert(str(src_path), str(pdf_path))
-            except Exception as exc:  # noqa: BLE001
-                docx_error = exc
-                logger.warning("DOCX to PDF via docx2pdf failed: %s", exc)
-            if pdf_path.exists():
-                return pdf_path.read_bytes()
-
-            # Fallback to LibreOffice/soffice if available
-            soffice_bin = shutil.which("soffice") or shutil.which("libreoffice")
-            if soffice_bin:
-                try:
-                    subprocess.run(
-                        [soffice_bin, "--headless", "--convert-to", "pdf", str(src_path), "--outdir", tmpdir],
-                        check=True,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                    )
-                except subprocess.CalledProcessError as exc:  # noqa: PERF203
-                    logger.warning("DOCX to PDF via LibreOffice failed: %s", exc)
-                if pdf_path.exists():
-                    return pdf_path.read_bytes()
+    async def _normalize_one(self, item: SpooledFile) -> SpooledFile:
+        suffix = _suffix(item)
+        if suffix in {"doc", "docx"}:
+            return await self._converted(item, "convert_doc", self._convert_doc_file, item)
+        if suffix in IMAGE_SUFFIXES:
+            return await self._converted(item, "convert_image", self._convert_file, item, self._convert_image_to_pdf)
+        return item
+
+    async def _converted(self, item: SpooledFile, stage: str, fn, *args) -> SpooledFile:
+        """Run ``fn(*args, deadline)`` on the normalize pool within the conversion timeout.
 
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Failed to convert DOCX to PDF (requires Word on macOS or LibreOffice)",
-        ) from docx_error
+        A conversion thread cannot be interrupted: one that overruns keeps its pool slot until it
+        returns, then drops its result instead of writing into the discarded upload directory. Image
+        work is bounded up front by ``IMAGE_MAX_PIXELS``; office conversions are killed at the deadline.
+        """
+        deadline = time.monotonic() + self.settings.conversion_timeout_seconds
+        try:
+            with metrics.time_stage(stage):
+                return await asyncio.wait_for(
+                    self.normalize_pool.run(fn, *args, deadline),
+                    timeout=self.settings.conversion_timeout_seconds,
+                )
+        except asyncio.TimeoutError as exc:
+            logger.warning(f"Conversion of {item.name} timed out after {self.settings.conversion_timeout_seconds}s")
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"Timed out converting {item.name} to PDF",
+            ) from exc
+
+    def _convert_file(self, item: SpooledFile, convert, deadline: float) -> SpooledFile:
+        stem = Path(item.name).stem if item.name else "file"
+        pdf_bytes = convert(item.name, item.read_bytes())
+        _check_deadline(item, deadline)
+        pdf_path = item.path.with_suffix(".pdf")
+        pdf_path.write_bytes(pdf_bytes)
+        # Keep the upload digest: conversion is deterministic per input but embeds timestamps.
+        return replace(item, name=f"{stem}.pdf", path=pdf_path, size=len(pdf_bytes))
+
+    def _convert_doc_file(self, item: SpooledFile, deadline: float) -> SpooledFile:
+        """Convert a spooled DOC/DOCX through the office converter pool, reusing cached PDFs by digest."""
+        stem = Path(item.name).stem if item.name else "file"
+        pdf_path = item.path.with_suffix(".pdf")
+        try:
+            # Time spent queued for a normalize worker counts against the conversion timeout.
+            _check_deadline(item, deadline)
+            self.office_converter.convert(item.path, item.sha256, pdf_path, timeout=deadline - time.monotonic())
+        except OfficeConversionTimeout as exc:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"Timed out converting {item.name} to PDF",
+            ) from exc
+        except OfficeConversionError as exc:
+            logger.warning(f"DOCX to PDF conversion failed: {exc}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Failed to convert DOCX to PDF (requires Word on macOS or LibreOffice)",
+            ) from exc
+        return replace(item, name=f"{stem}.pdf", path=pdf_path, size=pdf_path.stat().st_size)
 
     def _convert_image_to_pdf(self, filename: str, data: bytes) -> bytes:
+        return self._images_to_pdf([(filename, data)])
+
+    def _pack_images(self, items: list[SpooledFile], deadline: float) -> SpooledFile:
+        first = items[0]
+        pdf_bytes = self._images_to_pdf([(item.name, item.read_bytes()) for item in items])
+        _check_deadline(first, deadline)
+        pdf_path = first.path.with_suffix(".pdf")
+        pdf_path.write_bytes(pdf_bytes)
+        # The packed document is addressed by its members' digests, in order.
+        digest = hashlib.sha256("".join(item.sha256 for item in items).encode("ascii")).hexdigest()
+        stem = Path(first.name).stem if first.name else "file"
+        return replace(first, name=f"{stem}.pdf", path=pdf_path, size=len(pdf_bytes), sha256=digest)
+
+    def _images_to_pdf(self, images: list[tuple[str, bytes]]) -> bytes:
+        """Place each image on its own page of an in-memory PDF, without re-encoding JPEGs."""
         try:
-            from PIL import Image
+            pages = []
+            for filename, data in images:
+                try:
+                    pages.append(
+                        prepare_image(data, self.settings.image_max_side_px, max_pixels=self.settings.image_max_pixels)
+                    )
+                except ImageTooLargeError as exc:
+                    logger.warning(f"Refusing image {filename}: {exc}")
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Image has more than {self.settings.image_max_pixels} pixels",
+                    ) from exc
+                except ImageIngestError as exc:
+                    logger.warning(f"Image to PDF conversion failed for {filename}: {exc}")
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Failed to convert image to PDF",
+                    ) from exc
+            return images_to_pdf(pages, dpi=self.settings.image_render_dpi)
         except ImportError as exc:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Image support unavailable") from exc
 
-        try:
-            with Image.open(io.BytesIO(data)) as img:
-                rgb = img.convert("RGB")
-                with tempfile.TemporaryDirectory() as tmpdir:
-                    pdf_path = Path(tmpdir) / (Path(filename).stem + ".pdf")
-                    rgb.save(pdf_path, format="PDF")
-                    return pdf_path.read_bytes()
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Image to PDF conversion failed: %s", exc)
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to convert image to PDF") from exc
+
+def _document_params(item: SpooledFile, params: ParseParams) -> ParseParams:
+    """The request's parameters with the pre-flight decisions for this document applied."""
+    return replace(
+        params,
+        parse_method=item.parse_method or params.parse_method,
+        end_page=params.end_page if item.end_page is None else item.end_page,
+    )
+
+
+def _check_deadline(item: SpooledFile, deadline: float) -> None:
+    if time.monotonic() >= deadline:
+        # The request has already answered 504 and discarded its uploads; do not write into them.
+        raise TimeoutError(f"Conversion of {item.name} overran its deadline")
+
+
+def _suffix(item: SpooledFile) -> str:
+    return (item.name or "").rsplit(".", 1)[-1].lower()
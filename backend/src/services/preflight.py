@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException, status
+from loguru import logger
+
+from src.config.settings import Settings
+from src.services.router import AUTO_BACKEND
+from src.services.text_layer import FAST_PARSE_METHOD
+
+if TYPE_CHECKING:
+    from src.services.parse_service import ParseParams
+    from src.services.storage import SpooledFile
+
+
+@dataclass(frozen=True)
+class PdfInspection:
+    """What pypdfium2 can tell about a PDF without running any model.
+
+    ``page_sizes`` (points) and ``text_pages`` cover the inspected range only.
+    """
+
+    pages: int
+    page_sizes: tuple[tuple[float, float], ...]
+    text_pages: int
+    # Pages with several straight rules drawn on them, the cheap tell of a ruled table.
+    ruled_pages: int = 0
+
+    @property
+    def text_coverage(self) -> float:
+        return self.text_pages / len(self.page_sizes) if self.page_sizes else 0.0
+
+    @property
+    def requested_pages(self) -> int:
+        return len(self.page_sizes)
+
+
+def _readable_chars(text: str) -> int:
+    # Broken font encodings come out as U+FFFD or control characters; they do not count as text.
+    return sum(1 for char in text if char.isprintable() and not char.isspace() and char != "�")
+
+
+# Thin path objects (table borders, row separators) needed on a page to call it ruled.
+_MIN_RULES = 4
+
+
+def _count_rules(page) -> int:
+    import pypdfium2.raw as pdfium_c
+
+    rules = 0
+    for obj in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_PATH], max_depth=1):
+        left, bottom, right, top = obj.get_bounds()
+        # Bounds include the stroke width, so a hairline comes out about two points thick.
+        thin, long = sorted((right - left, top - bottom))
+        if thin <= 3 and long > 20:
+            rules += 1
+    return rules
+
+
+def inspect_pdf(source: bytes | Path, start_page: int, end_page: int | None, min_chars: int) -> PdfInspection:
+    """Page count, plus page sizes, text layer presence and ruled tables for pages ``start_page..end_page``."""
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(source)
+    try:
+        total = len(pdf)
+        last = total - 1 if end_page is None else min(end_page, total - 1)
+        sizes = []
+        text_pages = ruled_pages = 0
+        for index in range(start_page, last + 1):
+            page = pdf[index]
+            try:
+                sizes.append((page.get_width(), page.get_height()))
+                textpage = page.get_textpage()
+                try:
+                    if _readable_chars(textpage.get_text_range()) >= min_chars:
+                        text_pages += 1
+                finally:
+                    textpage.close()
+                if _count_rules(page) >= _MIN_RULES:
+                    ruled_pages += 1
+            finally:
+                page.close()
+        return PdfInspection(pages=total, page_sizes=tuple(sizes), text_pages=text_pages, ruled_pages=ruled_pages)
+    finally:
+        pdf.close()
+
+
+def preflight(item: "SpooledFile", params: "ParseParams", settings: Settings) -> "SpooledFile":
+    """Refuse documents that are too long before they reach a worker.
+
+    Returns the file with its per-document decisions filled in: ``end_page`` when an unbounded
+    request is clamped to ``max_pages`` (``OVERSIZE_PDF_POLICY=clamp``), and ``parse_method`` when
+    ``auto`` can be settled from the text layer alone (or ``fast`` has no text layer to work with).
+    """
+    start = params.start_page or 0
+    # Inspect no further than the pages we would accept, so a huge document costs no more than a small one.
+    limit = start + settings.max_pages - 1
+    last = limit if params.end_page is None else min(params.end_page, limit)
+    try:
+        inspection = inspect_pdf(item.path, start, last, settings.preflight_text_min_chars)
+    except Exception as exc:  # noqa: BLE001 - pdfium raises PdfiumError for anything it cannot open
+        # Miner-U opens PDFs with the same library and fails fast, before any model runs.
+        logger.warning(f"pre-flight could not open {item.name}, passing it through: {exc}")
+        return item
+    if start >= inspection.pages:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"start_page is past the last page of {item.name} ({inspection.pages} pages)",
+        )
+
+    end = inspection.pages - 1 if params.end_page is None else min(params.end_page, inspection.pages - 1)
+    end_page = None
+    if end - start + 1 > settings.max_pages:
+        if settings.oversize_pdf_policy != "clamp":
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"{item.name} has {end - start + 1} pages to parse; the limit is {settings.max_pages}",
+            )
+        end_page = limit
+
+    parse_method = None
+    has_text_layer = inspection.text_coverage >= settings.preflight_txt_coverage
+    # With backend=auto the document may still land on the pipeline; VLM backends ignore the method.
+    if params.backend in {"pipeline", AUTO_BACKEND} and params.parse_method == "auto":
+        parse_method = "txt" if has_text_layer else "ocr"
+    elif params.parse_method == FAST_PARSE_METHOD and not has_text_layer:
+        # Scanned pages have nothing to extract; send them through the models instead.
+        parse_method = "ocr" if params.backend == "pipeline" else "auto"
+    return replace(item, inspection=inspection, parse_method=parse_method, end_page=end_page)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from loguru import logger
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised for a job whose worker process died before returning a result."""
+
+
+def _rss_bytes() -> int | None:
+    """Current resident set size, or None where it cannot be read (anything but Linux)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            resident_pages = int(handle.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak RSS (ru_maxrss) never drops, so after one large job it would recycle the worker after every job.
+        return None
+
+
+def _picklable_error(exc: BaseException) -> BaseException:
+    try:
+        pickle.dumps(exc)
+        return exc
+    except Exception:  # noqa: BLE001
+        return RuntimeError(f"{type(exc).__name__}: {exc}")
+
+
+def _worker_main(conn, preload: bool) -> None:
+    ready, error = True, None
+    if preload:
+        from src.services.engine import get_engine
+
+        engine = get_engine()
+        ready, error = engine.warm_up(), engine.error
+    conn.send(("ready", ready, error))
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        fn, args, kwargs = message
+        try:
+            outcome = ("ok", fn(*args, **kwargs))
+        except BaseException as exc:  # noqa: BLE001 - every failure must reach the parent
+            outcome = ("error", _picklable_error(exc))
+        conn.send((*outcome, _rss_bytes()))
+
+
+class _WorkerSlot:
+    """One worker process driven by one dispatcher thread, replaced when it is recycled or dies."""
+
+    def __init__(self, pool: "ProcessWorkerPool", index: int) -> None:
+        self.pool = pool
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.jobs = 0
+        self.ready = False
+
+    def ensure_started(self) -> None:
+        if self.process is not None and self.process.is_alive():
+            return
+        self.stop()
+        parent_conn, child_conn = self.pool.context.Pipe()
+        self.process = self.pool.context.Process(
+            target=_worker_main,
+            args=(child_conn, self.pool.preload),
+            name=f"mineru-worker-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.jobs = 0
+        # Block this slot's dispatcher until the worker has imported and warmed up Miner-U.
+        try:
+            _, self.ready, error = self._receive()
+        except EOFError as exc:
+            self.pool.crashed += 1
+            self.stop()
+            raise WorkerCrashedError("Parse worker exited during start-up") from exc
+        if self.ready:
+            logger.info(f"parse worker {self.index} ready pid={self.process.pid}")
+        else:
+            logger.warning(f"parse worker {self.index} started without Miner-U: {error}")
+
+    def _receive(self):
+        while not self.conn.poll(self.pool.poll_interval):
+            if not self.process.is_alive():
+                raise EOFError
+        return self.conn.recv()
+
+    def call(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        self.ensure_started()
+        try:
+            self.conn.send((fn, args, kwargs))
+            status, payload, rss = self._receive()
+        except (EOFError, OSError, BrokenPipeError) as exc:
+            exitcode = self.process.exitcode if self.process is not None else None
+            self.pool.crashed += 1
+            self.stop()
+            raise WorkerCrashedError(f"Parse worker exited unexpectedly (exit code {exitcode})") from exc
+
+        self.jobs += 1
+        if self._should_recycle(rss):
+            self.pool.recycled += 1
+            rss_mb = f"{rss // (1024 * 1024)}MB" if rss is not None else "unknown"
+            logger.info(f"recycling parse worker {self.index} after {self.jobs} jobs rss={rss_mb}")
+            self.stop()
+            try:
+                # Start the replacement now so the next job finds a warm worker.
+                self.ensure_started()
+            except WorkerCrashedError:
+                logger.exception(f"failed to restart parse worker {self.index}")
+        if status == "error":
+            raise payload
+        return payload
+
+    def _should_recycle(self, rss: int | None) -> bool:
+        if self.pool.max_jobs_per_worker and self.jobs >= self.pool.max_jobs_per_worker:
+            return True
+        return bool(self.pool.max_rss_bytes) and rss is not None and rss > self.pool.max_rss_bytes
+
+    def stop(self) -> None:
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout=5)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+        self.ready = False
+
+
+class ProcessWorkerPool:
+    """Runs picklable callables in dedicated, recyclable worker processes.
+
+    Each worker handles one job at a time. A worker is replaced after ``max_jobs_per_worker``
+    jobs or once its RSS exceeds ``max_rss_bytes``; if it dies mid-job only that job fails.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_jobs_per_worker: int = 0,
+        max_rss_bytes: int = 0,
+        start_method: str = "spawn",
+        preload: bool = True,
+        poll_interval: float = 0.2,
+    ) -> None:
+        self.context = multiprocessing.get_context(start_method)
+        self.max_workers = max(1, max_workers)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_rss_bytes = max_rss_bytes
+        self.preload = preload
+        self.poll_interval = poll_interval
+        self.recycled = 0
+        self.crashed = 0
+        self._busy = 0
+        self._lock = threading.Lock()
+        self._jobs: queue.Queue = queue.Queue()
+        self._slots = [_WorkerSlot(self, idx) for idx in range(self.max_workers)]
+        self._threads = [
+            threading.Thread(target=self._dispatch, args=(slot,), name=f"mineru-dispatch-{slot.index}", daemon=True)
+            for slot in self._slots
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        self._jobs.put((future, fn, args, kwargs))
+        return future
+
+    def _dispatch(self, slot: _WorkerSlot) -> None:
+        try:
+            slot.ensure_started()
+        except Exception:  # noqa: BLE001
+            logger.exception(f"failed to start parse worker {slot.index}")
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                slot.stop()
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self._lock:
+                self._busy += 1
+            try:
+                future.set_result(slot.call(fn, args, kwargs))
+            except BaseException as exc:  # noqa: BLE001
+                future.set_exception(exc)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+
+    @property
+    def ready(self) -> bool:
+        return any(slot.ready for slot in self._slots)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            busy = self._busy
+        return {
+            "size": self.max_workers,
+            "busy": busy,
+            "queued": self._jobs.qsize(),
+            "alive": sum(1 for slot in self._slots if slot.process is not None and slot.process.is_alive()),
+            "recycled": self.recycled,
+            "crashed": self.crashed,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        for _ in self._threads:
+            self._jobs.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
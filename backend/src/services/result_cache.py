@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from src.config.settings import Settings, get_settings
+from src.services.mineru_adapter import MineruOutputPaths
+
+if TYPE_CHECKING:
+    from src.services.parse_service import ParseParams
+
+
+def document_digest(content_sha256: str, params: "ParseParams") -> str:
+    """Content address for one uploaded document under the parameters that change Miner-U output."""
+    digest = hashlib.sha256(content_sha256.encode("ascii"))
+    fields = (
+        params.backend,
+        params.parse_method,
+        params.lang,
+        params.start_page,
+        params.end_page,
+        params.formula_enable,
+        params.table_enable,
+        tuple(sorted(params.outputs)),
+    )
+    digest.update(repr(fields).encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    output: MineruOutputPaths
+    stored_at: datetime
+    expires_at: float
+
+    def artifacts_exist(self, exists: Callable[[Path], bool]) -> bool:
+        if self.output.in_memory:
+            # Still being written; the results are served from memory meanwhile.
+            return True
+        paths = (
+            self.output.markdown,
+            self.output.content_list,
+            self.output.middle_json,
+            self.output.model_output,
+        )
+        return all(exists(path) for path in paths if path is not None)
+
+
+class ParseResultCache:
+    """LRU + TTL index from document digest to artifacts already written under storage."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        # Lookups against a remote artifact store run on worker threads.
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self,
+        key: str,
+        exists: Callable[[Path], bool],
+        now: float | None = None,
+    ) -> CacheEntry | None:
+        """``exists`` checks an artifact in the artifact store, e.g. ``StorageManager.artifact_exists``."""
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and (entry.expires_at <= now or not entry.artifacts_exist(exists)):
+            # Expired, or the storage janitor already removed the job.
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                    self.evictions += 1
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, output: MineruOutputPaths, now: float | None = None) -> CacheEntry:
+        now = now if now is not None else time.monotonic()
+        entry = CacheEntry(output=output, stored_at=datetime.now(timezone.utc), expires_at=now + self.ttl_seconds)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def replace_output(self, key: str, output: MineruOutputPaths) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.output = output
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def create_result_cache(settings: Settings) -> ParseResultCache:
+    # Entries must not outlive the artifacts they point at.
+    ttl_seconds = min(settings.result_cache_ttl_seconds, settings.output_ttl_hours * 3600)
+    return ParseResultCache(max_entries=settings.result_cache_max_entries, ttl_seconds=ttl_seconds)
+
+
+@lru_cache(maxsize=1)
+def get_result_cache() -> ParseResultCache:
+    return create_result_cache(get_settings())
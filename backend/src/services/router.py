@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Mapping
+
+from loguru import logger
+
+from src.config.settings import Settings, get_settings
+from src.observability.metrics import metrics
+from src.services.admission import AdmissionController, get_admission_controller
+
+if TYPE_CHECKING:
+    from src.services.storage import SpooledFile
+
+# The ``backend`` value that asks the router to pick one per document.
+AUTO_BACKEND = "auto"
+# Weight of each new observation in the per-page service time estimate.
+_EWMA_ALPHA = 0.2
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    backend: str
+    # Estimated cost per candidate backend (lower wins); None for backends skipped as saturated.
+    scores: dict[str, float | None]
+    kind: str
+
+
+def document_kind(item: "SpooledFile", txt_coverage: float) -> str:
+    """``text`` for born-digital documents without ruled tables, ``visual`` for scans and table-heavy ones."""
+    inspection = item.inspection
+    if inspection is None:
+        return "unknown"
+    if inspection.text_coverage >= txt_coverage and not inspection.ruled_pages:
+        return "text"
+    return "visual"
+
+
+class BackendRouter:
+    """Chooses a backend per document for ``backend=auto``.
+
+    Each candidate in ``AUTO_BACKENDS`` is scored by the estimated time to finish the document there:
+    its per-page service time (learned from finished parses) times the document's pages, stretched
+    by the queue already waiting for that backend. The score is then scaled by the backend's cost
+    weight, and by ``ROUTER_MISMATCH_PENALTY`` when the document suits the other kind of engine
+    (text layers go to the pipeline, scans and tables to a VLM). Backends whose admission queue is
+    full are skipped while any other has room.
+    """
+
+    def __init__(self, admission: AdmissionController | None = None, settings: Settings | None = None) -> None:
+        self.settings = settings or get_settings()
+        self.admission = admission or get_admission_controller()
+        self.candidates = list(self.settings.auto_backends) or ["pipeline"]
+        self.cost_weights = dict(self.settings.backend_cost_weights)
+        self.page_seconds = {
+            backend: self.settings.backend_page_seconds.get(backend, self.settings.router_default_page_seconds)
+            for backend in self.candidates
+        }
+        self._lock = threading.Lock()
+
+    def choose(self, item: "SpooledFile", planned: Mapping[str, int] | None = None) -> RouteDecision:
+        """Pick the backend for one document; ``planned`` counts documents of the same request already routed."""
+        kind = document_kind(item, self.settings.preflight_txt_coverage)
+        pages = item.inspection.requested_pages if item.inspection is not None else 1
+        scores: dict[str, float | None] = {}
+        for backend in self.candidates:
+            limiter = self.admission.limiter(backend)
+            if limiter.queued >= limiter.max_queued and limiter.active >= limiter.max_concurrent:
+                scores[backend] = None
+                continue
+            # Documents already admitted beyond the free slots have to finish before this one starts.
+            ahead = limiter.active + limiter.queued + (planned or {}).get(backend, 0)
+            waiting = max(ahead + 1 - limiter.max_concurrent, 0)
+            estimate = self.page_seconds[backend] * max(pages, 1) * (1 + waiting / limiter.max_concurrent)
+            fits = kind == "unknown" or (kind == "text") == (backend == "pipeline")
+            penalty = 1.0 if fits else self.settings.router_mismatch_penalty
+            scores[backend] = estimate * self.cost_weights.get(backend, 1.0) * penalty
+
+        available = [backend for backend in self.candidates if scores[backend] is not None]
+        # All saturated: take the shortest backlog and let admission queue or refuse as usual.
+        chosen = min(available, key=lambda name: scores[name]) if available else self._least_backlogged()
+        metrics.count("router", chosen)
+        metrics.count("router_kind", f"{kind}:{chosen}")
+        logger.debug(f"router file={item.name} kind={kind} pages={pages} backend={chosen} scores={scores}")
+        return RouteDecision(backend=chosen, scores=scores, kind=kind)
+
+    def observe(self, backend: str, pages: int, seconds: float) -> None:
+        """Fold a finished parse into the backend's per-page service time."""
+        if backend not in self.page_seconds or pages <= 0:
+            return
+        with self._lock:
+            previous = self.page_seconds[backend]
+            self.page_seconds[backend] = previous + _EWMA_ALPHA * (seconds / pages - previous)
+
+    def snapshot(self) -> dict:
+        return {
+            "candidates": self.candidates,
+            "page_seconds": {backend: round(value, 3) for backend, value in self.page_seconds.items()},
+            "cost_weights": self.cost_weights,
+        }
+
+    def _least_backlogged(self) -> str:
+        def backlog(backend: str) -> float:
+            limiter = self.admission.limiter(backend)
+            return (limiter.active + limiter.queued) / limiter.max_concurrent
+
+        return min(self.candidates, key=backlog)
+
+
+@lru_cache(maxsize=1)
+def get_router() -> BackendRouter:
+    return BackendRouter()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # orjson is several times faster on large middle_json payloads; the stdlib is the fallback.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the optional "perf" extra
+    orjson = None
+
+
+def dumps_json(payload: Any) -> bytes:
+    """Compact UTF-8 JSON for stored artifacts."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers wider than 64 bits, which the stdlib encoder still handles.
+            pass
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.services.batcher import count_pdf_pages
+
+if TYPE_CHECKING:
+    from src.services.parse_service import ParseParams
+
+
+def page_shards(total_pages: int, params: "ParseParams", shard_pages: int, min_pages: int) -> list[tuple[int, int]] | None:
+    """Split the requested page range into (start_page, end_page) shards, inclusive and in order.
+
+    Returns None when the document is too small to be worth splitting (or sharding is off).
+    """
+    if shard_pages <= 0:
+        return None
+    start = params.start_page or 0
+    end = total_pages - 1 if params.end_page is None else min(params.end_page, total_pages - 1)
+    pages = end - start + 1
+    if pages < max(min_pages, 2) or pages <= shard_pages:
+        return None
+    return [(first, min(first + shard_pages - 1, end)) for first in range(start, end + 1, shard_pages)]
+
+
+def plan_shards(source: bytes | Path, params: "ParseParams", shard_pages: int, min_pages: int) -> list[tuple[int, int]] | None:
+    if shard_pages <= 0:
+        return None
+    return page_shards(count_pdf_pages(source), params, shard_pages, min_pages)
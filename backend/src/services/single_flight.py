@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
+from typing import Any
+
+
+class SingleFlight:
+    """Registry of in-flight parses so identical concurrent requests share one Miner-U run.
+
+    The first caller for a key becomes the leader and must settle the returned future;
+    later callers get the same future and should await it through ``asyncio.shield`` so
+    that a cancelled waiter never cancels the shared work.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def claim(self, key: str) -> tuple[asyncio.Future, bool]:
+        future = self._inflight.get(key)
+        if future is not None and not future.done():
+            self.coalesced += 1
+            return future, False
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        future.add_done_callback(lambda done, key=key: self._release(key, done))
+        self.leaders += 1
+        return future, True
+
+    def _release(self, key: str, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Mark the outcome as observed even when every waiter has gone away.
+        if not future.cancelled():
+            future.exception()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"inflight": len(self._inflight), "leaders": self.leaders, "coalesced": self.coalesced}
+
+
+@lru_cache(maxsize=1)
+def get_single_flight() -> SingleFlight:
+    return SingleFlight()
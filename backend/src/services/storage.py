@@ -1,29 +1,145 @@
 from __future__ import annotations
 
+import gzip
 import json
 import shutil
+import zlib
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
 
 from src.config.settings import get_settings
+from src.services.artifact_store import ARTIFACT_ENCODINGS, ArtifactStore, StoredObject, create_artifact_store
+
+if TYPE_CHECKING:
+    from src.services.preflight import PdfInspection
+
+UPLOADS_DIRNAME = "_uploads"
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def encode_artifact(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def decode_chunks(chunks: Iterable[bytes], encoding: str | None) -> Iterator[bytes]:
+    """Undo a stored artifact's encoding chunk by chunk, without holding it whole."""
+    if encoding is None:
+        yield from chunks
+        return
+    if encoding == "zstd":
+        import zstandard
+
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield decompressor.decompress(chunk)
+    if encoding != "zstd":
+        yield decompressor.flush()
+
+
+@dataclass(frozen=True)
+class SpooledFile:
+    """An input document spooled to disk; ``sha256`` is the digest of the bytes as uploaded."""
+
+    name: str
+    path: Path
+    size: int
+    sha256: str
+    # Pre-flight inspection and the per-document decisions made from it; None means "as requested".
+    inspection: PdfInspection | None = None
+    parse_method: str | None = None
+    end_page: int | None = None
+
+    @property
+    def pages(self) -> int | None:
+        return self.inspection.pages if self.inspection is not None else None
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
 
 
 class StorageManager:
-    """File-system backed temp storage with TTL-based cleanup."""
+    """Job directories under ``base_path`` plus the artifact store their results are kept in.
+
+    Uploads are spooled and Miner-U runs in the local job directory; finished artifacts are
+    written to and served from ``store`` (the same directory unless ``STORAGE_BACKEND=s3``).
+    Expiry and eviction are handled by the storage janitor.
+    """
 
-    def __init__(self, base_path: str | Path | None = None, ttl_hours: int | None = None) -> None:
+    def __init__(
+        self,
+        base_path: str | Path | None = None,
+        ttl_hours: int | None = None,
+        store: ArtifactStore | None = None,
+    ) -> None:
         settings = get_settings()
         self.base_path = Path(base_path or settings.output_base_path)
         self.ttl_hours = ttl_hours if ttl_hours is not None else settings.output_ttl_hours
         self.base_path.mkdir(parents=True, exist_ok=True)
-        self._last_cleanup: datetime | None = None
+        self.store = store or create_artifact_store(settings, root=self.base_path)
 
     def job_dir(self, job_id: str) -> Path:
         path = self.base_path / job_id
         path.mkdir(parents=True, exist_ok=True)
         return path
 
+    def upload_dir(self, job_id: str) -> Path:
+        path = self.job_dir(job_id) / UPLOADS_DIRNAME
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def find_job_dir(self, job_id: str) -> Path | None:
+        """An existing job directory, without creating it."""
+        job_root = (self.base_path / job_id).resolve()
+        if job_root.parent != self.base_path.resolve() or not job_root.is_dir():
+            return None
+        return job_root
+
+    def artifact_path(self, job_id: str, name: str) -> Path | None:
+        """Resolve an artifact by its path inside a job directory; never outside it or into the uploads."""
+        job_root = (self.base_path / job_id).resolve()
+        path = (job_root / name).resolve()
+        if job_root.parent != self.base_path.resolve() or not path.is_relative_to(job_root):
+            return None
+        if path.relative_to(job_root).parts[:1] == (UPLOADS_DIRNAME,):
+            return None
+        return path
+
+    def artifact_ref(self, path: str | Path) -> tuple[str, str] | None:
+        """Inverse of ``artifact_path``: the (job_id, name) pair addressing a stored artifact."""
+        try:
+            relative = Path(path).resolve().relative_to(self.base_path.resolve())
+        except ValueError:
+            return None
+        if len(relative.parts) < 2:
+            return None
+        return relative.parts[0], relative.relative_to(relative.parts[0]).as_posix()
+
+    def owning_job(self, paths: Iterable[str | Path | None]) -> str | None:
+        """The job whose directory holds the first of ``paths`` that is inside storage."""
+        for path in paths:
+            ref = self.artifact_ref(path) if path else None
+            if ref is not None:
+                return ref[0]
+        return None
+
+    def discard_uploads(self, job_id: str) -> None:
+        shutil.rmtree(self.base_path / job_id / UPLOADS_DIRNAME, ignore_errors=True)
+
     def expiry_at(self, now: datetime | None = None) -> datetime:
         now = now or datetime.now(timezone.utc)
         return now + timedelta(hours=self.ttl_hours)
@@ -42,22 +158,63 @@ class StorageManager:
         text = json.dumps(payload, ensure_ascii=False, indent=2)
         return self.write_text(job_id, filename, text)
 
-    def cleanup_expired(self, now: datetime | None = None) -> list[Path]:
-        now = now or datetime.now(timezone.utc)
-        removed: list[Path] = []
-        cutoff = now - timedelta(hours=self.ttl_hours)
-        for child in self.base_path.iterdir():
-            if not child.is_dir():
-                continue
-            mtime = datetime.fromtimestamp(child.stat().st_mtime, tz=timezone.utc)
-            if mtime < cutoff:
-                shutil.rmtree(child, ignore_errors=True)
-                removed.append(child)
-        return removed
-
-    def cleanup_if_needed(self, now: datetime | None = None, interval_minutes: int = 60) -> list[Path]:
-        now = now or datetime.now(timezone.utc)
-        if self._last_cleanup and (now - self._last_cleanup) < timedelta(minutes=interval_minutes):
+    def artifact_key(self, path: str | Path) -> str | None:
+        ref = self.artifact_ref(path)
+        return f"{ref[0]}/{ref[1]}" if ref else None
+
+    def put_artifact(self, path: str | Path, data: bytes) -> None:
+        key = self.artifact_key(path)
+        if key is None:
+            raise ValueError(f"{path} is outside storage")
+        self.store.put(key, data)
+
+    def find_artifact(self, path: str | Path) -> tuple[StoredObject, str | None] | None:
+        """The stored object holding the artifact with logical name ``path`` and its Content-Encoding."""
+        key = self.artifact_key(path)
+        if key is None:
+            return None
+        found = self.store.stat(key)
+        if found is not None:
+            return found, None
+        for encoding, suffix in ARTIFACT_ENCODINGS.items():
+            found = self.store.stat(key + suffix)
+            if found is not None:
+                return found, encoding
+        return None
+
+    def artifact_exists(self, path: str | Path) -> bool:
+        return self.find_artifact(path) is not None
+
+    def read_artifact(self, path: str | Path) -> bytes | None:
+        found = self.find_artifact(path)
+        if found is None:
+            return None
+        stored, encoding = found
+        return b"".join(decode_chunks(self.store.iter_bytes(stored.key), encoding))
+
+    def job_objects(self, job_id: str) -> list[StoredObject]:
+        """Stored files of a job, without the spooled uploads or partial writes."""
+        if self.artifact_path(job_id, "") is None:
             return []
-        self._last_cleanup = now
-        return self.cleanup_expired(now=now)
+        return [
+            item
+            for item in self.store.list(f"{job_id}/")
+            if item.key.split("/")[1] != UPLOADS_DIRNAME and not item.key.rsplit("/", 1)[-1].startswith(".")
+        ]
+
+    def iter_jobs(self) -> Iterator[tuple[str, float]]:
+        """Every job in the store with its modification time (epoch seconds)."""
+        return self.store.jobs()
+
+    def job_size(self, job_id: str) -> int | None:
+        """Bytes stored for a job, or None if nothing is left of it."""
+        objects = self.store.list(f"{job_id}/")
+        if not objects and self.find_job_dir(job_id) is None:
+            return None
+        return sum(item.size for item in objects)
+
+    def remove_job(self, job_id: str) -> None:
+        self.store.delete_prefix(f"{job_id}/")
+        job_root = self.find_job_dir(job_id)
+        if job_root is not None:
+            shutil.rmtree(job_root, ignore_errors=True)
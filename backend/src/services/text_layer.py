@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+# parse_method value selecting the text-layer fast path instead of the Miner-U models.
+FAST_PARSE_METHOD = "fast"
+
+_BULLETS = "\u2022\u25e6\u25aa\u25ab\u25cf\u25cb\u25a0\u25a1\u2023\u2043\u2013-*"
+_ORDERED = re.compile(r"^\(?\d{1,3}[.)]\s")
+_CJK = re.compile("[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]")
+# A block counts as a title when its font is this much larger than the body text (or bold and short).
+_TITLE_RATIO = 1.15
+_TITLE_MAX_CHARS = 200
+
+
+@dataclass
+class _Line:
+    text: str
+    bbox: list[float]
+    size: float
+    bold: bool
+
+
+@dataclass
+class _Block:
+    lines: list[_Line] = field(default_factory=list)
+    kind: str = "text"
+    level: int = 0
+
+    @property
+    def size(self) -> float:
+        return max(line.size for line in self.lines)
+
+    @property
+    def bbox(self) -> list[float]:
+        return [
+            min(line.bbox[0] for line in self.lines),
+            min(line.bbox[1] for line in self.lines),
+            max(line.bbox[2] for line in self.lines),
+            max(line.bbox[3] for line in self.lines),
+        ]
+
+    @property
+    def text(self) -> str:
+        return _join_lines([line.text for line in self.lines])
+
+
+def _join_lines(lines: list[str]) -> str:
+    text = ""
+    for line in lines:
+        if not text:
+            text = line
+        elif text.endswith("-") and line[:1].islower():
+            text = text[:-1] + line  # hyphenated word split across lines
+        elif _CJK.match(text[-1]) or _CJK.match(line[0]):
+            text += line
+        else:
+            text += " " + line
+    return text
+
+
+def _is_list_item(text: str) -> bool:
+    return (len(text) > 1 and text[0] in _BULLETS and text[1].isspace()) or bool(_ORDERED.match(text))
+
+
+def _invisible(char: str) -> bool:
+    # pdfium marks a hyphen it removed at a line break with U+FFFE; \r precedes its generated \n.
+    return char == "\ufffe" or unicodedata.category(char) in {"Cc", "Cf"}
+
+
+# Glyph boxes and font attributes sampled per line; enough for its extent and style at a fraction of the calls.
+_SAMPLES_PER_LINE = 8
+
+
+def _page_text(textpage) -> str:
+    """The page text with exactly one character per pdfium char index (line breaks included)."""
+    import pypdfium2.raw as pdfium_c
+
+    count = textpage.count_chars()
+    text = textpage.get_text_range()
+    if len(text) == count:
+        return text
+    # Characters outside the BMP break the one-to-one mapping; fall back to one call per character.
+    return "".join(chr(pdfium_c.FPDFText_GetUnicode(textpage.raw, index)) for index in range(count))
+
+
+def _page_lines(page, textpage) -> list[_Line]:
+    """Lines in content order, as pdfium breaks them, with their bbox (top-left origin), size and weight."""
+    import pypdfium2.raw as pdfium_c
+
+    height = page.get_height()
+    text = _page_text(textpage)
+    lines: list[_Line] = []
+    begin = 0
+    for end in [index for index, char in enumerate(text) if char == "\n"] + [len(text)]:
+        # Keep the pdfium char indices: the line's characters are text[begin:end].
+        indices = [
+            index
+            for index in range(begin, end)
+            if not text[index].isspace() and not _invisible(text[index])
+        ]
+        content = "".join(char for char in text[begin:end] if not _invisible(char)).strip()
+        begin = end + 1
+        if not indices or not content:
+            continue
+        step = max(1, (len(indices) - 1) // (_SAMPLES_PER_LINE - 1))
+        sampled = sorted(set(indices[::step]) | {indices[-1]})
+        boxes = [textpage.get_charbox(index) for index in sampled]
+        sizes = [round(pdfium_c.FPDFText_GetFontSize(textpage.raw, index), 1) for index in sampled]
+        weights = [pdfium_c.FPDFText_GetFontWeight(textpage.raw, index) for index in sampled]
+        left, bottom = min(box[0] for box in boxes), min(box[1] for box in boxes)
+        right, top = max(box[2] for box in boxes), max(box[3] for box in boxes)
+        lines.append(
+            _Line(
+                text=content,
+                bbox=[left, height - top, right, height - bottom],
+                size=Counter(sizes).most_common(1)[0][0],
+                bold=sum(1 for weight in weights if weight >= 600) * 2 > len(weights),
+            ),
+        )
+    return lines
+
+
+def _page_blocks(lines: list[_Line]) -> list[_Block]:
+    """Group consecutive lines into paragraphs on font changes, vertical gaps and list markers."""
+    blocks: list[_Block] = []
+    for line in lines:
+        current = blocks[-1] if blocks else None
+        if current is not None:
+            previous = current.lines[-1]
+            # Measured against the font size: pdfium may already have merged wrapped lines into one.
+            em = max(previous.size, 1.0)
+            gap = line.bbox[1] - previous.bbox[3]
+            same_font = abs(line.size - previous.size) <= 0.15 * previous.size and line.bold == previous.bold
+            if same_font and -em < gap <= 0.8 * em and not _is_list_item(line.text):
+                current.lines.append(line)
+                continue
+        blocks.append(_Block(lines=[line]))
+    return blocks
+
+
+def _body_size(pages: list[list[_Block]]) -> float:
+    # The font size carrying the most characters is taken as body text.
+    weights: Counter = Counter()
+    for blocks in pages:
+        for block in blocks:
+            for line in block.lines:
+                weights[line.size] += len(line.text)
+    return weights.most_common(1)[0][0] if weights else 0.0
+
+
+def _assign_titles(pages: list[list[_Block]]) -> None:
+    body = _body_size(pages)
+    titles = [
+        block
+        for blocks in pages
+        for block in blocks
+        if len(block.text) <= _TITLE_MAX_CHARS
+        and len(block.lines) <= 3
+        and not _is_list_item(block.text)
+        and (block.size >= body * _TITLE_RATIO or (block.lines[0].bold and block.size >= body * 0.95))
+    ]
+    # Larger type ranks higher; bold body-size headings come last.
+    ranks = sorted({round(block.size * 2) / 2 for block in titles}, reverse=True)
+    for block in titles:
+        block.kind = "title"
+        block.level = min(ranks.index(round(block.size * 2) / 2) + 1, 6)
+
+
+def extract_text_layer(source: bytes | Path, start_page: int = 0, end_page: Optional[int] = None) -> dict:
+    """A Miner-U-shaped middle_json built from the PDF text layer alone (no layout, OCR or table models).
+
+    Each page's ``para_blocks`` hold ``text``/``title`` blocks in content-stream order, with bboxes in
+    PDF points from the top-left corner like Miner-U's.
+    """
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(source)
+    try:
+        last = len(pdf) - 1 if end_page is None else min(end_page, len(pdf) - 1)
+        sizes: list[list[float]] = []
+        pages: list[list[_Block]] = []
+        for index in range(start_page, last + 1):
+            page = pdf[index]
+            try:
+                sizes.append([page.get_width(), page.get_height()])
+                textpage = page.get_textpage()
+                try:
+                    pages.append(_page_blocks(_page_lines(page, textpage)))
+                finally:
+                    textpage.close()
+            finally:
+                page.close()
+    finally:
+        pdf.close()
+
+    _assign_titles(pages)
+    pdf_info = []
+    for page_idx, (page_size, blocks) in enumerate(zip(sizes, pages)):
+        para_blocks = []
+        for block_idx, block in enumerate(blocks):
+            para_block = {
+                "type": block.kind,
+                "bbox": _rounded(block.bbox),
+                "lines": [
+                    {
+                        "bbox": _rounded(line.bbox),
+                        "spans": [{"bbox": _rounded(line.bbox), "content": line.text, "type": "text"}],
+                    }
+                    for line in block.lines
+                ],
+                "index": block_idx,
+            }
+            if block.kind == "title":
+                para_block["level"] = block.level
+            para_blocks.append(para_block)
+        pdf_info.append({"page_idx": page_idx, "page_size": page_size, "para_blocks": para_blocks, "discarded_blocks": []})
+    return {"pdf_info": pdf_info, "_backend": "text_layer", "_version_name": "text-layer"}
+
+
+def _rounded(bbox: list[float]) -> list[float]:
+    return [round(value, 2) for value in bbox]
+
+
+def _block_text(block: dict) -> str:
+    return _join_lines([span["content"] for line in block["lines"] for span in line["spans"]])
+
+
+def text_layer_markdown(pdf_info: list[dict]) -> str:
+    """Markdown in the shape ``union_make`` produces: one paragraph per block, ``#`` titles."""
+    parts = []
+    for page in pdf_info:
+        for block in page["para_blocks"]:
+            text = _block_text(block)
+            if block["type"] == "title":
+                parts.append(f"{'#' * block.get('level', 1)} {text}")
+            elif text[:1] in _BULLETS and text[1:2].isspace():
+                parts.append(f"- {text[2:]}")
+            else:
+                parts.append(text)
+    return "\n\n".join(parts)
+
+
+def text_layer_content_list(pdf_info: list[dict]) -> list[dict]:
+    """content_list entries like ``union_make``'s: type, text, text_level for titles, page_idx, bbox in 0-1000."""
+    items = []
+    for page in pdf_info:
+        width, height = page["page_size"]
+        for block in page["para_blocks"]:
+            x0, y0, x1, y1 = block["bbox"]
+            item = {"type": "text", "text": _block_text(block)}
+            if block["type"] == "title":
+                item["text_level"] = block.get("level", 1)
+            item["bbox"] = [
+                int(x0 * 1000 / width),
+                int(y0 * 1000 / height),
+                int(x1 * 1000 / width),
+                int(y1 * 1000 / height),
+            ]
+            item["page_idx"] = page["page_idx"]
+            items.append(item)
+    return items
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import statistics
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Awaitable, Callable, Deque, TypeVar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from src.config.settings import Settings, get_settings
+
+T = TypeVar("T")
+
+# Exception class names of the HTTP clients Miner-U may use (httpx, requests, aiohttp) that mean
+# the endpoint could not be reached or did not answer in time.
+_TRANSPORT_ERRORS = {"TransportError", "TimeoutException", "ConnectionError", "Timeout", "ClientConnectionError"}
+
+
+class VlmEndpointsUnavailableError(RuntimeError):
+    """No configured VLM endpoint could take the document."""
+
+
+def is_endpoint_failure(exc: BaseException | None) -> bool:
+    """Connection errors, timeouts, 5xx and 429 blame the endpoint; anything else is about the document."""
+    seen: set[int] = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, HTTPError):
+            return exc.code >= 500 or exc.code == 429
+        if isinstance(exc, (ConnectionError, TimeoutError, URLError, http.client.HTTPException)):
+            return True
+        if _TRANSPORT_ERRORS.intersection(cls.__name__ for cls in type(exc).__mro__):
+            return True
+        status_code = getattr(getattr(exc, "response", None), "status_code", None)
+        if isinstance(status_code, int):
+            return status_code >= 500 or status_code == 429
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class VlmEndpoint:
+    """One inference server: documents in flight, circuit state and a kept-alive health probe connection."""
+
+    def __init__(self, url: str, max_concurrent: int, window: int = 100) -> None:
+        self.url = url.rstrip("/")
+        self.max_concurrent = max(1, max_concurrent)
+        self.active = 0
+        self.circuit = "closed"
+        self.failures = 0
+        self.retry_at = 0.0
+        self.probing = False
+        self.served = 0
+        self.failed = 0
+        self.service_times: Deque[float] = deque(maxlen=window)
+        self._connection: http.client.HTTPConnection | None = None
+
+    def accepts(self) -> bool:
+        if self.circuit == "closed":
+            return self.active < self.max_concurrent
+        # Half-open: a single trial document decides whether the circuit closes again.
+        return self.circuit == "half_open" and self.active == 0
+
+    def due_for_probe(self, now: float) -> bool:
+        return self.circuit == "open" and not self.probing and now >= self.retry_at
+
+    def probe(self, path: str, timeout: float) -> bool:
+        """GET the health path over a connection kept open between probes."""
+        parts = urlsplit(self.url)
+        try:
+            if self._connection is None:
+                connection_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+                self._connection = connection_cls(parts.netloc, timeout=timeout)
+            self._connection.request("GET", parts.path.rstrip("/") + path)
+            response = self._connection.getresponse()
+            response.read()
+            return 200 <= response.status < 400
+        except (OSError, http.client.HTTPException) as exc:
+            logger.debug(f"vlm endpoint {self.url} health probe failed: {exc}")
+            self.close()
+            return False
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.circuit,
+            "active": self.active,
+            "limit": self.max_concurrent,
+            "served_total": self.served,
+            "failed_total": self.failed,
+            "service_avg_ms": round(statistics.fmean(self.service_times) * 1000, 2) if self.service_times else 0.0,
+        }
+
+
+class VlmEndpointPool:
+    """Spreads ``vlm-http-client`` documents over the inference servers in ``VLM_SERVER_URLS``.
+
+    Each document goes to the least loaded endpoint that has a free slot (``VLM_ENDPOINT_MAX_CONCURRENT``
+    documents per endpoint), waiting up to ``VLM_ENDPOINT_WAIT_SECONDS`` when all are busy. Connection
+    errors, timeouts and 5xx answers count against the endpoint and the document is retried on another
+    one (``VLM_MAX_ATTEMPTS`` endpoints in total). ``VLM_CIRCUIT_FAILURES`` consecutive failures open the
+    endpoint's circuit; after ``VLM_CIRCUIT_OPEN_SECONDS`` a health probe (``VLM_HEALTH_PATH``) decides
+    whether it gets a trial document again. Documents are only refused when every circuit is open.
+
+    Miner-U keeps one client per ``server_url``, so passing the same endpoint strings keeps their
+    connections alive across documents.
+
+    With ``PARSE_EXECUTION_MODE=process`` the API process's pool picks the endpoint (``acall``) and
+    hands it to the worker, so the limits and circuits hold across all workers.
+    """
+
+    def __init__(self, settings: Settings | None = None) -> None:
+        self.settings = settings or get_settings()
+        self.endpoints = [
+            VlmEndpoint(url, self.settings.vlm_endpoint_max_concurrent) for url in self.settings.vlm_server_urls
+        ]
+        self._cond = threading.Condition()
+
+    def call(self, fn: Callable[[str], T]) -> T:
+        """Run ``fn(server_url)`` on a healthy endpoint, retrying endpoint failures on another one."""
+        tried: set[str] = set()
+        while True:
+            endpoint = self._acquire(exclude=tried)
+            tried.add(endpoint.url)
+            start = time.perf_counter()
+            try:
+                result = fn(endpoint.url)
+            except Exception as exc:
+                if not self._retry(endpoint, exc, tried):
+                    raise
+                continue
+            self._release(endpoint, failed=False, seconds=time.perf_counter() - start)
+            return result
+
+    async def acall(self, fn: Callable[[str], Awaitable[T]]) -> T:
+        """``call`` for coroutines: waits for a free endpoint on a thread and awaits ``fn(server_url)``."""
+        tried: set[str] = set()
+        while True:
+            acquiring = asyncio.ensure_future(asyncio.to_thread(self._acquire, set(tried)))
+            try:
+                endpoint = await asyncio.shield(acquiring)
+            except asyncio.CancelledError:
+                # The thread may still get a slot after the caller gave up; hand it straight back.
+                acquiring.add_done_callback(self._abandon_acquired)
+                raise
+            tried.add(endpoint.url)
+            start = time.perf_counter()
+            try:
+                result = await fn(endpoint.url)
+            except Exception as exc:
+                if not self._retry(endpoint, exc, tried):
+                    raise
+                continue
+            except BaseException:
+                self._abandon(endpoint)
+                raise
+            self._release(endpoint, failed=False, seconds=time.perf_counter() - start)
+            return result
+
+    def _retry(self, endpoint: VlmEndpoint, exc: Exception, tried: set[str]) -> bool:
+        """Release ``endpoint`` after ``exc``; True when the document should go to another endpoint."""
+        failed = is_endpoint_failure(exc)
+        self._release(endpoint, failed=failed, seconds=None)
+        if not failed:
+            return False
+        if len(tried) >= max(1, min(self.settings.vlm_max_attempts, len(self.endpoints))):
+            raise VlmEndpointsUnavailableError(f"VLM endpoint {endpoint.url} failed: {exc}") from exc
+        logger.warning(f"vlm endpoint {endpoint.url} failed, retrying on another endpoint: {exc}")
+        return True
+
+    def _acquire(self, exclude: set[str]) -> VlmEndpoint:
+        deadline = time.monotonic() + self.settings.vlm_endpoint_wait_seconds
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                candidates = [endpoint for endpoint in self.endpoints if endpoint.url not in exclude]
+                due = next((endpoint for endpoint in candidates if endpoint.due_for_probe(now)), None)
+                if due is not None:
+                    due.probing = True
+                else:
+                    ready = [endpoint for endpoint in candidates if endpoint.accepts()]
+                    if ready:
+                        chosen = min(ready, key=lambda item: (item.active / item.max_concurrent, item.served))
+                        chosen.active += 1
+                        return chosen
+                    if all(endpoint.circuit == "open" and not endpoint.probing for endpoint in candidates):
+                        raise VlmEndpointsUnavailableError(
+                            "No VLM endpoint is available" + (" to retry on" if exclude else ""),
+                        )
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise VlmEndpointsUnavailableError("Timed out waiting for a free VLM endpoint")
+                    # Woken by releases and probe results; the timeout also lets open circuits come due.
+                    self._cond.wait(min(remaining, self._next_probe(candidates, now)))
+                    continue
+            # Probe outside the lock so other documents keep flowing to the healthy endpoints.
+            healthy = due.probe(self.settings.vlm_health_path, self.settings.vlm_health_timeout_seconds)
+            with self._cond:
+                due.probing = False
+                if healthy:
+                    due.circuit = "half_open"
+                    logger.info(f"vlm endpoint {due.url} answered its health probe; sending a trial document")
+                else:
+                    due.retry_at = time.monotonic() + self.settings.vlm_circuit_open_seconds
+                self._cond.notify_all()
+
+    def _next_probe(self, candidates: list[VlmEndpoint], now: float) -> float:
+        waits = [endpoint.retry_at - now for endpoint in candidates if endpoint.circuit == "open"]
+        return max(min(waits), 0.01) if waits else self.settings.vlm_endpoint_wait_seconds
+
+    def _release(self, endpoint: VlmEndpoint, failed: bool, seconds: float | None) -> None:
+        with self._cond:
+            endpoint.active -= 1
+            if failed:
+                endpoint.failed += 1
+                endpoint.failures += 1
+                if endpoint.circuit == "half_open" or endpoint.failures >= self.settings.vlm_circuit_failures:
+                    endpoint.circuit = "open"
+                    endpoint.retry_at = time.monotonic() + self.settings.vlm_circuit_open_seconds
+                    logger.warning(f"vlm endpoint {endpoint.url} circuit opened after {endpoint.failures} failures")
+            else:
+                # The server answered, even if the document itself was rejected.
+                endpoint.circuit = "closed"
+                endpoint.failures = 0
+                endpoint.served += 1
+                if seconds is not None:
+                    endpoint.service_times.append(seconds)
+            self._cond.notify_all()
+
+    def _abandon_acquired(self, acquiring: asyncio.Future) -> None:
+        if not acquiring.cancelled() and acquiring.exception() is None:
+            self._abandon(acquiring.result())
+
+    def _abandon(self, endpoint: VlmEndpoint) -> None:
+        """Give back a slot whose document was cancelled, without judging the endpoint."""
+        with self._cond:
+            endpoint.active -= 1
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._cond:
+            return {endpoint.url: endpoint.snapshot() for endpoint in self.endpoints}
+
+    def close(self) -> None:
+        for endpoint in self.endpoints:
+            endpoint.close()
+
+
+@lru_cache(maxsize=1)
+def get_vlm_pool() -> VlmEndpointPool:
+    return VlmEndpointPool()
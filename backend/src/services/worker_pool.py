@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, TypeVar
+
+from src.config.settings import Settings, get_settings
+from src.services.process_pool import ProcessWorkerPool
+
+T = TypeVar("T")
+
+
+class ParseWorkerPool:
+    """Bounded pool that runs blocking Miner-U work off the event loop.
+
+    Work beyond ``max_workers`` waits in the pool queue instead of spawning more
+    threads, so concurrent requests cannot oversubscribe the CPU. With a
+    ``process_pool`` the work runs in dedicated worker processes instead of
+    threads of the API process; callables must then be picklable.
+    """
+
+    def __init__(self, max_workers: int, process_pool: ProcessWorkerPool | None = None) -> None:
+        self.max_workers = max(1, max_workers)
+        self.process_pool = process_pool
+        self._executor = None
+        if process_pool is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mineru-parse")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._busy = 0
+
+    @property
+    def mode(self) -> str:
+        return "process" if self.process_pool is not None else "thread"
+
+    @property
+    def ready(self) -> bool | None:
+        """Whether worker processes have warmed up Miner-U; ``None`` when parsing runs in-process."""
+        return self.process_pool.ready if self.process_pool is not None else None
+
+    async def run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        if self.process_pool is not None:
+            return await asyncio.wrap_future(self.process_pool.submit(fn, *args, **kwargs))
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._pending += 1
+        try:
+            return await loop.run_in_executor(self._executor, functools.partial(self._call, fn, *args, **kwargs))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self._busy += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+    def snapshot(self) -> dict[str, Any]:
+        if self.process_pool is not None:
+            return {"mode": self.mode, **self.process_pool.snapshot()}
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "size": self.max_workers,
+                "busy": self._busy,
+                "queued": max(self._pending - self._busy, 0),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=wait)
+        else:
+            self._executor.shutdown(wait=wait)
+
+
+def create_worker_pool(settings: Settings) -> ParseWorkerPool:
+    process_pool = None
+    if settings.parse_execution_mode == "process":
+        process_pool = ProcessWorkerPool(
+            max_workers=settings.parse_workers,
+            max_jobs_per_worker=settings.worker_max_jobs,
+            max_rss_bytes=settings.worker_max_rss_mb * 1024 * 1024,
+            start_method=settings.worker_start_method,
+            preload=settings.mineru_preload,
+        )
+    return ParseWorkerPool(max_workers=settings.parse_workers, process_pool=process_pool)
+
+
+@lru_cache(maxsize=1)
+def get_worker_pool() -> ParseWorkerPool:
+    return create_worker_pool(get_settings())
+
+
+@lru_cache(maxsize=1)
+def get_normalize_pool() -> ParseWorkerPool:
+    """Separate thread pool for input conversion so it never queues behind Miner-U runs."""
+    return ParseWorkerPool(max_workers=get_settings().normalize_workers)
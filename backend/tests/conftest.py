@@ -1,6 +1,7 @@
 import asyncio
 import os
 import sys
+import time
 from pathlib import Path
 
 import pytest
@@ -34,3 +35,312 @@ async def client(tmp_path: Path):
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as ac:
         yield ac
+
+
+class FakeMineruAdapter:
+    """Stands in for MineruAdapter: writes small artifacts and records every call."""
+
+    calls: list = []
+    delay: float = 0.0
+    # Like the real adapter: return results in memory and leave writing them to ArtifactWriter.
+    in_memory: bool = False
+    fail_on: set = set()
+
+    def __init__(self, output_dir=None, engine=None, storage=None) -> None:
+        self.output_dir = Path(output_dir)
+        self.storage = storage
+
+    def parse_from_bytes(self, files, output_dirs=None, **kwargs):
+        from src.services.artifact_writer import write_artifacts
+        from src.services.mineru_adapter import ARTIFACT_NAMES, MineruOutputPaths
+
+        FakeMineruAdapter.calls.append({"files": [name for name, _ in files], "output_dirs": output_dirs, **kwargs})
+        time.sleep(FakeMineruAdapter.delay)
+        if FakeMineruAdapter.fail_on.intersection(name for name, _ in files):
+            raise RuntimeError("boom")
+        outputs = []
+        for idx, (name, source) in enumerate(files):
+            size = source.stat().st_size if isinstance(source, Path) else len(source)
+            output_dir = Path(output_dirs[idx]) if output_dirs else self.output_dir
+            md_dir = output_dir / Path(name).stem / kwargs.get("parse_method", "auto")
+            image_dir = md_dir / "images"
+            image_dir.mkdir(parents=True, exist_ok=True)
+            wanted = set(kwargs.get("outputs") or ARTIFACT_NAMES)
+            artifacts = {
+                "markdown": (md_dir / f"{name}.md", f"# {name} ({size} bytes)"),
+                "content_list": (
+                    md_dir / f"{name}_content_list.json",
+                    [{"type": "text", "text": "hello", "page_idx": 0}],
+                ),
+                "middle_json": (md_dir / f"{name}_middle.json", {"pdf_info": []}),
+            }
+            kept = {key: value if key in wanted else (None, None) for key, value in artifacts.items()}
+            output = MineruOutputPaths(
+                filename=name,
+                markdown=kept["markdown"][0],
+                content_list=kept["content_list"][0],
+                middle_json=kept["middle_json"][0],
+                model_output=None,
+                image_dir=image_dir,
+                markdown_text=kept["markdown"][1],
+                content_list_data=kept["content_list"][1],
+                middle_json_data=kept["middle_json"][1],
+            )
+            if not FakeMineruAdapter.in_memory:
+                write_artifacts(output)
+                output = output.stored()
+            outputs.append(output)
+        return outputs
+
+    def analyze_pages(self, name, source, start_page, end_page, **kwargs):
+        FakeMineruAdapter.calls.append({"files": [name], "pages": (start_page, end_page), **kwargs})
+        time.sleep(FakeMineruAdapter.delay)
+        pages = [{"page_idx": idx, "text": f"{name} p{start_page + idx}"} for idx in range(end_page - start_page + 1)]
+        return {"start_page": start_page, "middle_json": {"pdf_info": pages, "_backend": "fake"}, "model_output": None}
+
+    def merge_pages(self, name, shards, **kwargs):
+        from src.services.mineru_adapter import MineruAdapter
+
+        # The real merge, on top of a stand-in for the Miner-U modules it calls.
+        return MineruAdapter(output_dir=self.output_dir, engine=FakeMineruEngine()).merge_pages(name, shards, **kwargs)
+
+
+class FakeMineruEngine:
+    """Just enough of ``MineruEngine.modules()`` for the adapter's own assembly code."""
+
+    def modules(self):
+        from types import SimpleNamespace
+
+        def prepare_env(output_dir, name, parse_method):
+            md_dir = Path(output_dir) / name / parse_method
+            (md_dir / "images").mkdir(parents=True, exist_ok=True)
+            return str(md_dir / "images"), str(md_dir)
+
+        def union_make(pdf_info, mode, image_dir_name):
+            if mode == "markdown":
+                return "\n\n".join(page["text"] for page in pdf_info)
+            return [{"type": "text", "text": page["text"], "page_idx": page["page_idx"]} for page in pdf_info]
+
+        return SimpleNamespace(
+            prepare_env=prepare_env,
+            pipeline_union_make=union_make,
+            vlm_union_make=union_make,
+            MakeMode=SimpleNamespace(MM_MD="markdown", CONTENT_LIST="content_list"),
+        )
+
+
+class FakeS3Client:
+    """In-memory stand-in for the subset of the boto3 S3 client that S3ArtifactStore uses."""
+
+    def __init__(self, page_size: int = 1000) -> None:
+        self.objects: dict[str, dict] = {}
+        self.uploads: dict[str, dict] = {}
+        self.page_size = page_size
+        self.calls: list[str] = []
+
+    @staticmethod
+    def _missing():
+        error = Exception("Not Found")
+        error.response = {"Error": {"Code": "404"}}
+        return error
+
+    def _store(self, key, body, **headers):
+        import hashlib
+        from datetime import datetime, timezone
+
+        self.objects[key] = {
+            "Body": body,
+            "ETag": f'"{hashlib.md5(body).hexdigest()}"',
+            "LastModified": datetime.now(timezone.utc),
+            **headers,
+        }
+
+    def put_object(self, Bucket, Key, Body, **headers):
+        self.calls.append("put_object")
+        self._store(Key, bytes(Body), **headers)
+        return {}
+
+    def create_multipart_upload(self, Bucket, Key, **headers):
+        self.calls.append("create_multipart_upload")
+        upload_id = f"upload-{len(self.uploads)}"
+        self.uploads[upload_id] = {"Key": Key, "parts": {}, "headers": headers}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls.append("upload_part")
+        self.uploads[UploadId]["parts"][PartNumber] = bytes(Body)
+        return {"ETag": f'"part-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append("complete_multipart_upload")
+        upload = self.uploads.pop(UploadId)
+        body = b"".join(upload["parts"][part["PartNumber"]] for part in MultipartUpload["Parts"])
+        self._store(Key, body, **upload["headers"])
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append("abort_multipart_upload")
+        self.uploads.pop(UploadId, None)
+        return {}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise self._missing()
+        item = self.objects[Key]
+        return {"ContentLength": len(item["Body"]), "ETag": item["ETag"], "LastModified": item["LastModified"]}
+
+    def get_object(self, Bucket, Key):
+        import io
+
+        if Key not in self.objects:
+            raise self._missing()
+        return {"Body": io.BytesIO(self.objects[Key]["Body"])}
+
+    def list_objects_v2(self, Bucket, Prefix="", ContinuationToken=None):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page = keys[start : start + self.page_size]
+        response = {
+            "Contents": [
+                {
+                    "Key": key,
+                    "Size": len(self.objects[key]["Body"]),
+                    "ETag": self.objects[key]["ETag"],
+                    "LastModified": self.objects[key]["LastModified"],
+                }
+                for key in page
+            ],
+            "IsTruncated": start + self.page_size < len(keys),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + self.page_size)
+        return response
+
+    def delete_objects(self, Bucket, Delete):
+        for item in Delete["Objects"]:
+            self.objects.pop(item["Key"], None)
+        return {}
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        return f"https://s3.test/{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
+
+
+def text_pdf(pages: list[list[tuple[str, float, float, str]]], rules: int = 0) -> bytes:
+    """A minimal born-digital PDF: each page is a list of (font, size, baseline y, text) lines at x=72.
+
+    Fonts are ``F1`` (Helvetica) and ``F2`` (Helvetica-Bold) on a US Letter page. ``rules`` draws that
+    many horizontal table rules under the text of every page.
+    """
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>",
+    ]
+    kids = []
+    for lines in pages:
+        stream = " ".join(f"BT /{font} {size} Tf 72 {y} Td ({text}) Tj ET" for font, size, y, text in lines)
+        stream += "".join(f" 72 {100 + 20 * idx} m 540 {100 + 20 * idx} l S" for idx in range(rules))
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+            "/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>",
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    body, offsets = b"%PDF-1.4\n", []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    body += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return body
+
+
+@pytest.fixture()
+def make_input(tmp_path):
+    """Build SpooledFile inputs the way ParseService.prepare would."""
+    import hashlib
+
+    from src.services.storage import SpooledFile
+
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir(exist_ok=True)
+
+    def _make(name: str, data: bytes):
+        path = spool_dir / f"{len(list(spool_dir.iterdir()))}-{name}"
+        path.write_bytes(data)
+        return SpooledFile(name=name, path=path, size=len(data), sha256=hashlib.sha256(data).hexdigest())
+
+    return _make
+
+
+@pytest.fixture()
+def make_service(settings, tmp_path):
+    """Build ParseServices that keep storage, caches, the job index and office conversions under tmp_path.
+
+    Keyword arguments naming a ParseService collaborator replace it; the others override settings.
+    """
+    import inspect
+
+    from src.services.janitor import JobIndex, StorageJanitor
+    from src.services.office_converter import OfficeConverter
+    from src.services.parse_service import ParseService
+    from src.services.result_cache import create_result_cache
+    from src.services.single_flight import SingleFlight
+    from src.services.storage import StorageManager
+
+    collaborators = set(inspect.signature(ParseService).parameters) - {"settings"}
+    # Dot-directories are not taken for jobs by the local artifact store.
+    state = tmp_path / ".state"
+    indexes = []
+
+    def _make(**overrides):
+        parts = {name: overrides.pop(name) for name in list(overrides) if name in collaborators}
+        config = settings.model_copy(
+            update={
+                "output_base_path": str(tmp_path),
+                "office_cache_path": str(state / "office-cache"),
+                "office_profile_path": str(state / "office-profiles"),
+                "page_cache_path": str(state / "page-cache"),
+                "job_index_path": str(state / "jobs.sqlite3"),
+                **overrides,
+            },
+        )
+        storage = parts.setdefault("storage", StorageManager(base_path=tmp_path, ttl_hours=1))
+        office = parts.setdefault("office_converter", OfficeConverter(config))
+        if "janitor" not in parts:
+            index = JobIndex(config.job_index_path)
+            indexes.append(index)
+            parts["janitor"] = StorageJanitor(storage, index, settings=config, caches=[office.cache])
+        if "cache" not in parts and config.result_cache_enabled:
+            parts["cache"] = create_result_cache(config)
+        parts.setdefault("single_flight", SingleFlight())
+        return ParseService(settings=config, **parts)
+
+    yield _make
+    for index in indexes:
+        index.close()
+
+
+@pytest.fixture()
+def fake_adapter(monkeypatch):
+    from src.services import batcher as batcher_module
+    from src.services import parse_service as parse_service_module
+
+    FakeMineruAdapter.calls = []
+    FakeMineruAdapter.delay = 0.0
+    FakeMineruAdapter.in_memory = False
+    FakeMineruAdapter.fail_on = set()
+    monkeypatch.setattr(parse_service_module, "MineruAdapter", FakeMineruAdapter)
+    monkeypatch.setattr(batcher_module, "MineruAdapter", FakeMineruAdapter)
+    return FakeMineruAdapter
+
+
+@pytest.fixture()
+def fake_s3():
+    # Small pages so listing exercises continuation tokens.
+    return FakeS3Client(page_size=2)
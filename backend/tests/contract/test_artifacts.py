@@ -0,0 +1,236 @@
+import io
+import zipfile
+
+import pytest
+
+from src.api import parse as parse_module
+from src.services.artifact_writer import ArtifactWriter, write_artifacts
+from src.services.mineru_adapter import MineruOutputPaths
+from src.services.storage import StorageManager
+
+
+@pytest.fixture()
+def service(make_service, tmp_path, fake_adapter, monkeypatch):
+    service = make_service(storage=StorageManager(base_path=tmp_path / "outputs", ttl_hours=1))
+    monkeypatch.setattr(parse_module, "get_parse_service", lambda: service)
+    return service
+
+
+async def _parse(client, response_mode="reference", data=b"%PDF-artifacts"):
+    files = {
+        "files": ("report.pdf", io.BytesIO(data), "application/pdf"),
+        "response_mode": (None, response_mode),
+    }
+    response = await client.post("/api/v1/parse", files=files)
+    assert response.status_code == 200
+    return response.json()["outputs"][0]
+
+
+@pytest.mark.asyncio
+async def test_reference_mode_returns_urls_only(client, service):
+    output = await _parse(client)
+
+    assert output["markdown"] is None
+    assert output["content_list_json"] is None
+    assert output["markdown_url"].startswith("/api/v1/jobs/")
+    assert output["markdown_url"].endswith("/report/auto/report.pdf.md")
+    assert output["model_output_url"] is None
+
+    response = await client.get(output["markdown_url"])
+    assert response.status_code == 200
+    assert response.text.startswith("# report.pdf")
+    assert response.headers["etag"]
+    assert response.headers["last-modified"]
+    assert response.headers["expires"]
+    assert "max-age=" in response.headers["cache-control"]
+
+
+@pytest.mark.asyncio
+async def test_inline_mode_also_fills_urls(client, service):
+    output = await _parse(client, response_mode="inline", data=b"%PDF-inline")
+
+    assert output["markdown"].startswith("# report.pdf")
+    assert output["content_list_url"].endswith("report.pdf_content_list.json")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("service_fixture", ["service", "compressing_service"])
+async def test_artifacts_support_conditional_and_range_requests(client, service_fixture, request):
+    # compressing_service stores every artifact gzip-compressed (over the compression threshold).
+    request.getfixturevalue(service_fixture)
+    url = (await _parse(client, data=b"%PDF-ranges"))["middle_json_url"]
+    first = await client.get(url, headers={"Accept-Encoding": "identity"})
+
+    cached = await client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    for accept in ("identity", "gzip"):
+        partial = await client.get(url, headers={"Range": "bytes=0-3", "Accept-Encoding": accept})
+        assert partial.status_code == 206
+        assert "content-encoding" not in partial.headers
+        assert partial.content == first.content[:4]
+        assert partial.headers["content-range"] == f"bytes 0-3/{len(first.content)}"
+
+    tail = await client.get(url, headers={"Range": "bytes=-5", "Accept-Encoding": "identity"})
+    assert tail.content == first.content[-5:]
+    beyond = await client.get(url, headers={"Range": f"bytes={len(first.content)}-", "Accept-Encoding": "identity"})
+    assert beyond.status_code == 416
+
+
+@pytest.mark.asyncio
+async def test_artifacts_outside_the_job_are_not_served(client, service, tmp_path):
+    output = await _parse(client, data=b"%PDF-escape")
+    job_id = output["markdown_url"].split("/")[4]
+    (tmp_path / "secret.txt").write_text("secret")
+    service.storage.upload_dir(job_id).joinpath("0.pdf").write_bytes(b"%PDF")
+
+    for name in ("../../secret.txt", "_uploads/0.pdf", "missing.md"):
+        response = await client.get(f"/api/v1/jobs/{job_id}/artifacts/{name}")
+        assert response.status_code == 404, name
+    assert service.storage.artifact_path(job_id, "../../secret.txt") is None
+    assert service.storage.artifact_path("..", "secret.txt") is None
+
+
+@pytest.fixture()
+def compressing_service(make_service, tmp_path, fake_adapter, monkeypatch):
+    fake_adapter.in_memory = True
+    service = make_service(
+        storage=StorageManager(base_path=tmp_path / "outputs", ttl_hours=1),
+        artifact_writer=ArtifactWriter(compression="gzip", min_bytes=0),
+    )
+    monkeypatch.setattr(parse_module, "get_parse_service", lambda: service)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_compressed_artifacts_are_sent_as_stored(client, compressing_service, tmp_path):
+    url = (await _parse(client, data=b"%PDF-gzip"))["content_list_url"]
+    compressing_service.artifact_writer.flush()
+    stored = next((tmp_path / "outputs").rglob("report.pdf_content_list.json.gz"))
+
+    encoded = await client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert encoded.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in encoded.headers["vary"]
+    assert int(encoded.headers["content-length"]) == stored.stat().st_size
+    assert encoded.json() == [{"type": "text", "text": "hello", "page_idx": 0}]
+
+    plain = await client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == encoded.json()
+    assert plain.headers["etag"] != encoded.headers["etag"]
+
+
+def test_compact_json_round_trips_through_storage(tmp_path):
+    output = MineruOutputPaths(
+        filename="a.pdf",
+        markdown=tmp_path / "a.md",
+        content_list=None,
+        middle_json=tmp_path / "a_middle.json",
+        model_output=None,
+        image_dir=None,
+        markdown_text="# a",
+        middle_json_data={"pdf_info": [{"page_idx": 0, "text": "ü"}]},
+    )
+    write_artifacts(output, compression="gzip", min_bytes=16)
+    storage = StorageManager(base_path=tmp_path.parent, ttl_hours=1)
+
+    assert (tmp_path / "a.md").read_text() == "# a"
+    stored, encoding = storage.find_artifact(tmp_path / "a_middle.json")
+    assert (stored.key, encoding) == (f"{tmp_path.name}/a_middle.json.gz", "gzip")
+    assert storage.read_artifact(tmp_path / "a_middle.json") == '{"pdf_info":[{"page_idx":0,"text":"ü"}]}'.encode()
+
+
+@pytest.mark.asyncio
+async def test_bundle_streams_artifacts_and_images(client, service, tmp_path):
+    output = await _parse(client, data=b"%PDF-bundle")
+    job_id = output["markdown_url"].split("/")[4]
+    image_dir = tmp_path / "outputs" / job_id / "report" / "auto" / "images"
+    (image_dir / "abc123.jpg").write_bytes(b"\xff\xd8jpeg")
+    service.storage.upload_dir(job_id).joinpath("0.pdf").write_bytes(b"%PDF")
+
+    assert output["bundle_url"] == f"/api/v1/jobs/{job_id}/bundle.zip"
+    response = await client.get(output["bundle_url"])
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert sorted(archive.namelist()) == [
+        "report/auto/images/abc123.jpg",
+        "report/auto/report.pdf.md",
+        "report/auto/report.pdf_content_list.json",
+        "report/auto/report.pdf_middle.json",
+    ]
+    assert archive.read("report/auto/images/abc123.jpg") == b"\xff\xd8jpeg"
+
+    image = await client.get(f"/api/v1/jobs/{job_id}/images/abc123.jpg")
+    assert image.status_code == 200
+    assert image.headers["content-type"] == "image/jpeg"
+    assert (await client.get(f"/api/v1/jobs/{job_id}/images/missing.jpg")).status_code == 404
+    assert (await client.get("/api/v1/jobs/unknown/bundle.zip")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_bundle_unpacks_compressed_artifacts(client, compressing_service):
+    output = await _parse(client, data=b"%PDF-bundle-gz")
+
+    response = await client.get(output["bundle_url"])
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert archive.read("report/auto/report.pdf.md").decode().startswith("# report.pdf")
+    assert not [name for name in archive.namelist() if name.endswith(".gz")]
+
+
+def _s3_service(make_service, tmp_path, fake_s3, monkeypatch, presign_seconds):
+    from src.services.artifact_store import S3ArtifactStore
+
+    root = tmp_path / "scratch"
+    store = S3ArtifactStore(root, client=fake_s3, bucket="artifacts", presign_seconds=presign_seconds)
+    service = make_service(
+        storage=StorageManager(base_path=root, ttl_hours=1, store=store),
+        artifact_writer=ArtifactWriter(compression="gzip", min_bytes=0),
+    )
+    monkeypatch.setattr(parse_module, "get_parse_service", lambda: service)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_s3_artifacts_redirect_to_presigned_urls(
+    client, make_service, tmp_path, fake_adapter, fake_s3, monkeypatch
+):
+    fake_adapter.in_memory = True
+    service = _s3_service(make_service, tmp_path, fake_s3, monkeypatch, presign_seconds=300)
+    url = (await _parse(client, data=b"%PDF-presign"))["markdown_url"]
+    service.artifact_writer.flush()
+
+    response = await client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 307
+    assert response.headers["location"].startswith("https://s3.test/artifacts/")
+    assert response.headers["location"].endswith("report.pdf.md.gz?expires=300")
+
+    # A client that cannot take the stored encoding is proxied a decoded copy instead.
+    plain = await client.get(url, headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert plain.text.startswith("# report.pdf")
+
+
+@pytest.mark.asyncio
+async def test_s3_artifacts_and_bundles_are_proxied(client, make_service, tmp_path, fake_adapter, fake_s3, monkeypatch):
+    fake_adapter.in_memory = True
+    service = _s3_service(make_service, tmp_path, fake_s3, monkeypatch, presign_seconds=0)
+    output = await _parse(client, data=b"%PDF-proxy")
+    service.artifact_writer.flush()
+    job_id = output["markdown_url"].split("/")[4]
+    service.storage.store.put(f"{job_id}/report/auto/images/abc123.jpg", b"\xff\xd8jpeg")
+
+    first = await client.get(output["markdown_url"], headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.text.startswith("# report.pdf")
+    cached = await client.get(output["markdown_url"], headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+
+    image = await client.get(f"/api/v1/jobs/{job_id}/images/abc123.jpg")
+    assert image.content == b"\xff\xd8jpeg"
+
+    archive = zipfile.ZipFile(io.BytesIO((await client.get(output["bundle_url"])).content))
+    assert "report/auto/images/abc123.jpg" in archive.namelist()
+    assert archive.read("report/auto/report.pdf.md").decode().startswith("# report.pdf")
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 
@@ -9,3 +11,91 @@ async def test_health_endpoint(client):
     assert body["status"] == "ok"
     assert isinstance(body["mineru_ready"], bool)
     assert body["timestamp"]
+    assert body["office"]["mode"] in {"unoserver", "soffice", "unavailable"}
+
+
+@pytest.mark.asyncio
+async def test_liveness_is_independent_of_engine(client):
+    response = await client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_readiness_follows_engine_state(client, monkeypatch, settings):
+    from types import SimpleNamespace
+
+    from src.api import health as health_module
+    from src.services import engine as engine_module
+
+    engine = engine_module.MineruEngine(settings=settings.model_copy(update={"mineru_warmup": False}))
+    monkeypatch.setattr(health_module, "get_engine", lambda: engine)
+
+    def missing_backends():
+        raise engine_module.MineruUnavailableError("mineru missing")
+
+    monkeypatch.setattr(engine_module, "_import_backends", missing_backends)
+    assert engine.warm_up() is False
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["detail"] == "mineru missing"
+    assert (await client.get("/health")).json()["mineru_ready"] is False
+
+    monkeypatch.setattr(engine_module, "_import_backends", lambda: SimpleNamespace())
+    assert engine.warm_up() is True
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+    assert (await client.get("/health")).json()["mineru_ready"] is True
+
+
+@pytest.mark.asyncio
+async def test_ready_without_preload_once_the_engine_loads(client, monkeypatch, settings):
+    from types import SimpleNamespace
+
+    from src.api import health as health_module
+    from src.services import engine as engine_module
+
+    engine = engine_module.MineruEngine(settings=settings.model_copy(update={"mineru_preload": False}))
+    monkeypatch.setattr(health_module, "get_engine", lambda: engine)
+    assert (await client.get("/health/ready")).status_code == 200
+
+    def missing_backends():
+        raise engine_module.MineruUnavailableError("mineru missing")
+
+    monkeypatch.setattr(engine_module, "_import_backends", missing_backends)
+    with pytest.raises(engine_module.MineruUnavailableError):
+        engine.modules()
+    assert (await client.get("/health/ready")).status_code == 503
+
+    # The first parse that manages to import the backends makes the pod ready.
+    monkeypatch.setattr(engine_module, "_import_backends", lambda: SimpleNamespace())
+    engine.modules()
+    assert engine.ready is True
+    assert (await client.get("/health/ready")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_is_retried_until_ready(monkeypatch, settings):
+    from types import SimpleNamespace
+
+    from src.services import engine as engine_module
+
+    engine = engine_module.MineruEngine(
+        settings=settings.model_copy(
+            update={"mineru_warmup": False, "mineru_warmup_retry_seconds": 0.01, "mineru_warmup_retry_max_seconds": 0.02},
+        ),
+    )
+    outcomes = iter([engine_module.MineruUnavailableError("download failed")] * 2)
+
+    def flaky_backends():
+        failure = next(outcomes, None)
+        if failure is not None:
+            raise failure
+        return SimpleNamespace()
+
+    monkeypatch.setattr(engine_module, "_import_backends", flaky_backends)
+    await asyncio.wait_for(engine.warm_up_until_ready(), timeout=5)
+
+    assert engine.ready is True
+    assert engine.warmup_attempts == 3
+    assert engine.error is None
@@ -0,0 +1,140 @@
+import asyncio
+import io
+from datetime import timedelta
+
+import pytest
+
+from src.api import jobs as jobs_module
+from src.api import parse as parse_module
+from src.services.jobs import JobManager, _utcnow
+
+
+class FakeJobParseService:
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.prepared = 0
+        self.response_modes: list[str] = []
+
+    async def prepare(self, files, params, job_id):
+        self.prepared += 1
+        return [(upload.filename, await upload.read()) for upload in files]
+
+    def discard_inputs(self, job_id):
+        pass
+
+    async def run(self, inputs, params, job_id=None, reject_when_busy=True):
+        self.response_modes.append(params.response_mode)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return (
+            [
+                {
+                    "filename": name,
+                    "markdown": "# parsed",
+                    "content_list_json": {},
+                    "middle_json": {},
+                    "model_output_json": None,
+                    "storage_expiry": "2025-01-01T00:00:00Z",
+                }
+                for name, _ in inputs
+            ],
+            [],
+        )
+
+
+async def _wait_for_status(client, job_id, statuses=("succeeded", "failed")):
+    for _ in range(100):
+        response = await client.get(f"/api/v1/jobs/{job_id}")
+        body = response.json()
+        if body["status"] in statuses:
+            return body
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.mark.asyncio
+async def test_submit_job_returns_id_and_completes(client, monkeypatch):
+    service = FakeJobParseService(delay=0.05)
+    monkeypatch.setattr(parse_module, "get_parse_service", lambda: service)
+    manager = JobManager()
+    monkeypatch.setattr(jobs_module, "get_job_manager", lambda: manager)
+
+    files = {"files": ("job.pdf", io.BytesIO(b"pdf"), "application/pdf")}
+    response = await client.post("/api/v1/jobs", files=files)
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "queued"
+    assert response.headers["Location"] == f"/api/v1/jobs/{body['job_id']}"
+
+    result = await _wait_for_status(client, body["job_id"])
+    assert result["status"] == "succeeded"
+    assert result["outputs"][0]["filename"] == "job.pdf"
+    assert result["request_id"] == body["request_id"]
+    # Job records keep the artifact URLs, not the parsed content.
+    assert service.response_modes == ["reference"]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_reports_detail(client, monkeypatch):
+    monkeypatch.setattr(parse_module, "get_parse_service", lambda: FakeJobParseService(fail=True))
+    manager = JobManager()
+    monkeypatch.setattr(jobs_module, "get_job_manager", lambda: manager)
+
+    files = {"files": ("job.pdf", io.BytesIO(b"pdf"), "application/pdf")}
+    response = await client.post("/api/v1/jobs", files=files)
+    result = await _wait_for_status(client, response.json()["job_id"])
+    assert result["status"] == "failed"
+    assert result["detail"] == "Parse failed"
+
+
+@pytest.mark.asyncio
+async def test_full_job_queue_returns_429(client, monkeypatch, settings):
+    service = FakeJobParseService(delay=1.0)
+    monkeypatch.setattr(parse_module, "get_parse_service", lambda: service)
+    manager = JobManager(settings=settings.model_copy(update={"parse_workers": 1, "job_queue_size": 1}))
+    manager.service_times.extend([3.0, 5.0])
+    monkeypatch.setattr(jobs_module, "get_job_manager", lambda: manager)
+
+    statuses = []
+    for idx in range(3):
+        files = {"files": (f"job-{idx}.pdf", io.BytesIO(b"pdf"), "application/pdf")}
+        response = await client.post("/api/v1/jobs", files=files)
+        statuses.append(response.status_code)
+        if response.status_code == 429:
+            # One queued job plus this one, at the observed 4s per job on one worker.
+            assert response.headers["Retry-After"] == "8"
+        await asyncio.sleep(0)
+    assert statuses == [202, 202, 429]
+    # The rejected upload is refused before it is spooled.
+    assert service.prepared == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_returns_404(client):
+    response = await client.get("/api/v1/jobs/missing")
+    assert response.status_code == 404
+    assert response.json()["request_id"]
+
+
+@pytest.mark.asyncio
+async def test_finished_jobs_are_pruned_by_age_and_count(client, monkeypatch, settings):
+    monkeypatch.setattr(parse_module, "get_parse_service", lambda: FakeJobParseService())
+    manager = JobManager(settings=settings.model_copy(update={"job_max_records": 2}))
+    monkeypatch.setattr(jobs_module, "get_job_manager", lambda: manager)
+
+    job_ids = []
+    for idx in range(3):
+        files = {"files": (f"job-{idx}.pdf", io.BytesIO(b"pdf"), "application/pdf")}
+        job_ids.append((await client.post("/api/v1/jobs", files=files)).json()["job_id"])
+        await _wait_for_status(client, job_ids[-1])
+
+    # Only the newest finished jobs are kept.
+    assert list(manager.jobs) == job_ids[1:]
+    assert (await client.get(f"/api/v1/jobs/{job_ids[0]}")).status_code == 404
+
+    # Expired jobs go on the next lookup, without waiting for another submission.
+    manager.jobs[job_ids[1]].finished_at = _utcnow() - timedelta(hours=settings.output_ttl_hours + 1)
+    assert (await client.get(f"/api/v1/jobs/{job_ids[2]}")).status_code == 200
+    assert list(manager.jobs) == job_ids[2:]
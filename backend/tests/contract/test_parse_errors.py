@@ -19,3 +19,11 @@ async def test_rejects_unsupported_file_type(client):
     assert response.status_code == 400
     body = response.json()
     assert "unsupported" in body["detail"].lower()
+
+
+@pytest.mark.asyncio
+async def test_rejects_unknown_outputs(client):
+    files = {"files": ("doc.pdf", io.BytesIO(b"%PDF"), "application/pdf"), "outputs": (None, "markdown,html")}
+    response = await client.post("/api/v1/parse", files=files)
+    assert response.status_code == 400
+    assert "html" in response.json()["detail"]
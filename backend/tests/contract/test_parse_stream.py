@@ -0,0 +1,82 @@
+import io
+import json
+import time
+
+import pytest
+
+from src.api import parse as parse_module
+from src.services.parse_service import ParseParams
+from src.services.storage import StorageManager
+
+
+@pytest.fixture()
+def service(make_service, tmp_path, fake_adapter, monkeypatch):
+    service = make_service(storage=StorageManager(base_path=tmp_path / "outputs", ttl_hours=1))
+    monkeypatch.setattr(parse_module, "get_parse_service", lambda: service)
+    return service
+
+
+def _files(*names, backend="vlm-http-client"):
+    return [("files", (name, io.BytesIO(f"%PDF-{name}".encode()), "application/pdf")) for name in names] + [
+        ("backend", (None, backend)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_each_file_as_it_finishes(service, fake_adapter, make_input):
+    fake_adapter.delay = 0.2
+    params = ParseParams(backend="vlm-http-client")
+    events = await service.stream([make_input("one.pdf", b"1"), make_input("two.pdf", b"2")], params)
+
+    start = time.perf_counter()
+    arrivals = [(event, time.perf_counter() - start) async for event in events]
+
+    assert [event["event"] for event, _ in arrivals] == ["started", "file", "progress", "file", "progress", "done"]
+    first_file, first_at = arrivals[1]
+    assert first_file["output"]["filename"] == "one.pdf"
+    assert first_at < 0.35 < arrivals[3][1]
+    assert [call["files"] for call in fake_adapter.calls] == [["one.pdf"], ["two.pdf"]]
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_returns_ndjson(client, service):
+    response = await client.post("/api/v1/parse/stream", files=_files("one.pdf", "two.pdf"))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+    assert [event["event"] for event in events] == ["started", "file", "progress", "file", "progress", "done"]
+    assert events[-1]["errors"] == []
+    assert events[-1]["request_id"]
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_failed_files_without_dropping_the_rest(client, service, fake_adapter):
+    fake_adapter.fail_on = {"bad.pdf"}
+    response = await client.post("/api/v1/parse/stream", files=_files("bad.pdf", "good.pdf"))
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+
+    assert [event["output"]["filename"] for event in events if event["event"] == "file"] == ["good.pdf"]
+    assert events[-1]["errors"] == [{"index": 0, "filename": "bad.pdf", "detail": "Parse failed"}]
+
+
+@pytest.mark.asyncio
+async def test_stream_speaks_sse_when_asked(client, service):
+    response = await client.post(
+        "/api/v1/parse/stream",
+        files=_files("a.pdf", backend="pipeline"),
+        headers={"Accept": "text/event-stream"},
+    )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = [block for block in response.text.split("\n\n") if block]
+    assert blocks[0].startswith("event: started\ndata: ")
+    assert blocks[-1].startswith("event: done\n")
+    file_event = json.loads(blocks[1].split("data: ", 1)[1])
+    assert file_event["output"]["markdown"].startswith("# a.pdf")
+
+
+@pytest.mark.asyncio
+async def test_stream_validation_errors_keep_their_status(client, service):
+    response = await client.post("/api/v1/parse/stream", files=[("files", ("notes.txt", io.BytesIO(b"x"), "text/plain"))])
+    assert response.status_code == 400
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from src.services.admission import AdmissionController, BackendLimiter
+from src.services.parse_service import ParseParams
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_then_rejects_with_retry_after():
+    limiter = BackendLimiter("pipeline", max_concurrent=1, max_queued=1)
+    limiter.service_times.append(4.0)
+
+    first = await limiter.acquire()
+    queued = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(HTTPException) as excinfo:
+        await limiter.acquire()
+
+    assert excinfo.value.status_code == 429
+    assert excinfo.value.headers["Retry-After"] == "8"
+    first.release()
+    second = await queued
+    assert limiter.snapshot()["active"] == 1
+    second.release()
+    snapshot = limiter.snapshot()
+    assert (snapshot["active"], snapshot["queued"], snapshot["rejected_total"]) == (0, 0, 1)
+    assert snapshot["wait_avg_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    limiter = BackendLimiter("pipeline", max_concurrent=1, max_queued=1)
+    held = await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0)
+
+    assert limiter.queued == 0
+    held.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_unbounded_acquire_waits_instead_of_rejecting():
+    limiter = BackendLimiter("pipeline", max_concurrent=1, max_queued=0)
+    held = await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire(bounded=False))
+    await asyncio.sleep(0)
+    held.release()
+    (await waiter).release()
+    assert limiter.rejected == 0
+
+
+@pytest.mark.asyncio
+async def test_parse_service_rejects_when_backend_is_saturated(make_service, settings, fake_adapter, make_input):
+    fake_adapter.delay = 0.2
+    limited = {"max_concurrent_parses": 1, "max_queued_parses": 0, "backend_concurrency_limits": {"vlm-http-client": 4}}
+    admission = AdmissionController(settings=settings.model_copy(update=limited))
+    service = make_service(admission=admission, **limited)
+    params = ParseParams(backend="vlm-transformers")
+
+    results = await asyncio.gather(
+        service.run([make_input("a.pdf", b"a")], params),
+        service.run([make_input("b.pdf", b"b")], params),
+        return_exceptions=True,
+    )
+
+    assert results[0][0][0]["filename"] == "a.pdf"
+    assert results[1].status_code == 429
+    assert int(results[1].headers["Retry-After"]) >= 1
+    assert admission.limiter("vlm-http-client").max_concurrent == 4
+    assert admission.snapshot()["vlm-transformers"]["rejected_total"] == 1
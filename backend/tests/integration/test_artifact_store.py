@@ -0,0 +1,157 @@
+import asyncio
+import pickle
+
+import pytest
+
+from src.services.artifact_store import ArtifactStore, LocalArtifactStore, S3ArtifactStore, StoreDataWriter
+from src.services.artifact_writer import ArtifactWriter
+from src.services.mineru_adapter import MineruAdapter
+from src.services.parse_service import ParseParams
+from src.services.storage import StorageManager
+from tests.conftest import FakeMineruEngine
+
+
+class LocalWriter:
+    def __init__(self, directory) -> None:
+        self.directory = directory
+
+
+def _s3_storage(tmp_path, client, **options):
+    store = S3ArtifactStore(tmp_path, client=client, bucket="artifacts", prefix="mineru", **options)
+    return StorageManager(base_path=tmp_path, ttl_hours=1, store=store)
+
+
+def test_large_uploads_stream_as_multipart(tmp_path, fake_s3):
+    store = _s3_storage(tmp_path, fake_s3).store
+    store.part_size = 4
+
+    store.upload("job/doc/auto/doc.md", iter([b"abc", b"defgh", b"ij"]))
+    store.put("job/doc/auto/small.json.gz", b"xy")
+
+    assert fake_s3.objects["mineru/job/doc/auto/doc.md"]["Body"] == b"abcdefghij"
+    assert fake_s3.calls.count("upload_part") == 3
+    assert fake_s3.objects["mineru/job/doc/auto/doc.md"]["ContentType"] == "text/markdown"
+    small = fake_s3.objects["mineru/job/doc/auto/small.json.gz"]
+    assert (small["ContentType"], small["ContentEncoding"]) == ("application/json", "gzip")
+
+
+def test_failed_multipart_upload_is_aborted(tmp_path, fake_s3):
+    store = _s3_storage(tmp_path, fake_s3).store
+    store.part_size = 2
+
+    def chunks():
+        yield b"abcd"
+        raise RuntimeError("client went away")
+
+    with pytest.raises(RuntimeError):
+        store.upload("job/doc.md", chunks())
+
+    assert "abort_multipart_upload" in fake_s3.calls
+    assert fake_s3.uploads == {}
+    assert fake_s3.objects == {}
+
+
+def test_listing_and_deleting_a_job_follow_pagination(tmp_path, fake_s3):
+    storage = _s3_storage(tmp_path, fake_s3)
+    for name in ("a.md", "b.md", "images/c.jpg", "_uploads/0.pdf", ".d.md.partial"):
+        storage.store.put(f"job1/doc/auto/{name}" if name[0] != "_" else f"job1/{name}", b"data")
+    storage.store.put("job2/doc.md", b"other")
+
+    keys = [item.key for item in storage.job_objects("job1")]
+    assert keys == ["job1/doc/auto/a.md", "job1/doc/auto/b.md", "job1/doc/auto/images/c.jpg"]
+    assert dict(storage.iter_jobs()).keys() == {"job1", "job2"}
+    assert storage.job_size("job1") == 20
+
+    storage.remove_job("job1")
+    assert list(fake_s3.objects) == ["mineru/job2/doc.md"]
+
+
+def test_data_writer_sends_images_to_the_store(tmp_path, fake_s3):
+    storage = _s3_storage(tmp_path, fake_s3)
+    writer = StoreDataWriter(storage.store, storage.artifact_key(tmp_path / "job" / "doc" / "auto" / "images"))
+
+    writer.write("p1.jpg", b"\xff\xd8")
+
+    assert fake_s3.objects["mineru/job/doc/auto/images/p1.jpg"]["Body"] == b"\xff\xd8"
+    assert not (tmp_path / "job" / "doc" / "auto" / "images" / "p1.jpg").exists()
+
+
+def test_adapter_writes_page_images_through_the_storage_it_was_given(tmp_path, fake_s3):
+    storage = _s3_storage(tmp_path, fake_s3)
+    images = tmp_path / "job" / "doc" / "auto" / "images"
+
+    writer = MineruAdapter(output_dir=tmp_path / "job", engine=FakeMineruEngine(), storage=storage)._image_writer(
+        LocalWriter, images
+    )
+    writer.write("p1.jpg", b"\xff\xd8")
+    assert fake_s3.objects["mineru/job/doc/auto/images/p1.jpg"]["Body"] == b"\xff\xd8"
+
+    # Without a storage the images stay in the scratch directory.
+    adapter = MineruAdapter(output_dir=tmp_path / "job", engine=FakeMineruEngine())
+    assert isinstance(adapter._image_writer(LocalWriter, images), LocalWriter)
+
+
+def test_s3_store_reconnects_after_pickling(tmp_path, fake_s3, monkeypatch):
+    from src.services import artifact_store as artifact_store_module
+
+    monkeypatch.setattr(artifact_store_module, "get_s3_client", lambda: fake_s3)
+    storage = pickle.loads(pickle.dumps(_s3_storage(tmp_path, object())))
+
+    storage.store.put("job/doc.md", b"# doc")
+    assert fake_s3.objects["mineru/job/doc.md"]["Body"] == b"# doc"
+
+
+def test_local_store_keeps_artifacts_in_the_job_directory(tmp_path):
+    storage = StorageManager(base_path=tmp_path, ttl_hours=1)
+    assert isinstance(storage.store, LocalArtifactStore)
+
+    storage.put_artifact(tmp_path / "job" / "doc.md", b"# doc")
+
+    assert (tmp_path / "job" / "doc.md").read_bytes() == b"# doc"
+    assert storage.read_artifact(tmp_path / "job" / "doc.md") == b"# doc"
+
+
+@pytest.mark.asyncio
+async def test_parse_results_are_written_to_and_served_from_s3(
+    make_service, tmp_path, fake_adapter, fake_s3, make_input
+):
+    from src.services.result_cache import ParseResultCache
+
+    fake_adapter.in_memory = True
+    storage = _s3_storage(tmp_path / "scratch", fake_s3)
+    writer = ArtifactWriter(compression="gzip", min_bytes=0)
+    service = make_service(
+        storage=storage,
+        cache=ParseResultCache(max_entries=8, ttl_seconds=60),
+        artifact_writer=writer,
+    )
+    document = make_input("a.pdf", b"%PDF-s3")
+
+    await service.run([document], ParseParams(), job_id="job1")
+    writer.flush(timeout=5)
+    for _ in range(3):
+        # Let the loop run the write-completion callbacks.
+        await asyncio.sleep(0)
+
+    assert "mineru/job1/a/auto/a.pdf.md.gz" in fake_s3.objects
+    assert not (tmp_path / "scratch" / "job1" / "a" / "auto" / "a.pdf.md").exists()
+
+    # A repeat is a cache hit whose inline content is read back from the bucket.
+    outputs, _ = await service.run([make_input("a.pdf", b"%PDF-s3")], ParseParams(), job_id="job2")
+    assert len(fake_adapter.calls) == 1
+    assert outputs[0]["markdown"].startswith("# a.pdf")
+    assert outputs[0]["markdown_url"] == "/api/v1/jobs/job1/artifacts/a/auto/a.pdf.md"
+
+    # Once the job is gone from the bucket the cache entry no longer counts.
+    storage.remove_job("job1")
+    await service.run([make_input("a.pdf", b"%PDF-s3")], ParseParams(), job_id="job3")
+    assert len(fake_adapter.calls) == 2
+
+
+def test_incomplete_store_fails_when_it_is_created(tmp_path):
+    class UploadOnly(ArtifactStore):
+        def upload(self, key, chunks):
+            pass
+
+    with pytest.raises(TypeError):
+        UploadOnly(tmp_path)
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from src.services.artifact_writer import ArtifactWriter
+from src.services.parse_service import ParseParams
+from src.services.result_cache import ParseResultCache, document_digest
+
+
+class GatedWriter(ArtifactWriter):
+    """Holds every write until the test opens the gate."""
+
+    def __init__(self) -> None:
+        super().__init__(max_workers=1)
+        self.gate = threading.Event()
+
+    def _write_all(self, outputs, storage):
+        self.gate.wait(5)
+        super()._write_all(outputs, storage)
+
+
+async def _drain():
+    # Let the loop run the completion callbacks scheduled by the writer thread.
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_response_is_built_before_artifacts_are_written(make_service, tmp_path, fake_adapter, make_input):
+    fake_adapter.in_memory = True
+    writer = GatedWriter()
+    cache = ParseResultCache(max_entries=8, ttl_seconds=60)
+    service = make_service(artifact_writer=writer, cache=cache, artifact_write_mode="async")
+
+    outputs, _ = await service.run([make_input("a.pdf", b"abc")], ParseParams(), job_id="job-1")
+
+    assert outputs[0]["markdown"] == "# a.pdf (3 bytes)"
+    assert outputs[0]["content_list_json"][0]["text"] == "hello"
+    markdown_path = tmp_path / "job-1" / "a" / "auto" / "a.pdf.md"
+    assert not markdown_path.exists()
+    assert writer.snapshot()["pending"] == 1
+    assert writer.pending(markdown_path) is not None
+
+    writer.gate.set()
+    writer.flush()
+    assert writer.pending(markdown_path) is None
+    assert markdown_path.read_text(encoding="utf-8") == "# a.pdf (3 bytes)"
+    middle = json.loads((markdown_path.parent / "a.pdf_middle.json").read_text(encoding="utf-8"))
+    assert middle == {"pdf_info": []}
+    assert writer.snapshot() == {"pending": 0, "written": 1, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_cache_drops_in_memory_results_once_written(make_service, fake_adapter, make_input):
+    fake_adapter.in_memory = True
+    writer = GatedWriter()
+    cache = ParseResultCache(max_entries=8, ttl_seconds=60)
+    service = make_service(artifact_writer=writer, cache=cache, artifact_write_mode="async")
+    params = ParseParams()
+    key = document_digest(make_input("a.pdf", b"abc").sha256, params)
+
+    await service.run([make_input("a.pdf", b"abc")], params)
+    # A repeat upload while the write is still pending is served from memory.
+    again, _ = await service.run([make_input("b.pdf", b"abc")], params)
+    assert again[0]["markdown"] == "# a.pdf (3 bytes)"
+    assert cache.get(key, service.storage.artifact_exists).output.in_memory
+
+    writer.gate.set()
+    writer.flush()
+    await _drain()
+    entry = cache.get(key, service.storage.artifact_exists)
+    assert not entry.output.in_memory
+    assert entry.output.markdown.exists()
+    assert len(fake_adapter.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_mode_waits_for_artifacts(make_service, tmp_path, fake_adapter, make_input):
+    fake_adapter.in_memory = True
+    writer = ArtifactWriter()
+    service = make_service(artifact_writer=writer, artifact_write_mode="sync")
+
+    await service.run([make_input("a.pdf", b"abc")], ParseParams(), job_id="job-2")
+
+    assert (tmp_path / "job-2" / "a" / "auto" / "a.pdf_content_list.json").exists()
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from src.services.batcher import PipelineBatcher
+from src.services.parse_service import ParseParams
+
+
+@pytest.mark.asyncio
+async def test_concurrent_pipeline_requests_share_one_call(make_service, fake_adapter, make_input):
+    service = make_service(batcher=PipelineBatcher(window_ms=50, max_pages=100))
+
+    results = await asyncio.gather(
+        service.run([make_input("a.pdf", b"doc-a")], ParseParams(lang="en"), job_id="job-a"),
+        service.run([make_input("b.pdf", b"doc-b")], ParseParams(lang="ch"), job_id="job-b"),
+    )
+
+    assert len(fake_adapter.calls) == 1
+    call = fake_adapter.calls[0]
+    # Page counts are taken concurrently, so the documents may join the batch in either order.
+    members = sorted(zip(call["files"], call["lang"], [path.name for path in call["output_dirs"]]))
+    assert members == [("a.pdf", "en", "job-a"), ("b.pdf", "ch", "job-b")]
+    assert [outputs[0]["markdown"] for outputs, _ in results] == ["# a.pdf (5 bytes)", "# b.pdf (5 bytes)"]
+
+
+@pytest.mark.asyncio
+async def test_incompatible_options_and_page_budget_split_batches(make_service, fake_adapter, make_input):
+    service = make_service(batcher=PipelineBatcher(window_ms=1000, max_pages=2))
+
+    await asyncio.wait_for(
+        asyncio.gather(
+            service.run([make_input("a.pdf", b"a"), make_input("b.pdf", b"b")], ParseParams()),
+            service.run([make_input("c.pdf", b"c")], ParseParams(table_enable=False)),
+            service.run([make_input("d.pdf", b"d")], ParseParams(table_enable=False)),
+        ),
+        timeout=0.5,
+    )
+
+    assert sorted(call["files"] for call in fake_adapter.calls) == [["a.pdf", "b.pdf"], ["c.pdf", "d.pdf"]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_retries_documents_individually(make_service, fake_adapter, make_input, monkeypatch):
+    original = fake_adapter.parse_from_bytes
+
+    def flaky(self, files, **kwargs):
+        if any(name == "bad.pdf" for name, _ in files):
+            raise RuntimeError("corrupt document")
+        return original(self, files, **kwargs)
+
+    monkeypatch.setattr(fake_adapter, "parse_from_bytes", flaky)
+    service = make_service(batcher=PipelineBatcher(window_ms=50, max_pages=100))
+
+    good, bad = await asyncio.gather(
+        service.run([make_input("good.pdf", b"good")], ParseParams()),
+        service.run([make_input("bad.pdf", b"bad")], ParseParams()),
+        return_exceptions=True,
+    )
+
+    assert good[0][0]["filename"] == "good.pdf"
+    assert bad.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_known_page_counts_skip_the_pdf_open(tmp_path, fake_adapter, make_input, monkeypatch):
+    from src.services import batcher as batcher_module
+
+    counted = []
+    monkeypatch.setattr(batcher_module, "count_pdf_pages", lambda source: counted.append(source) or 1)
+    batcher = PipelineBatcher(window_ms=10, max_pages=100)
+    first, second = make_input("a.pdf", b"a"), make_input("b.pdf", b"b")
+
+    outputs = await batcher.submit(
+        [(first.name, first.path), (second.name, second.path)],
+        ParseParams(),
+        output_dir=tmp_path / "out",
+        pages=[3, None],
+    )
+
+    assert len(outputs) == 2
+    assert fake_adapter.calls[0]["files"] == ["a.pdf", "b.pdf"]
+    assert counted == [second.path]
+    await asyncio.sleep(0)
+    assert batcher.snapshot()["running"] == 0
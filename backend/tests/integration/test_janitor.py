@@ -0,0 +1,99 @@
+import os
+import time
+
+import pytest
+
+from src.services.artifact_writer import ArtifactWriter
+from src.services.janitor import JobIndex, StorageJanitor
+from src.services.parse_service import ParseParams
+from src.services.storage import StorageManager
+
+
+def _janitor(settings, tmp_path, ttl_hours=1, **overrides):
+    storage = StorageManager(base_path=tmp_path / "outputs", ttl_hours=ttl_hours)
+    index = JobIndex(tmp_path / "index.sqlite3")
+    return StorageJanitor(storage, index, settings=settings.model_copy(update=overrides))
+
+
+def _job(janitor: StorageJanitor, job_id: str, size: int) -> None:
+    (janitor.storage.job_dir(job_id) / "doc.md").write_bytes(b"x" * size)
+
+
+def test_sweep_expires_jobs_past_ttl(settings, tmp_path):
+    janitor = _janitor(settings, tmp_path)
+    _job(janitor, "old", 10)
+    _job(janitor, "new", 10)
+    janitor.track("old")
+    janitor.sweep()
+    janitor.track("new")
+    janitor.sweep()
+
+    result = janitor.sweep(now=time.time() + 3600 + 1)
+
+    assert result["expired"] == 2
+    assert not (janitor.storage.base_path / "old").exists()
+    assert janitor.snapshot()["jobs"] == 0
+
+
+def test_sweep_evicts_least_recently_used_over_quota(settings, tmp_path):
+    janitor = _janitor(settings, tmp_path, storage_quota_bytes=250, storage_quota_low_watermark=0.5)
+    janitor.sweep()
+    for job_id in ("a", "b", "c"):
+        _job(janitor, job_id, 100)
+        janitor.track(job_id)
+        time.sleep(0.01)
+    janitor.touch("a")
+
+    result = janitor.sweep()
+
+    # 300 bytes > 250: drop b then c (least recently used) until at most 125 bytes remain.
+    assert result["evicted"] == 2
+    assert sorted(os.listdir(janitor.storage.base_path)) == ["a"]
+    assert janitor.snapshot()["bytes"] == 100
+
+
+def test_reports_are_only_recorded_by_the_sweep(settings, tmp_path):
+    janitor = _janitor(settings, tmp_path)
+    _job(janitor, "job", 42)
+    janitor.sweep()
+    janitor.track("job")
+
+    assert janitor.index.totals() == (1, 42)  # adopted by the first sweep's reconcile
+    _job(janitor, "job", 84)
+    janitor.sweep()
+    assert janitor.index.totals() == (1, 84)
+
+
+def test_index_survives_restart_and_adopts_unknown_directories(settings, tmp_path):
+    first = _janitor(settings, tmp_path)
+    _job(first, "tracked", 5)
+    first.track("tracked")
+    first.sweep()
+    first.index.close()
+    _job(first, "orphan", 7)
+
+    second = _janitor(settings, tmp_path)
+    second.sweep()
+
+    assert second.index.job_ids() == {"tracked", "orphan"}
+    assert second.snapshot()["bytes"] == 12
+
+
+@pytest.mark.asyncio
+async def test_parse_tracks_job_without_scanning_storage(make_service, settings, tmp_path, fake_adapter, make_input):
+    janitor = _janitor(settings, tmp_path)
+    writer = ArtifactWriter()
+    service = make_service(
+        storage=janitor.storage,
+        cache=None,
+        artifact_writer=writer,
+        janitor=janitor,
+    )
+
+    await service.run([make_input("a.pdf", b"%PDF-1.4 a")], ParseParams(), job_id="job1")
+    writer.flush(timeout=5)
+
+    assert janitor.index.totals() == (0, 0)
+    janitor.sweep()
+    count, size = janitor.index.totals()
+    assert count == 1 and size > 0
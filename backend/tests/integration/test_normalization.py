@@ -0,0 +1,191 @@
+import asyncio
+import io
+import time
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+
+from src.observability.metrics import metrics
+from src.services.image_ingest import images_to_pdf, prepare_image
+from src.services.office_converter import OfficeConverter
+from src.services.parse_service import ParseParams
+from src.services.worker_pool import ParseWorkerPool
+
+
+def _png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 16), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _image_bytes(size, fmt, mode="RGB", color="white") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, color).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _rendered_sizes(pdf_bytes: bytes, dpi: int = 200) -> list[tuple[int, int]]:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    sizes = [pdf[idx].render(scale=dpi / 72).to_pil().size for idx in range(len(pdf))]
+    pdf.close()
+    return sizes
+
+
+class SleepyInstance:
+    def __init__(self, index, delay):
+        self.index = index
+        self.delay = delay
+        self.persistent = True
+        self.conversions = 0
+        self.restarts = 0
+
+    def start(self):
+        pass
+
+    def healthy(self):
+        return True
+
+    def restart(self):
+        self.restarts += 1
+
+    def stop(self):
+        pass
+
+    def convert(self, source, target, timeout):
+        time.sleep(self.delay)
+        target.write_bytes(b"%PDF-converted")
+        self.conversions += 1
+
+
+def _sleepy_office(service, delay):
+    return OfficeConverter(service.settings, instance_factory=lambda index: SleepyInstance(index, delay))
+
+
+@pytest.mark.asyncio
+async def test_conversions_run_in_parallel_off_the_event_loop(make_service):
+    service = make_service(normalize_pool=ParseWorkerPool(max_workers=4), office_pool_size=3)
+    service.office_converter = _sleepy_office(service, delay=0.2)
+    uploads = [UploadFile(file=io.BytesIO(f"doc-{idx}".encode()), filename=f"report-{idx}.docx") for idx in range(3)]
+    uploads.append(UploadFile(file=io.BytesIO(_png_bytes()), filename="scan.png"))
+
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    beat = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    normalized = await service.prepare(uploads, ParseParams(), job_id="job-1")
+    elapsed = time.perf_counter() - start
+    beat.cancel()
+
+    assert [item.name for item in normalized] == ["report-0.pdf", "report-1.pdf", "report-2.pdf", "scan.pdf"]
+    assert normalized[3].read_bytes().startswith(b"%PDF")
+    assert elapsed < 0.5
+    assert ticks >= 10
+    assert metrics.snapshot()["stages"]["convert_doc"]["count"] >= 3
+
+
+@pytest.mark.asyncio
+async def test_slow_conversion_times_out(make_service, tmp_path):
+    service = make_service(conversion_timeout_seconds=0.05)
+    service.office_converter = _sleepy_office(service, delay=0.3)
+    upload = UploadFile(file=io.BytesIO(b"doc"), filename="slow.docx")
+
+    with pytest.raises(HTTPException) as excinfo:
+        await service.prepare([upload], ParseParams(), job_id="job-2")
+
+    assert excinfo.value.status_code == 504
+    assert not (tmp_path / "job-2" / "_uploads").exists()
+
+
+@pytest.mark.asyncio
+async def test_timed_out_image_conversion_frees_its_slot(make_service, tmp_path, monkeypatch):
+    service = make_service(normalize_pool=ParseWorkerPool(max_workers=1), conversion_timeout_seconds=0.1)
+    original = service._images_to_pdf
+    monkeypatch.setattr(service, "_images_to_pdf", lambda images: time.sleep(0.3) or original(images))
+    upload = UploadFile(file=io.BytesIO(_png_bytes()), filename="slow.png")
+
+    with pytest.raises(HTTPException) as excinfo:
+        await service.prepare([upload], ParseParams(), job_id="job-3")
+    assert excinfo.value.status_code == 504
+
+    # The abandoned thread finishes, gives its slot back and writes nothing.
+    for _ in range(50):
+        if service.normalize_pool.snapshot()["busy"] == 0:
+            break
+        await asyncio.sleep(0.02)
+    assert service.normalize_pool.snapshot() == {"mode": "thread", "size": 1, "busy": 0, "queued": 0}
+    assert list(tmp_path.glob("job-3/**/*.pdf")) == []
+
+    monkeypatch.setattr(service, "_images_to_pdf", original)
+    upload = UploadFile(file=io.BytesIO(_png_bytes()), filename="next.png")
+    (normalized,) = await service.prepare([upload], ParseParams(), job_id="job-4")
+    assert normalized.name == "next.pdf"
+
+
+@pytest.mark.asyncio
+async def test_oversized_image_is_refused_before_decoding(make_service, monkeypatch):
+    from PIL import ImageFile
+
+    service = make_service(image_max_pixels=32 * 16 - 1)
+    monkeypatch.setattr(ImageFile.ImageFile, "load", lambda self: pytest.fail("image was decoded"))
+    upload = UploadFile(file=io.BytesIO(_png_bytes()), filename="huge.png")
+
+    with pytest.raises(HTTPException) as excinfo:
+        await service.prepare([upload], ParseParams(), job_id="job-5")
+
+    assert excinfo.value.status_code == 413
+
+
+def test_jpeg_is_embedded_without_reencoding():
+    jpeg = _image_bytes((120, 90), "JPEG", color="gray")
+
+    page = prepare_image(jpeg, max_side=3500)
+    pdf_bytes = images_to_pdf([page])
+
+    assert page.jpeg == jpeg
+    assert jpeg in pdf_bytes
+    assert _rendered_sizes(pdf_bytes) == [(120, 90)]
+
+
+def test_oversized_and_transparent_images_are_normalized():
+    page = prepare_image(_image_bytes((800, 400), "PNG"), max_side=200)
+    assert (page.width, page.height) == (200, 100)
+    assert _rendered_sizes(images_to_pdf([page])) == [(200, 100)]
+
+    transparent = prepare_image(_image_bytes((10, 10), "PNG", mode="RGBA", color=(0, 0, 0, 0)), max_side=200)
+    assert transparent.bitmap.mode == "RGB"
+    assert transparent.bitmap.getpixel((5, 5)) == (255, 255, 255)
+
+
+@pytest.mark.asyncio
+async def test_pack_images_builds_one_document(make_service):
+    service = make_service(normalize_pool=ParseWorkerPool(max_workers=4))
+    uploads = [
+        UploadFile(file=io.BytesIO(_image_bytes((60, 80), "JPEG")), filename="page-1.jpg"),
+        UploadFile(file=io.BytesIO(b"%PDF-1.4 report"), filename="report.pdf"),
+        UploadFile(file=io.BytesIO(_image_bytes((80, 60), "PNG")), filename="page-2.png"),
+    ]
+
+    normalized = await service.prepare(uploads, ParseParams(pack_images=True), job_id="job-3")
+
+    assert [item.name for item in normalized] == ["page-1.pdf", "report.pdf"]
+    assert _rendered_sizes(normalized[0].read_bytes()) == [(60, 80), (80, 60)]
+
+
+@pytest.mark.asyncio
+async def test_undecodable_image_is_rejected(make_service):
+    service = make_service(normalize_pool=ParseWorkerPool(max_workers=4))
+    upload = UploadFile(file=io.BytesIO(b"not an image"), filename="scan.png")
+
+    with pytest.raises(HTTPException) as excinfo:
+        await service.prepare([upload], ParseParams(), job_id="job-4")
+
+    assert excinfo.value.status_code == 400
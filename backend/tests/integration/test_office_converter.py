@@ -0,0 +1,162 @@
+import threading
+import time
+
+import pytest
+
+from src.services.office_converter import OfficeConversionError, OfficeConversionTimeout, OfficeConverter
+
+
+class FakeInstance:
+    def __init__(self, index, delay=0.0, hang_once=False):
+        self.index = index
+        self.delay = delay
+        self.hang_once = hang_once
+        self.persistent = True
+        self.alive = False
+        self.conversions = 0
+        self.restarts = 0
+
+    def start(self):
+        self.alive = True
+
+    def healthy(self):
+        return self.alive
+
+    def restart(self):
+        self.restarts += 1
+        self.start()
+
+    def stop(self):
+        self.alive = False
+
+    def convert(self, source, target, timeout):
+        if self.hang_once:
+            self.hang_once = False
+            raise OfficeConversionTimeout(f"Office converter {self.index} timed out")
+        time.sleep(self.delay)
+        target.write_bytes(b"%PDF-" + source.read_bytes())
+        self.conversions += 1
+
+
+def _converter(settings, tmp_path, instance_kwargs=None, **overrides):
+    settings = settings.model_copy(update={"office_cache_path": str(tmp_path / "cache"), **overrides})
+    instances = []
+
+    def factory(index):
+        instances.append(FakeInstance(index, **(instance_kwargs or {})))
+        return instances[-1]
+
+    return OfficeConverter(settings, instance_factory=factory), instances
+
+
+def _source(tmp_path, name, data=b"docx"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+def test_repeated_documents_are_served_from_the_cache(settings, tmp_path):
+    converter, instances = _converter(settings, tmp_path, office_pool_size=1)
+    source = _source(tmp_path, "a.docx")
+
+    converter.convert(source, "digest-a", tmp_path / "first.pdf", timeout=5)
+    converter.convert(source, "digest-a", tmp_path / "second.pdf", timeout=5)
+
+    assert (tmp_path / "second.pdf").read_bytes() == b"%PDF-docx"
+    assert instances[0].conversions == 1
+    assert converter.snapshot()["cache"] == {"entries": 1, "hits": 1, "misses": 1, "expired_total": 0}
+
+
+def test_cache_keeps_only_the_most_recent_entries(settings, tmp_path):
+    converter, _ = _converter(settings, tmp_path, office_pool_size=1, office_cache_entries=2)
+    for idx in range(3):
+        converter.convert(_source(tmp_path, f"{idx}.docx"), f"digest-{idx}", tmp_path / f"{idx}.pdf", timeout=5)
+        time.sleep(0.01)
+
+    assert sorted(path.name for path in (tmp_path / "cache").glob("*.pdf")) == ["digest-1.pdf", "digest-2.pdf"]
+
+
+def test_cached_conversions_expire_with_the_output_ttl(settings, tmp_path):
+    converter, _ = _converter(settings, tmp_path, office_pool_size=1)
+    converter.convert(_source(tmp_path, "a.docx"), "digest-a", tmp_path / "a.pdf", timeout=5)
+
+    assert converter.cache.expire(older_than=time.time() - 3600) == 0
+    assert converter.cache.expire(older_than=time.time() + 1) == 1
+    assert list((tmp_path / "cache").glob("*.pdf")) == []
+    assert converter.snapshot()["cache"]["entries"] == 0
+
+
+def test_hung_instance_is_restarted_and_reused(settings, tmp_path):
+    converter, _ = _converter(settings, tmp_path, instance_kwargs={"hang_once": True}, office_pool_size=1)
+    source = _source(tmp_path, "a.docx")
+
+    with pytest.raises(OfficeConversionTimeout):
+        converter.convert(source, "digest-a", tmp_path / "a.pdf", timeout=5)
+    converter.convert(source, "digest-a", tmp_path / "a.pdf", timeout=5)
+
+    snapshot = converter.snapshot()
+    assert snapshot["instances"] == 1
+    assert snapshot["restarts"] == 1
+    assert snapshot["conversions"] == 1
+    assert snapshot["idle"] == 1
+
+
+def test_concurrent_conversions_use_separate_instances(settings, tmp_path):
+    converter, _ = _converter(settings, tmp_path, instance_kwargs={"delay": 0.2}, office_pool_size=3)
+    converter.start()
+    threads = [
+        threading.Thread(
+            target=converter.convert,
+            args=(_source(tmp_path, f"{idx}.docx"), f"digest-{idx}", tmp_path / f"{idx}.pdf", 5),
+        )
+        for idx in range(3)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert time.perf_counter() - start < 0.5
+    assert converter.snapshot()["instances"] == 3
+    assert all((tmp_path / f"{idx}.pdf").exists() for idx in range(3))
+
+
+def test_missing_libreoffice_is_reported(settings, tmp_path):
+    converter = OfficeConverter(settings.model_copy(update={"office_cache_path": str(tmp_path / "cache")}))
+    converter.soffice_bin = None
+
+    with pytest.raises(OfficeConversionError):
+        converter.convert(_source(tmp_path, "a.docx"), "digest-a", tmp_path / "a.pdf", timeout=5)
+
+
+def test_instance_taken_by_another_caller_times_out_instead_of_blocking(settings, tmp_path):
+    converter, _ = _converter(settings, tmp_path, office_pool_size=1)
+    grow = converter._grow
+    taken = []
+
+    def grow_and_lose_the_race():
+        grown = grow()
+        if grown:
+            # Another caller's get_nowait() picks up the new instance first.
+            taken.append(converter._idle.get_nowait())
+        return grown
+
+    converter._grow = grow_and_lose_the_race
+    start = time.perf_counter()
+    with pytest.raises(OfficeConversionTimeout):
+        converter.convert(_source(tmp_path, "a.docx"), "digest-a", tmp_path / "a.pdf", timeout=0.2)
+    assert time.perf_counter() - start < 1
+    assert len(taken) == 1
+
+
+def test_snapshot_reports_the_conversion_mode(settings, tmp_path):
+    converter, _ = _converter(settings, tmp_path, office_pool_size=1)
+    converter.start()
+    assert converter.snapshot()["mode"] == "unoserver"
+
+    plain = OfficeConverter(settings.model_copy(update={"office_cache_path": str(tmp_path / "plain")}))
+    plain.soffice_bin, plain.unoserver_bin = "/usr/bin/soffice", None
+    assert plain.snapshot()["mode"] == "soffice"
+    plain.soffice_bin = None
+    assert plain.snapshot()["mode"] == "unavailable"
@@ -0,0 +1,89 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.validators import validate_outputs
+from src.services.mineru_adapter import MineruAdapter
+from src.services.parse_service import ParseParams
+
+
+class FakeEngine:
+    """Miner-U stand-in that records which post-processing steps were run."""
+
+    def __init__(self) -> None:
+        self.made: list[str] = []
+
+    def modules(self):
+        def prepare_env(output_dir, filename, method):
+            image_dir = Path(output_dir) / filename / method / "images"
+            image_dir.mkdir(parents=True, exist_ok=True)
+            return str(image_dir), str(image_dir.parent)
+
+        def union_make(pdf_info, mode, image_dir):
+            self.made.append(mode)
+            return "# md" if mode == "md" else [{"type": "text"}]
+
+        return SimpleNamespace(
+            prepare_env=prepare_env,
+            convert_pdf_bytes_to_bytes_by_pypdfium2=lambda data, start, end: data,
+            pipeline_doc_analyze=lambda pdfs, langs, **kwargs: (
+                [[{"layout": idx}] for idx in range(len(pdfs))],
+                [[] for _ in pdfs],
+                [None for _ in pdfs],
+                langs,
+                [False for _ in pdfs],
+            ),
+            pipeline_result_to_middle_json=lambda *args: {"pdf_info": [{"page_idx": 0}]},
+            pipeline_union_make=union_make,
+            FileBasedDataWriter=lambda path: SimpleNamespace(path=path),
+            MakeMode=SimpleNamespace(MM_MD="md", CONTENT_LIST="content_list"),
+            vlm_doc_analyze=None,
+            vlm_union_make=union_make,
+        )
+
+
+def test_adapter_skips_unrequested_artifacts(tmp_path):
+    engine = FakeEngine()
+    adapter = MineruAdapter(output_dir=tmp_path, engine=engine)
+
+    (output,) = adapter.parse_from_bytes([("a", b"%PDF")], outputs=("markdown",))
+
+    assert engine.made == ["md"]
+    assert output.markdown_text == "# md"
+    assert output.content_list is None and output.content_list_data is None
+    assert output.middle_json is None and output.middle_json_data is None
+    assert output.model_output is None and output.model_output_data is None
+
+
+def test_adapter_returns_every_artifact_by_default(tmp_path):
+    engine = FakeEngine()
+    (output,) = MineruAdapter(output_dir=tmp_path, engine=engine).parse_from_bytes([("a", b"%PDF")])
+
+    assert engine.made == ["md", "content_list"]
+    assert output.middle_json_data == {"pdf_info": [{"page_idx": 0}]}
+    assert output.model_output_data == [{"layout": 0}]
+
+
+@pytest.mark.asyncio
+async def test_service_passes_outputs_through_and_keys_cache_on_them(make_service, fake_adapter, make_input):
+    service = make_service()
+
+    markdown_only, _ = await service.run([make_input("a.pdf", b"doc")], ParseParams(outputs=("markdown",)))
+    everything, _ = await service.run([make_input("a.pdf", b"doc")], ParseParams())
+
+    assert fake_adapter.calls[0]["outputs"] == ("markdown",)
+    assert markdown_only[0]["markdown"]
+    assert markdown_only[0]["content_list_json"] is None
+    assert markdown_only[0]["middle_json"] is None
+    assert everything[0]["content_list_json"] is not None
+    assert len(fake_adapter.calls) == 2
+
+
+def test_outputs_field_is_validated():
+    assert validate_outputs(None) == ("markdown", "content_list", "middle_json", "model_output")
+    assert validate_outputs(" content_list , markdown") == ("markdown", "content_list")
+    with pytest.raises(HTTPException) as excinfo:
+        validate_outputs("markdown,pdf")
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,164 @@
+import io
+import time
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from src.services import mineru_adapter as adapter_module
+from src.services.mineru_adapter import MineruAdapter
+from src.services.page_cache import PageCache, page_digests
+
+
+def _pdf(shades: list[int]) -> bytes:
+    pages = [Image.new("L", (60, 80), shade) for shade in shades]
+    buffer = io.BytesIO()
+    pages[0].save(buffer, format="PDF", save_all=True, append_images=pages[1:])
+    return buffer.getvalue()
+
+
+def _shades(pdf_bytes: bytes) -> list[int]:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(pdf_bytes)
+    shades = [pdf[idx].render(scale=0.2, grayscale=True).to_pil().getpixel((5, 5)) for idx in range(len(pdf))]
+    pdf.close()
+    return shades
+
+
+class LocalWriter:
+    def __init__(self, directory) -> None:
+        self.directory = Path(directory)
+
+    def write(self, path, data) -> None:
+        (self.directory / path).write_bytes(data)
+
+
+class PipelineEngine:
+    """Pipeline stand-in that 'recognizes' each page by its shade and crops one image per page."""
+
+    def __init__(self, fake_engine) -> None:
+        self.base = fake_engine.modules()
+        self.analyzed: list[list[int]] = []
+
+    def modules(self):
+        base = self.base
+
+        def doc_analyze(pdf_bytes_list, lang_list, **kwargs):
+            shades = [_shades(pdf_bytes) for pdf_bytes in pdf_bytes_list]
+            self.analyzed.extend(shades)
+            models = [
+                [{"page_info": {"page_no": no}, "shade": shade} for no, shade in enumerate(doc)] for doc in shades
+            ]
+            return models, [None] * len(models), [None] * len(models), lang_list, [False] * len(models)
+
+        def to_middle_json(model_list, images, pdf_doc, writer, lang, ocr, formula):
+            pdf_info = []
+            for page in model_list:
+                name = f"shade-{page['shade']}.jpg"
+                writer.write(name, bytes([page["shade"]]))
+                span = {"type": "image", "image_path": name}
+                pdf_info.append(
+                    {"page_idx": page["page_info"]["page_no"], "text": f"shade {page['shade']}", "blocks": [span]},
+                )
+            return {"pdf_info": pdf_info, "_backend": "pipeline"}
+
+        base.pipeline_doc_analyze = doc_analyze
+        base.pipeline_result_to_middle_json = to_middle_json
+        base.FileBasedDataWriter = LocalWriter
+        base.convert_pdf_bytes_to_bytes_by_pypdfium2 = lambda data, start, end: data
+        return base
+
+
+@pytest.fixture()
+def page_cache(tmp_path, monkeypatch):
+    cache = PageCache(tmp_path / "pages", max_entries=100, render_scale=0.2)
+    monkeypatch.setattr(adapter_module, "get_page_cache", lambda: cache)
+    return cache
+
+
+def test_fingerprints_follow_page_content():
+    first, second = page_digests(_pdf([10, 200, 10]), 0.2), page_digests(_pdf([10, 90]), 0.2)
+
+    assert first[0] == first[2] == second[0]
+    assert first[1] != second[1]
+
+
+def test_revised_document_only_analyzes_changed_pages(tmp_path, page_cache):
+    from tests.conftest import FakeMineruEngine
+
+    engine = PipelineEngine(FakeMineruEngine())
+    adapter = MineruAdapter(output_dir=tmp_path / "job1", engine=engine)
+    adapter.parse_from_bytes([("doc.pdf", _pdf([10, 60, 110, 160]))])
+
+    revised = MineruAdapter(output_dir=tmp_path / "job2", engine=engine)
+    (output,) = revised.parse_from_bytes([("doc.pdf", _pdf([10, 60, 230, 160]))])
+
+    assert engine.analyzed == [[10, 60, 110, 160], [230]]
+    pdf_info = output.middle_json_data["pdf_info"]
+    assert [page["page_idx"] for page in pdf_info] == [0, 1, 2, 3]
+    assert [page["text"] for page in pdf_info] == ["shade 10", "shade 60", "shade 230", "shade 160"]
+    assert [page["page_info"]["page_no"] for page in output.model_output_data] == [0, 1, 2, 3]
+    assert output.markdown_text.split("\n\n") == ["shade 10", "shade 60", "shade 230", "shade 160"]
+    # Cached pages bring their images into the new job's image directory.
+    assert sorted(path.name for path in output.image_dir.iterdir()) == [
+        "shade-10.jpg",
+        "shade-160.jpg",
+        "shade-230.jpg",
+        "shade-60.jpg",
+    ]
+    assert page_cache.snapshot()["hits"] == 3
+
+
+def test_unchanged_document_skips_the_models(tmp_path, page_cache):
+    from tests.conftest import FakeMineruEngine
+
+    engine = PipelineEngine(FakeMineruEngine())
+    MineruAdapter(output_dir=tmp_path / "job1", engine=engine).parse_from_bytes([("a.pdf", _pdf([10, 60]))])
+
+    (output,) = MineruAdapter(output_dir=tmp_path / "job2", engine=engine).parse_from_bytes(
+        [("a.pdf", _pdf([10, 60]))],
+        outputs=("markdown",),
+    )
+
+    assert engine.analyzed == [[10, 60]]
+    assert output.markdown_text == "shade 10\n\nshade 60"
+
+
+def test_parse_options_are_part_of_the_page_key(tmp_path, page_cache):
+    from tests.conftest import FakeMineruEngine
+
+    engine = PipelineEngine(FakeMineruEngine())
+    MineruAdapter(output_dir=tmp_path / "job1", engine=engine).parse_from_bytes([("a.pdf", _pdf([10]))])
+    MineruAdapter(output_dir=tmp_path / "job2", engine=engine).parse_from_bytes(
+        [("a.pdf", _pdf([10]))],
+        table_enable=False,
+    )
+
+    assert engine.analyzed == [[10], [10]]
+
+
+def test_entries_are_bounded_and_expired_by_the_janitor(settings, tmp_path):
+    from src.services.janitor import JobIndex, StorageJanitor
+    from src.services.storage import StorageManager
+
+    cache = PageCache(tmp_path / "pages", max_entries=2, render_scale=0.2)
+    cache.put_many({"a" * 64: {"page": 1}, "b" * 64: {"page": 2}})
+    cache.get("a" * 64)
+    cache.put_many({"c" * 64: {"page": 3}})
+
+    # The least recently used entry goes, without rescanning the directory.
+    assert sorted(path.stem[0] for path in (tmp_path / "pages").glob("*/*.json")) == ["a", "c"]
+    assert PageCache(tmp_path / "pages", max_entries=2).snapshot()["entries"] == 2
+
+    janitor = StorageJanitor(
+        StorageManager(base_path=tmp_path / "outputs", ttl_hours=1),
+        JobIndex(tmp_path / "index.sqlite3"),
+        settings=settings,
+        caches=[cache],
+    )
+    janitor.sweep()
+    assert cache.snapshot()["entries"] == 2
+    janitor.sweep(now=time.time() + 3600 + 1)
+    assert list((tmp_path / "pages").glob("*/*.json")) == []
+    assert cache.snapshot()["expired_total"] == 2
@@ -0,0 +1,91 @@
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+
+from src.services.parse_service import ParseParams
+from src.services.preflight import inspect_pdf
+from tests.conftest import text_pdf
+
+
+def _text_pdf(pages: int) -> bytes:
+    line = "of a born-digital report: every page carries a proper, selectable text layer."
+    return text_pdf([[("F1", 12, 720, f"Page {page} {line}")] for page in range(pages)])
+
+
+def _scanned_pdf(pages: int) -> bytes:
+    images = [Image.new("RGB", (60, 80), "white") for _ in range(pages)]
+    buffer = io.BytesIO()
+    images[0].save(buffer, format="PDF", save_all=True, append_images=images[1:])
+    return buffer.getvalue()
+
+
+def _upload(name: str, data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=name)
+
+
+def test_inspection_reads_pages_sizes_and_text_layer():
+    inspection = inspect_pdf(_text_pdf(3), start_page=1, end_page=None, min_chars=20)
+
+    assert inspection.pages == 3
+    assert inspection.page_sizes == ((612.0, 792.0), (612.0, 792.0))
+    assert inspection.text_coverage == 1.0
+    assert inspect_pdf(_scanned_pdf(2), 0, None, min_chars=20).text_coverage == 0.0
+
+
+def test_inspection_counts_pages_with_ruled_tables():
+    page = [("F1", 12, 720, "Quarterly figures, with the table ruled below this line.")]
+
+    assert inspect_pdf(text_pdf([page] * 3, rules=6), 0, None, min_chars=20).ruled_pages == 3
+    assert inspect_pdf(text_pdf([page] * 3, rules=1), 0, None, min_chars=20).ruled_pages == 0
+
+
+@pytest.mark.asyncio
+async def test_auto_picks_txt_or_ocr_per_document(make_service):
+    service = make_service(max_pages=10)
+    uploads = [_upload("digital.pdf", _text_pdf(2)), _upload("scan.pdf", _scanned_pdf(2))]
+
+    digital, scan = await service.prepare(uploads, ParseParams(), job_id="job-1")
+    explicit, _ = await service.prepare(
+        [_upload("digital.pdf", _text_pdf(2)), _upload("scan.pdf", _scanned_pdf(2))],
+        ParseParams(parse_method="ocr"),
+        job_id="job-2",
+    )
+
+    assert (digital.parse_method, scan.parse_method) == ("txt", "ocr")
+    assert explicit.parse_method is None
+
+
+@pytest.mark.asyncio
+async def test_unbounded_oversized_document_is_refused_before_parsing(make_service, tmp_path):
+    service = make_service(max_pages=10)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await service.prepare([_upload("long.pdf", _scanned_pdf(12))], ParseParams(), job_id="job-3")
+
+    assert excinfo.value.status_code == 413
+    assert "12 pages" in excinfo.value.detail
+    assert not (tmp_path / "job-3" / "_uploads").exists()
+
+
+@pytest.mark.asyncio
+async def test_oversized_document_can_be_clamped(make_service, fake_adapter):
+    service = make_service(max_pages=10, oversize_pdf_policy="clamp", shard_pages=0)
+
+    (item,) = await service.prepare([_upload("long.pdf", _scanned_pdf(12))], ParseParams(start_page=1), job_id="job-4")
+    await service.run([item], ParseParams(start_page=1), job_id="job-4")
+
+    assert (item.pages, item.end_page) == (12, 10)
+    (call,) = fake_adapter.calls
+    assert (call["start_page"], call["end_page"], call["parse_method"]) == (1, 10, "ocr")
+
+
+@pytest.mark.asyncio
+async def test_start_page_past_the_end_is_rejected(make_service):
+    service = make_service(max_pages=10)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await service.prepare([_upload("short.pdf", _text_pdf(2))], ParseParams(start_page=5), job_id="job-5")
+
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,75 @@
+import asyncio
+import os
+
+import pytest
+
+from src.services.process_pool import ProcessWorkerPool, WorkerCrashedError
+from src.services.worker_pool import ParseWorkerPool
+
+
+def worker_pid() -> int:
+    return os.getpid()
+
+
+def crash() -> None:
+    os._exit(3)
+
+
+def fail() -> None:
+    raise ValueError("bad document")
+
+
+@pytest.fixture()
+def process_pool():
+    pool = ProcessWorkerPool(max_workers=1, max_jobs_per_worker=2, preload=False, poll_interval=0.05)
+    yield pool
+    pool.shutdown()
+
+
+def test_jobs_run_in_worker_process_and_recycle(process_pool):
+    pids = [process_pool.submit(worker_pid).result(timeout=30) for _ in range(3)]
+
+    assert os.getpid() not in pids
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[1]
+    assert process_pool.snapshot()["recycled"] == 1
+    assert process_pool.ready
+
+
+def test_crash_fails_only_its_own_job(process_pool):
+    crashed = process_pool.submit(crash)
+    following = process_pool.submit(worker_pid)
+
+    with pytest.raises(WorkerCrashedError):
+        crashed.result(timeout=30)
+    assert following.result(timeout=30) != os.getpid()
+    assert process_pool.snapshot()["crashed"] == 1
+
+
+def test_worker_exceptions_are_returned(process_pool):
+    with pytest.raises(ValueError, match="bad document"):
+        process_pool.submit(fail).result(timeout=30)
+
+
+@pytest.mark.asyncio
+async def test_parse_worker_pool_awaits_process_results(process_pool):
+    pool = ParseWorkerPool(max_workers=1, process_pool=process_pool)
+
+    pid = await asyncio.wait_for(pool.run(worker_pid), timeout=30)
+
+    assert pid != os.getpid()
+    assert pool.snapshot()["mode"] == "process"
+
+
+def test_unreadable_rss_does_not_recycle_every_job(monkeypatch):
+    from src.services import process_pool as process_pool_module
+
+    monkeypatch.setattr(process_pool_module, "_rss_bytes", lambda: None)
+    pool = ProcessWorkerPool(max_workers=1, max_rss_bytes=1, preload=False, poll_interval=0.05, start_method="fork")
+    try:
+        pids = {pool.submit(worker_pid).result(timeout=30) for _ in range(3)}
+    finally:
+        pool.shutdown()
+
+    assert len(pids) == 1
+    assert pool.snapshot()["recycled"] == 0
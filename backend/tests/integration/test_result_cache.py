@@ -0,0 +1,59 @@
+import hashlib
+
+import pytest
+
+from src.services.parse_service import ParseParams
+from src.services.result_cache import ParseResultCache, document_digest
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_identical_document_is_served_from_cache(make_service, fake_adapter, make_input):
+    cache = ParseResultCache(max_entries=8, ttl_seconds=60)
+    service = make_service(cache=cache)
+    params = ParseParams()
+
+    first, _ = await service.run([make_input("a.pdf", b"same-bytes")], params)
+    second, _ = await service.run([make_input("renamed.pdf", b"same-bytes"), make_input("b.pdf", b"other")], params)
+
+    assert len(fake_adapter.calls) == 2
+    assert fake_adapter.calls[1]["files"] == ["b.pdf"]
+    assert second[0]["filename"] == "renamed.pdf"
+    assert second[0]["markdown"] == first[0]["markdown"]
+    assert cache.snapshot()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_parameters_are_part_of_the_key(make_service, fake_adapter, make_input):
+    service = make_service(cache=ParseResultCache(max_entries=8, ttl_seconds=60))
+
+    await service.run([make_input("a.pdf", b"doc")], ParseParams(lang="en"))
+    await service.run([make_input("a.pdf", b"doc")], ParseParams(lang="en", table_enable=False))
+
+    assert len(fake_adapter.calls) == 2
+    assert document_digest(_sha(b"doc"), ParseParams(start_page=1)) != document_digest(_sha(b"doc"), ParseParams())
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_by_size_ttl_and_missing_artifacts(make_service, fake_adapter, make_input):
+    cache = ParseResultCache(max_entries=1, ttl_seconds=60)
+    service = make_service(cache=cache)
+    params = ParseParams()
+
+    await service.run([make_input("a.pdf", b"one")], params)
+    await service.run([make_input("b.pdf", b"two")], params)
+    exists = service.storage.artifact_exists
+    assert cache.get(document_digest(_sha(b"one"), params), exists) is None
+
+    key = document_digest(_sha(b"two"), params)
+    assert cache.get(key, exists) is not None
+    assert cache.get(key, exists, now=10**12) is None
+
+    await service.run([make_input("c.pdf", b"three")], params)
+    entry_key = document_digest(_sha(b"three"), params)
+    cache.get(entry_key, exists).output.markdown.unlink()
+    assert cache.get(entry_key, exists) is None
+    assert cache.snapshot()["evictions"] == 3
@@ -0,0 +1,122 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+
+from src.observability.metrics import metrics
+from src.services.admission import AdmissionController
+from src.services.parse_service import ParseParams
+from src.services.preflight import PdfInspection
+from src.services.router import BackendRouter
+from src.services.storage import SpooledFile
+from tests.conftest import text_pdf
+
+VLM = "vlm-http-client"
+
+
+ROUTING = {
+    "auto_backends": ["pipeline", VLM],
+    "backend_page_seconds": {},
+    "backend_cost_weights": {},
+    "router_default_page_seconds": 2.0,
+    "router_mismatch_penalty": 2.0,
+    "max_concurrent_parses": 1,
+    "max_queued_parses": 2,
+}
+
+
+def _settings(settings, **overrides):
+    return settings.model_copy(update={**ROUTING, **overrides})
+
+
+def _item(name: str, text_pages: int, pages: int = 4, ruled_pages: int = 0) -> SpooledFile:
+    inspection = PdfInspection(
+        pages=pages,
+        page_sizes=((612.0, 792.0),) * pages,
+        text_pages=text_pages,
+        ruled_pages=ruled_pages,
+    )
+    return SpooledFile(name=name, path=None, size=0, sha256=name, inspection=inspection)
+
+
+def test_documents_go_to_the_engine_that_suits_them(settings):
+    router = BackendRouter(AdmissionController(_settings(settings)), _settings(settings))
+    before = dict(metrics.snapshot()["counters"].get("router_kind", {}))
+
+    assert router.choose(_item("digital.pdf", text_pages=4)).backend == "pipeline"
+    assert router.choose(_item("scan.pdf", text_pages=0)).backend == VLM
+    assert router.choose(_item("tables.pdf", text_pages=4, ruled_pages=2)).backend == VLM
+
+    counts = metrics.snapshot()["counters"]["router_kind"]
+    assert counts["text:pipeline"] == before.get("text:pipeline", 0) + 1
+    assert counts[f"visual:{VLM}"] == before.get(f"visual:{VLM}", 0) + 2
+
+
+@pytest.mark.asyncio
+async def test_load_and_cost_weights_shift_the_choice(settings):
+    config = _settings(settings)
+    admission = AdmissionController(config)
+    router = BackendRouter(admission, config)
+    digital = _item("digital.pdf", text_pages=4)
+
+    assert router.choose(digital).backend == "pipeline"
+    # One running plus one routed earlier in the same request triple the pipeline's estimate.
+    ticket = await admission.acquire("pipeline")
+    assert router.choose(digital, planned={"pipeline": 1}).backend == VLM
+    ticket.release()
+
+    weighted = config.model_copy(update={"backend_cost_weights": {"pipeline": 3.0}})
+    assert BackendRouter(admission, weighted).choose(digital).backend == VLM
+
+    # Learned service times move the estimate too.
+    router.observe(VLM, pages=4, seconds=80.0)
+    assert router.choose(_item("scan.pdf", text_pages=0)).backend == "pipeline"
+
+
+@pytest.mark.asyncio
+async def test_saturated_backend_is_skipped(settings):
+    config = _settings(settings)
+    admission = AdmissionController(config)
+    router = BackendRouter(admission, config)
+    running = await admission.acquire(VLM)
+    waiting = [asyncio.ensure_future(admission.acquire(VLM)) for _ in range(config.max_queued_parses)]
+    await asyncio.sleep(0)
+
+    decision = router.choose(_item("scan.pdf", text_pages=0))
+
+    assert decision.backend == "pipeline"
+    assert decision.scores[VLM] is None
+    running.release()
+    for pending in waiting:
+        (await pending).release()
+
+
+def _scanned_pdf() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (60, 80), "white").save(buffer, format="PDF")
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_auto_request_is_split_across_backends(make_service, settings, fake_adapter):
+    overrides = {**ROUTING, "max_concurrent_parses": 2, "shard_pages": 0}
+    config = _settings(settings, **overrides)
+    admission = AdmissionController(config)
+    service = make_service(admission=admission, router=BackendRouter(admission, config), **overrides)
+    line = "of a born-digital report: every page carries a proper, selectable text layer."
+    uploads = [
+        UploadFile(file=io.BytesIO(text_pdf([[("F1", 12, 720, f"Page one {line}")]])), filename="digital.pdf"),
+        UploadFile(file=io.BytesIO(_scanned_pdf()), filename="scan.pdf"),
+    ]
+    params = ParseParams(backend="auto")
+
+    normalized = await service.prepare(uploads, params, job_id="job-1")
+    outputs, errors = await service.run(normalized, params, job_id="job-1")
+
+    assert errors == []
+    assert [output["filename"] for output in outputs] == ["digital.pdf", "scan.pdf"]
+    backends = {call["files"][0]: call["backend"] for call in fake_adapter.calls}
+    assert backends == {"digital.pdf": "pipeline", "scan.pdf": VLM}
+    assert service.admission.snapshot()["pipeline"]["active"] == 0
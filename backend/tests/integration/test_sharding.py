@@ -0,0 +1,83 @@
+import io
+import time
+
+import pytest
+from PIL import Image
+
+from src.services.parse_service import ParseParams
+from src.services.sharding import page_shards
+from src.services.worker_pool import ParseWorkerPool
+
+
+def _pdf(pages: int) -> bytes:
+    images = [Image.new("RGB", (60, 80), "white") for _ in range(pages)]
+    buffer = io.BytesIO()
+    images[0].save(buffer, format="PDF", save_all=True, append_images=images[1:])
+    return buffer.getvalue()
+
+
+def test_page_shards_cover_the_requested_range():
+    assert page_shards(20, ParseParams(), shard_pages=8, min_pages=16) == [(0, 7), (8, 15), (16, 19)]
+    assert page_shards(50, ParseParams(start_page=5, end_page=24), 8, 16) == [(5, 12), (13, 20), (21, 24)]
+    assert page_shards(12, ParseParams(), 8, 16) is None
+    assert page_shards(50, ParseParams(start_page=40), 8, 16) is None
+    assert page_shards(50, ParseParams(), 0, 16) is None
+
+
+@pytest.mark.asyncio
+async def test_large_documents_are_parsed_in_parallel_shards(make_service, fake_adapter, make_input):
+    fake_adapter.delay = 0.2
+    fake_adapter.in_memory = True
+    service = make_service(
+        worker_pool=ParseWorkerPool(max_workers=4),
+        batch_window_ms=0,
+        shard_pages=8,
+        shard_min_pages=16,
+    )
+
+    started = time.perf_counter()
+    outputs, _ = await service.run([make_input("big.pdf", _pdf(20))], ParseParams(), job_id="job")
+    elapsed = time.perf_counter() - started
+
+    assert sorted(call["pages"] for call in fake_adapter.calls) == [(0, 7), (8, 15), (16, 19)]
+    assert elapsed < 0.2 * 3
+    output = outputs[0]
+    assert [page["page_idx"] for page in output["middle_json"]["pdf_info"]] == list(range(20))
+    assert [item["page_idx"] for item in output["content_list_json"]] == list(range(20))
+    assert output["markdown"].split("\n\n")[8] == "big.pdf p8"
+    assert output["markdown_url"].endswith("/big.pdf/auto/big.pdf.md")
+
+
+@pytest.mark.asyncio
+async def test_small_documents_keep_the_single_call_path(make_service, fake_adapter, make_input):
+    service = make_service(
+        worker_pool=ParseWorkerPool(max_workers=4),
+        batch_window_ms=0,
+        shard_pages=8,
+        shard_min_pages=16,
+    )
+
+    outputs, _ = await service.run(
+        [make_input("small.pdf", _pdf(3)), make_input("big.pdf", _pdf(17))],
+        ParseParams(),
+        job_id="job",
+    )
+
+    assert [output["filename"] for output in outputs] == ["small.pdf", "big.pdf"]
+    whole = [call for call in fake_adapter.calls if "pages" not in call]
+    assert [call["files"] for call in whole] == [["small.pdf"]]
+    assert len(fake_adapter.calls) == 4
+
+
+def test_merge_renumbers_pages_and_model_output(tmp_path, fake_adapter):
+    def shard(start, count):
+        pages = [{"page_idx": idx, "text": f"p{start + idx}"} for idx in range(count)]
+        model = [{"page_info": {"page_no": idx}, "layout_dets": []} for idx in range(count)]
+        return {"start_page": start, "middle_json": {"pdf_info": pages, "_backend": "pipeline"}, "model_output": model}
+
+    output = fake_adapter(output_dir=tmp_path).merge_pages("doc.pdf", [shard(12, 2), shard(10, 2)])
+
+    assert [page["page_idx"] for page in output.middle_json_data["pdf_info"]] == [0, 1, 2, 3]
+    assert [page["text"] for page in output.middle_json_data["pdf_info"]] == ["p10", "p11", "p12", "p13"]
+    assert [page["page_info"]["page_no"] for page in output.model_output_data] == [0, 1, 2, 3]
+    assert output.middle_json_data["_backend"] == "pipeline"
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from src.observability.logging import get_request_id, set_request_id
+from src.services.parse_service import ParseParams
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_share_one_run(make_service, fake_adapter, make_input):
+    fake_adapter.delay = 0.1
+    service = make_service()
+
+    async def request(request_id, name):
+        set_request_id(request_id)
+        outputs, _ = await service.run([make_input(name, b"same")], ParseParams())
+        return get_request_id(), outputs
+
+    results = await asyncio.gather(request("req-a", "a.pdf"), request("req-b", "b.pdf"), request("req-c", "c.pdf"))
+
+    assert len(fake_adapter.calls) == 1
+    assert [request_id for request_id, _ in results] == ["req-a", "req-b", "req-c"]
+    assert [outputs[0]["filename"] for _, outputs in results] == ["a.pdf", "b.pdf", "c.pdf"]
+    assert service.single_flight.snapshot()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_shared_work(make_service, fake_adapter, make_input):
+    fake_adapter.delay = 0.1
+    service = make_service()
+
+    leader = asyncio.create_task(service.run([make_input("a.pdf", b"same")], ParseParams()))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(service.run([make_input("b.pdf", b"same")], ParseParams()))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    outputs, _ = await waiter
+    assert leader.cancelled()
+    assert outputs[0]["filename"] == "b.pdf"
+    assert len(fake_adapter.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_failures_propagate_to_all_waiters(make_service, fake_adapter, make_input, monkeypatch):
+    service = make_service()
+
+    def broken(*args, **kwargs):
+        import time
+
+        time.sleep(0.05)
+        raise RuntimeError("model crashed")
+
+    monkeypatch.setattr(fake_adapter, "parse_from_bytes", lambda self, files, **kwargs: broken())
+    results = await asyncio.gather(
+        service.run([make_input("a.pdf", b"same")], ParseParams()),
+        service.run([make_input("b.pdf", b"same")], ParseParams()),
+        return_exceptions=True,
+    )
+    assert [getattr(result, "status_code", None) for result in results] == [500, 500]
+    assert service.single_flight.snapshot()["inflight"] == 0
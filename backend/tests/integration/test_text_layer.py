@@ -0,0 +1,82 @@
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from src.services.mineru_adapter import MineruAdapter
+from src.services.parse_service import ParseParams
+from src.services.text_layer import extract_text_layer, text_layer_content_list, text_layer_markdown
+from tests.conftest import text_pdf
+
+REPORT = [
+    [
+        ("F1", 20, 720, "Quarterly Report"),
+        ("F2", 14, 690, "Summary"),
+        ("F1", 11, 670, "Revenue grew strongly in the third quar-"),
+        ("F1", 11, 657, "ter, driven by new customers."),
+        ("F1", 11, 630, "Margins held steady."),
+        ("F1", 11, 600, "- first item"),
+        ("F1", 11, 587, "- second item"),
+    ],
+    [("F2", 14, 720, "Outlook"), ("F1", 11, 700, "We expect further growth next year.")],
+]
+
+
+class NoEngine:
+    def modules(self):
+        raise AssertionError("the fast path must not load Miner-U")
+
+
+def test_text_layer_keeps_titles_paragraphs_and_lists():
+    pdf_info = extract_text_layer(text_pdf(REPORT))["pdf_info"]
+
+    assert text_layer_markdown(pdf_info).split("\n\n") == [
+        "# Quarterly Report",
+        "## Summary",
+        "Revenue grew strongly in the third quarter, driven by new customers.",
+        "Margins held steady.",
+        "- first item",
+        "- second item",
+        "## Outlook",
+        "We expect further growth next year.",
+    ]
+    content_list = text_layer_content_list(pdf_info)
+    assert content_list[0]["text_level"] == 1 and "text_level" not in content_list[2]
+    assert {item["type"] for item in content_list} == {"text"}
+    assert [item["page_idx"] for item in content_list][-2:] == [1, 1]
+    assert all(0 <= value <= 1000 for item in content_list for value in item["bbox"])
+
+
+def test_page_range_is_renumbered_from_zero():
+    pdf_info = extract_text_layer(text_pdf(REPORT), start_page=1)["pdf_info"]
+
+    assert [page["page_idx"] for page in pdf_info] == [0]
+    assert pdf_info[0]["page_size"] == [612.0, 792.0]
+
+
+def test_fast_parse_skips_the_engine(tmp_path):
+    adapter = MineruAdapter(output_dir=tmp_path, engine=NoEngine())
+
+    (output,) = adapter.parse_from_bytes([("report.pdf", text_pdf(REPORT))], parse_method="fast", outputs=("markdown",))
+
+    assert output.markdown == tmp_path / "report.pdf" / "fast" / "report.pdf.md"
+    assert output.markdown_text.startswith("# Quarterly Report")
+    assert output.content_list is None and output.model_output is None
+
+
+@pytest.mark.asyncio
+async def test_fast_falls_back_to_the_models_without_a_text_layer(make_service):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (60, 80), "white").save(buffer, format="PDF")
+    service = make_service()
+    uploads = [
+        UploadFile(file=io.BytesIO(buffer.getvalue()), filename="scan.pdf"),
+        UploadFile(file=io.BytesIO(text_pdf(REPORT[:1] * 3)), filename="report.pdf"),
+    ]
+
+    scan, report = await service.prepare(uploads, ParseParams(parse_method="fast"), job_id="job-1")
+
+    assert scan.parse_method == "ocr"
+    assert report.parse_method is None
@@ -0,0 +1,84 @@
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from src.api import middleware as middleware_module
+from src.services.parse_service import ParseParams
+
+
+@pytest.mark.asyncio
+async def test_uploads_are_spooled_and_hashed(make_service, tmp_path):
+    service = make_service(upload_chunk_bytes=4)
+    upload = UploadFile(file=io.BytesIO(b"%PDF-1.7 body"), filename="doc.pdf")
+
+    (spooled,) = await service.prepare([upload], ParseParams(), job_id="job-1")
+
+    assert spooled.name == "doc.pdf"
+    assert spooled.path.parent == tmp_path / "job-1" / "_uploads"
+    assert spooled.read_bytes() == b"%PDF-1.7 body"
+    assert spooled.sha256 == hashlib.sha256(b"%PDF-1.7 body").hexdigest()
+
+    service.discard_inputs("job-1")
+    assert not spooled.path.exists()
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_aborts_and_discards_spool(make_service, tmp_path):
+    service = make_service(upload_chunk_bytes=4, max_file_bytes=8)
+    upload = UploadFile(file=io.BytesIO(b"x" * 64), filename="big.pdf")
+
+    with pytest.raises(HTTPException) as excinfo:
+        await service.prepare([upload], ParseParams(), job_id="job-2")
+
+    assert excinfo.value.status_code == 413
+    assert upload.file.tell() <= 12
+    assert not (tmp_path / "job-2" / "_uploads").exists()
+
+
+@pytest.mark.asyncio
+async def test_declared_oversized_body_is_rejected_early(client, monkeypatch, settings):
+    monkeypatch.setattr(
+        middleware_module,
+        "get_settings",
+        lambda: settings.model_copy(update={"max_files": 1, "max_file_bytes": 16}),
+    )
+    files = {"files": ("big.pdf", io.BytesIO(b"x" * (2 * 1024 * 1024)), "application/pdf")}
+
+    response = await client.post("/api/v1/parse", files=files)
+
+    assert response.status_code == 413
+    assert response.json()["request_id"]
+
+
+@pytest.mark.asyncio
+async def test_chunked_oversized_body_is_stopped_while_streaming(client, monkeypatch, settings):
+    monkeypatch.setattr(
+        middleware_module,
+        "get_settings",
+        lambda: settings.model_copy(update={"max_files": 1, "max_file_bytes": 16}),
+    )
+    boundary = "limit-test"
+    sent = 0
+
+    async def body():
+        nonlocal sent
+        yield (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="files"; filename="big.pdf"\r\n'
+            "Content-Type: application/pdf\r\n\r\n"
+        ).encode()
+        for _ in range(64):
+            sent += 1
+            yield b"x" * (64 * 1024)
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    response = await client.post(
+        "/api/v1/parse",
+        content=body(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+
+    assert response.status_code == 413
+    assert response.json()["request_id"]
+    assert sent < 64
@@ -0,0 +1,283 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from src.services.engine import MineruUnavailableError
+from src.services.mineru_adapter import MineruAdapter
+from src.services.parse_service import ParseParams
+from src.services import mineru_adapter as adapter_module
+from src.services.vlm_endpoints import VlmEndpointPool, VlmEndpointsUnavailableError, is_endpoint_failure
+
+
+class StubVlmServer(ThreadingHTTPServer):
+    """A local stand-in for an OpenAI-compatible VLM server: /health and /v1/chat/completions."""
+
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.delay = delay
+        self.healthy = True
+        self.status = 200
+        self.completions = 0
+        self.health_checks = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self.server.health_checks += 1
+        self._reply(200 if self.server.healthy else 503, {"status": "ok" if self.server.healthy else "down"})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        with server._lock:
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        with server._lock:
+            server.in_flight -= 1
+            server.completions += 1
+        self._reply(server.status, {"choices": [{"message": {"content": f"page from {server.url}"}}]})
+
+
+def _infer(server_url: str) -> str:
+    request = urllib.request.Request(
+        f"{server_url}/v1/chat/completions",
+        data=json.dumps({"messages": []}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())["choices"][0]["message"]["content"]
+
+
+def _dead_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+@pytest.fixture()
+def stubs():
+    servers = []
+
+    def start(delay: float = 0.0) -> StubVlmServer:
+        server = StubVlmServer(delay)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _pool(settings, urls, **overrides) -> VlmEndpointPool:
+    return VlmEndpointPool(
+        settings.model_copy(
+            update={
+                "vlm_server_urls": urls,
+                "vlm_endpoint_max_concurrent": 2,
+                "vlm_endpoint_wait_seconds": 5.0,
+                "vlm_max_attempts": 2,
+                "vlm_circuit_failures": 1,
+                "vlm_circuit_open_seconds": 0.2,
+                **overrides,
+            },
+        ),
+    )
+
+
+def test_documents_are_spread_within_per_endpoint_limits(settings, stubs):
+    first, second = stubs(delay=0.1), stubs(delay=0.1)
+    pool = _pool(settings, [first.url, second.url])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: pool.call(_infer), range(8)))
+
+    assert len(results) == 8
+    assert first.completions == second.completions == 4
+    assert first.peak_in_flight <= 2 and second.peak_in_flight <= 2
+    assert {entry["served_total"] for entry in pool.snapshot().values()} == {4}
+
+
+def test_dead_endpoint_is_retried_elsewhere_and_taken_out(settings, stubs):
+    live = stubs()
+    dead = _dead_url()
+    pool = _pool(settings, [dead, live.url], vlm_circuit_open_seconds=60)
+
+    assert [pool.call(_infer) for _ in range(3)] == [f"page from {live.url}"] * 3
+
+    snapshot = pool.snapshot()
+    assert snapshot[dead]["state"] == "open"
+    assert snapshot[dead]["failed_total"] == 1
+    assert snapshot[live.url]["served_total"] == 3
+
+
+def test_server_errors_trip_the_circuit_until_the_health_probe_passes(settings, stubs):
+    flaky, steady = stubs(), stubs()
+    pool = _pool(settings, [flaky.url, steady.url])
+    flaky.status, flaky.healthy = 500, False
+
+    pool.call(_infer)
+    pool.call(_infer)
+    assert pool.snapshot()[flaky.url]["state"] == "open"
+
+    time.sleep(0.25)
+    pool.call(_infer)
+    assert flaky.health_checks == 1
+    assert pool.snapshot()[flaky.url]["state"] == "open"
+
+    flaky.status, flaky.healthy = 200, True
+    time.sleep(0.25)
+    results = [pool.call(_infer) for _ in range(2)]
+    assert f"page from {flaky.url}" in results
+    assert pool.snapshot()[flaky.url]["state"] == "closed"
+
+
+def test_document_errors_are_not_retried_and_all_dead_fails_fast(settings, stubs):
+    live = stubs()
+    pool = _pool(settings, [live.url, _dead_url()])
+    calls = []
+
+    def bad_document(server_url):
+        calls.append(server_url)
+        raise ValueError("not a PDF")
+
+    with pytest.raises(ValueError):
+        pool.call(bad_document)
+    assert calls == [live.url]
+    assert pool.snapshot()[live.url]["state"] == "closed"
+
+    dead = _pool(settings, [_dead_url(), _dead_url()], vlm_circuit_open_seconds=60)
+    with pytest.raises(VlmEndpointsUnavailableError) as excinfo:
+        dead.call(_infer)
+    assert is_endpoint_failure(excinfo.value.__cause__)
+    start = time.perf_counter()
+    with pytest.raises(VlmEndpointsUnavailableError):
+        dead.call(_infer)
+    assert time.perf_counter() - start < 0.5
+
+
+class VlmEngine:
+    """Miner-U stand-in whose vlm_doc_analyze sends one request to ``server_url`` per document."""
+
+    def __init__(self, fake_engine) -> None:
+        self.base = fake_engine.modules()
+        self.server_urls: list = []
+
+    def modules(self):
+        base = self.base
+
+        def vlm_doc_analyze(pdf_bytes, image_writer, backend, server_url=None):
+            self.server_urls.append(server_url)
+            text = _infer(server_url)
+            return {"pdf_info": [{"page_idx": 0, "text": text}], "_backend": "vlm"}, [text]
+
+        class LocalWriter:
+            def __init__(self, directory) -> None:
+                self.directory = Path(directory)
+
+        base.vlm_doc_analyze = vlm_doc_analyze
+        base.FileBasedDataWriter = LocalWriter
+        base.convert_pdf_bytes_to_bytes_by_pypdfium2 = lambda data, start, end: data
+        return base
+
+
+def test_adapter_sends_http_client_documents_through_the_pool(settings, stubs, tmp_path, monkeypatch):
+    from tests.conftest import FakeMineruEngine
+
+    live = stubs()
+    pool = _pool(settings, [_dead_url(), live.url], vlm_circuit_open_seconds=60)
+    monkeypatch.setattr(adapter_module, "get_vlm_pool", lambda: pool)
+    engine = VlmEngine(FakeMineruEngine())
+    adapter = MineruAdapter(output_dir=tmp_path, engine=engine)
+
+    (output,) = adapter.parse_from_bytes([("scan", b"%PDF-stub")], backend="vlm-http-client")
+
+    assert output.markdown_text == f"page from {live.url}"
+    assert engine.server_urls[-1] == live.url
+
+    # An explicit server_url is used as given.
+    adapter.parse_from_bytes([("scan", b"%PDF-stub")], backend="vlm-http-client", server_url=live.url)
+    assert pool.snapshot()[live.url]["served_total"] == 1
+
+    monkeypatch.setattr(adapter_module, "get_vlm_pool", lambda: _pool(settings, [_dead_url()]))
+    with pytest.raises(MineruUnavailableError):
+        adapter.parse_from_bytes([("scan", b"%PDF-stub")], backend="vlm-http-client")
+
+
+class ProcessModeWorkers:
+    """Stands in for a process-mode worker pool: each call runs in a "worker" that has no endpoint pool."""
+
+    mode = "process"
+
+    def __init__(self, dead: set) -> None:
+        self.dead = dead
+        self.server_urls: list = []
+        self.in_flight = self.peak_in_flight = 0
+
+    async def run(self, fn, /, *args, server_url=None, **kwargs):
+        self.server_urls.append(server_url)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.05)
+            if server_url in self.dead:
+                raise urllib.error.URLError("connection refused")
+            return fn(*args, server_url=server_url, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_process_mode_picks_endpoints_in_the_api_process(make_service, settings, fake_adapter, make_input):
+    dead, first, second = "http://dead.invalid", "http://first.invalid", "http://second.invalid"
+    pool = _pool(settings, [dead, first, second], vlm_endpoint_max_concurrent=1, vlm_circuit_open_seconds=60)
+    workers = ProcessModeWorkers(dead={dead})
+    service = make_service(worker_pool=workers, vlm_pool=pool, shard_pages=0)
+    params = ParseParams(backend="vlm-http-client")
+
+    results = await asyncio.gather(
+        *(service.run([make_input(f"{idx}.pdf", f"doc-{idx}".encode())], params) for idx in range(4))
+    )
+
+    assert all(errors == [] for _, errors in results)
+    # The dead endpoint is tried once, then each live endpoint takes one document at a time.
+    assert workers.server_urls.count(dead) == 1
+    assert workers.peak_in_flight <= 2
+    snapshot = pool.snapshot()
+    assert snapshot[dead]["state"] == "open"
+    assert snapshot[first]["served_total"] + snapshot[second]["served_total"] == 4
+    assert all(entry["active"] == 0 for entry in snapshot.values())
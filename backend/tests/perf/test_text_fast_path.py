@@ -0,0 +1,79 @@
+"""Benchmark of the text-layer fast path (``parse_method=fast``) against the Miner-U pipeline.
+
+Run with ``pytest tests/perf/test_text_fast_path.py -s`` to see the numbers. The pipeline comparison
+is skipped unless Miner-U and its models are available.
+"""
+
+import difflib
+import time
+
+import pytest
+
+from src.services.mineru_adapter import MineruAdapter
+from tests.conftest import text_pdf
+
+PAGES = 50
+SENTENCE = "Operating revenue in the segment increased compared with the prior period"
+
+
+def _report(pages: int) -> bytes:
+    doc = []
+    for page in range(pages):
+        lines = [("F2", 14, 740, f"Section {page + 1} Results")]
+        y = 712
+        for paragraph in range(4):
+            for line in range(4):
+                lines.append(("F1", 11, y, f"{SENTENCE} ({page}.{paragraph}.{line})"))
+                y -= 13
+            y -= 13
+        doc.append(lines)
+    return text_pdf(doc)
+
+
+def _words(markdown: str) -> list[str]:
+    return markdown.replace("#", " ").split()
+
+
+class NoEngine:
+    def modules(self):
+        raise AssertionError("the fast path must not load Miner-U")
+
+
+def test_fast_path_is_sub_second(tmp_path):
+    pdf = _report(PAGES)
+    adapter = MineruAdapter(output_dir=tmp_path, engine=NoEngine())
+
+    start = time.perf_counter()
+    (output,) = adapter.parse_from_bytes([("report.pdf", pdf)], parse_method="fast")
+    elapsed = time.perf_counter() - start
+
+    print(f"\nfast path: {PAGES} pages in {elapsed * 1000:.0f} ms ({PAGES / elapsed:.0f} pages/s)")
+    assert elapsed < 1.0
+    assert output.markdown_text.count("# Section") == PAGES
+    assert len(output.content_list_data) == PAGES * 5
+
+
+def test_fast_path_against_pipeline(tmp_path):
+    pytest.importorskip("mineru")
+    from src.services.engine import MineruUnavailableError
+
+    pdf = _report(PAGES)
+    timings, markdown = {}, {}
+    for method in ("fast", "txt"):
+        adapter = MineruAdapter(output_dir=tmp_path / method)
+        start = time.perf_counter()
+        try:
+            (output,) = adapter.parse_from_bytes([("report.pdf", pdf)], parse_method=method, outputs=("markdown",))
+        except MineruUnavailableError as exc:
+            pytest.skip(f"Miner-U models unavailable: {exc}")
+        timings[method] = time.perf_counter() - start
+        markdown[method] = output.markdown_text
+
+    # Fidelity: word-level similarity of the fast markdown to the pipeline's.
+    similarity = difflib.SequenceMatcher(None, _words(markdown["txt"]), _words(markdown["fast"]), autojunk=False).ratio()
+    print(
+        f"\npipeline txt: {timings['txt']:.2f}s, fast: {timings['fast']:.3f}s "
+        f"({timings['txt'] / timings['fast']:.0f}x), word similarity {similarity:.3f}",
+    )
+    assert timings["fast"] < timings["txt"]
+    assert similarity > 0.9